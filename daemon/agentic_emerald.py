@@ -12,15 +12,28 @@ import socket
 import json
 import time
 import select
+import signal
 import subprocess
 import os
 import sys
 import threading
+import random
 import uuid
+import re
 import argparse
+import hashlib
 import shutil
+import zlib
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
+
+from decision_store import DecisionStore
+from event_journal import EventJournal
+from runtime_checkpoint import RuntimeCheckpoint, WriteBehindFile, atomic_write
+from session_journal import SessionJournal
 
 try:
     import yaml
@@ -278,6 +291,122 @@ class Colors:
     WHITE = "\033[97m"
 
 
+# Narrative tag lexicon shared by skill extraction, decision compression and
+# session-history summaries. Terms match at word starts ("crit" → "critical").
+TAG_LEXICON = {
+    'sweep': ('sweep', 'swept', 'clean', 'one turn', 'no damage'),
+    'clutch': ('clutch', 'close'),
+    'rematch': ('rematch', 're-match', 'revenge'),
+    'crit': ('crit',),
+    'milestone': ('level', 'evolved', 'evolution'),
+    'grind': ('grind', 'routine'),
+    'story': ('story', 'maxie', 'aqua', 'magma', 'badge', 'gym'),
+    'resilience': ('tanked', 'pushed through', 'despite'),
+    'dominance': ('dominated', 'swept', 'clean'),
+    'underdog': ('underdog', 'type disadvantage', 'against odds'),
+    'shiny': ('shiny',),
+}
+ACTION_CONTEXT_TAGS = ('sweep', 'clutch', 'rematch', 'crit', 'milestone')
+EMOTIONAL_TAGS = ('resilience', 'dominance', 'underdog')
+NARRATIVE_TAGS = ('sweep', 'clutch', 'grind', 'story', 'crit', 'milestone')
+
+NATURE_NAMES = ('Hardy', 'Lonely', 'Brave', 'Adamant', 'Naughty', 'Bold', 'Docile', 'Relaxed',
+                'Impish', 'Lax', 'Timid', 'Hasty', 'Serious', 'Jolly', 'Naive', 'Modest', 'Mild',
+                'Quiet', 'Bashful', 'Rash', 'Calm', 'Gentle', 'Sassy', 'Careful', 'Quirky')
+# Status condition bits → tag, first match wins (sleep uses the low 3 bits as a counter)
+STATUS_TAGS = ((0x07, 'SLP'), (0x08, 'PSN'), (0x10, 'BRN'), (0x20, 'FRZ'), (0x40, 'PAR'), (0x80, 'TOX'))
+
+
+class EntityTagExtractor:
+    """
+    Single-pass Pokemon / move / narrative-tag extraction.
+
+    Replaces the per-class keyword loops (a hardcoded 10- or 11-name species
+    list, substring checks per tag) with one compiled pattern built from the
+    full species table, MOVE_NAMES and TAG_LEXICON. Terms are folded into a
+    character trie and emitted as a prefix-factored regex, so matching costs
+    one scan over the lowercased text regardless of how many terms there are.
+
+    Species and move names must match whole words; tag terms match word
+    prefixes, like the old substring checks but without hits inside other
+    words ("enclosed" no longer counts as "close").
+
+    Benchmark against the old loops: tools/bench_extraction.py
+    """
+
+    _default = None
+
+    def __init__(self, species_names=None, move_names=None, lexicon: dict = None):
+        if isinstance(species_names, dict):
+            species_names = species_names.values()
+        if isinstance(move_names, dict):
+            move_names = move_names.values()
+        lexicon = TAG_LEXICON if lexicon is None else lexicon
+
+        self._entities = {}     # lowercase term -> ('pokemon' | 'move', canonical name)
+        for name in species_names or ():
+            self._entities.setdefault(name.lower(), ('pokemon', name))
+        for name in move_names or ():
+            self._entities.setdefault(name.lower(), ('move', name))
+        self._tags = {}         # lowercase term -> [tag, ...]
+        for tag, terms in lexicon.items():
+            for term in terms:
+                self._tags.setdefault(term.lower(), []).append(tag)
+
+        parts = []
+        if self._entities:
+            parts.append(f"(?P<entity>{self._trie_pattern(self._entities)})(?!\\w)")
+        if self._tags:
+            parts.append(f"(?P<tag>{self._trie_pattern(self._tags)})")
+        self._pattern = re.compile(r"(?<!\w)(?:" + '|'.join(parts) + ")") if parts else None
+
+    @classmethod
+    def default(cls) -> 'EntityTagExtractor':
+        """Shared instance built from data/emerald_species.json (for standalone use)."""
+        if cls._default is None:
+            species_file = Path(__file__).resolve().parent.parent / 'data' / 'emerald_species.json'
+            cls._default = cls(load_species_names(species_file), MOVE_NAMES)
+        return cls._default
+
+    @staticmethod
+    def _trie_pattern(terms) -> str:
+        trie = {}
+        for term in terms:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[''] = {}
+
+        def emit(node: dict) -> str:
+            branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+            if not branches:
+                return ''
+            ends_here = '' in node
+            if len(branches) == 1 and not ends_here:
+                return branches[0]
+            group = '(?:' + '|'.join(branches) + ')'
+            return group + '?' if ends_here else group
+
+        return emit(trie)
+
+    def extract(self, text: str) -> dict:
+        """Return {'pokemon': [...], 'moves': [...], 'tags': [...]} in first-seen order."""
+        found = {'pokemon': [], 'moves': [], 'tags': []}
+        if not text or self._pattern is None:
+            return found
+        for m in self._pattern.finditer(text.lower()):
+            if m.lastgroup == 'entity':
+                kind, name = self._entities[m.group('entity')]
+                bucket = found['pokemon' if kind == 'pokemon' else 'moves']
+                if name not in bucket:
+                    bucket.append(name)
+            else:
+                for tag in self._tags[m.group('tag')]:
+                    if tag not in found['tags']:
+                        found['tags'].append(tag)
+        return found
+
+
 class LearningDirectives:
     """
     Issue #23 — Controllable Learning Focus ("Tell Me What To Learn", arxiv 2602.23201).
@@ -339,23 +468,45 @@ class PlayerProfileTracker:
         ace_consistency     — how loyal they are to one lead
         type_specialization — dominant type if 40%+ exposure skews one way
         comeback_ratio      — how often they win after a loss
+
+    Persistence is write-behind (WriteBehindFile): updates change the in-memory
+    profile and mark it dirty; it is written after FLUSH_EVERY updates,
+    FLUSH_INTERVAL_SEC after the first unsaved update, or on flush() at
+    shutdown. Writes go to a temp file that is fsynced and renamed over the
+    profile, so a crash leaves either the old or the new profile, never a torn one.
     """
 
     PROFILE_VERSION = 2
+    FLUSH_EVERY = 10            # Updates coalesced into one write
+    FLUSH_INTERVAL_SEC = 30     # Max age of an unsaved update
 
     def __init__(self, profile_path: Path, species_names: dict):
         self.path = profile_path
         self.species_names = species_names
+        self._lock = threading.Lock()
+        self._writer = WriteBehindFile(self.path, self._serialize,
+                                       self.FLUSH_EVERY, self.FLUSH_INTERVAL_SEC)
         self.profile = self._load()
 
+    @property
+    def flush_stats(self) -> dict:
+        return self._writer.stats
+
     def _load(self) -> dict:
         if self.path.exists():
             try:
-                data = json.load(open(self.path))
+                with open(self.path) as f:
+                    data = json.load(f)
                 if data.get('version') == self.PROFILE_VERSION:
                     return data
-            except Exception:
-                pass
+            except Exception as e:
+                # Keep the unreadable file for inspection instead of overwriting it
+                corrupt = self.path.with_name(self.path.name + '.corrupt')
+                try:
+                    self.path.rename(corrupt)
+                except OSError:
+                    pass
+                print(f"⚠️ Player profile unreadable ({e}); starting fresh, kept {corrupt.name}")
         return self._default()
 
     def _default(self) -> dict:
@@ -388,13 +539,19 @@ class PlayerProfileTracker:
         }
 
     def _save(self):
-        self._recompute_attributes()
-        self.profile['updated_at'] = datetime.now().isoformat()
-        try:
-            with open(self.path, 'w') as f:
-                json.dump(self.profile, f, indent=2)
-        except Exception:
-            pass
+        """Record an update: refresh derived attributes, write later (see flush)."""
+        with self._lock:
+            self._recompute_attributes()
+            self.profile['updated_at'] = datetime.now().isoformat()
+        self._writer.mark_dirty()
+
+    def _serialize(self) -> str:
+        with self._lock:
+            return json.dumps(self.profile, indent=2)
+
+    def flush(self):
+        """Write the profile now if it has unsaved updates (temp file + fsync + rename)."""
+        self._writer.flush()
 
     def _recompute_attributes(self):
         p = self.profile
@@ -440,49 +597,56 @@ class PlayerProfileTracker:
 
     def update_battle(self, outcome: str, party: list, was_close: bool, is_trainer: bool):
         """Update profile from battle end event."""
-        p = self.profile
-        p['total_battles'] += 1
+        with self._lock:
+            p = self.profile
+            p['total_battles'] += 1
 
-        won = (outcome == 'won')
-        lost = (outcome == 'lost')
+            won = (outcome == 'won')
+            lost = (outcome == 'lost')
 
-        if won:
-            p['battles_won'] += 1
-            if p.get('_last_was_loss'):
-                p['comebacks'] += 1
-        elif lost:
-            p['battles_lost'] += 1
+            if won:
+                p['battles_won'] += 1
+                if p.get('_last_was_loss'):
+                    p['comebacks'] += 1
+            elif lost:
+                p['battles_lost'] += 1
 
-        p['_last_was_loss'] = lost
-        if was_close:
-            p['close_calls'] += 1
+            p['_last_was_loss'] = lost
+            if was_close:
+                p['close_calls'] += 1
 
-        # Track lead Pokemon (slot 0)
-        if party:
-            lead = party[0]
-            species_id = str(lead.get('species', 0))
-            name = self.species_names.get(int(species_id), f"Pokemon #{species_id}")
-            rec = p['pokemon_trust'].setdefault(species_id, {
-                'name': name, 'battles_led': 0, 'battles_won': 0
-            })
-            rec['battles_led'] += 1
-            if won:
-                rec['battles_won'] += 1
+            # Track lead Pokemon (slot 0)
+            if party:
+                lead = party[0]
+                species_id = str(lead.get('species', 0))
+                name = self.species_names.get(int(species_id), f"Pokemon #{species_id}")
+                rec = p['pokemon_trust'].setdefault(species_id, {
+                    'name': name, 'battles_led': 0, 'battles_won': 0
+                })
+                rec['battles_led'] += 1
+                if won:
+                    rec['battles_won'] += 1
 
         self._save()
 
     def update_caught(self, species_id: int, species_name: str):
         """Update profile when a Pokemon is caught."""
-        self.profile['pokemon_caught'] += 1
+        with self._lock:
+            self.profile['pokemon_caught'] += 1
         self._save()
 
     def update_move_mastery(self, move_id: int, count: int, move_name: str):
         """Update profile on move mastery milestone."""
-        self.profile['move_mastery'][str(move_id)] = {'name': move_name, 'count': count}
+        with self._lock:
+            self.profile['move_mastery'][str(move_id)] = {'name': move_name, 'count': count}
         self._save()
 
     def get_context_block(self) -> str:
         """Format player profile as a structured context block for prompt injection."""
+        with self._lock:
+            return self._format_context_block()
+
+    def _format_context_block(self) -> str:
         p = self.profile
         attrs = p['attributes']
         trust = p['pokemon_trust']
@@ -541,12 +705,104 @@ class PlayerProfileTracker:
         return '\n'.join(lines)
 
 
+class DecisionSimilarityIndex:
+    """
+    MinHash/LSH index over decision context signals.
+
+    Each decision carries a set of signal strings (event type, drought bucket,
+    party and enemy species, arc names, battle tags — see
+    PokemonGM._situation_signals). Sets are reduced to NUM_PERM-slot MinHash
+    signatures and bucketed by BANDS bands of ROWS rows, so "decisions made in
+    situations like this one" only compares against colliding buckets instead
+    of every decision ever logged. Candidates are re-ranked by exact Jaccard.
+
+    Recall against brute-force Jaccard: tools/bench_similarity.py
+    """
+
+    BANDS = 20
+    ROWS = 3
+    NUM_PERM = BANDS * ROWS
+    _PRIME = (1 << 61) - 1
+    _MASK = (1 << 32) - 1
+
+    def __init__(self, seed: int = 0x5EED):
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME))
+                       for _ in range(self.NUM_PERM)]
+        self._feature_hashes = {}  # signal -> NUM_PERM permuted hashes
+        self._buckets = {}        # (band, band signature) -> [item id, ...]
+        self._items = []          # item id -> (signal frozenset, payload)
+
+    @staticmethod
+    def drought_bucket(drought: int) -> str:
+        """Coarse drought bucket, so 6 and 7 events without a reward look alike."""
+        drought = drought or 0
+        for limit, label in ((0, '0'), (2, '1-2'), (5, '3-5'), (10, '6-10')):
+            if drought <= limit:
+                return label
+        return '11+'
+
+    def _hashes(self, signal: str) -> tuple:
+        """All NUM_PERM permuted hashes of one signal (cached; signals repeat a lot)."""
+        hashes = self._feature_hashes.get(signal)
+        if hashes is None:
+            h = zlib.crc32(signal.encode())
+            prime, mask = self._PRIME, self._MASK
+            hashes = self._feature_hashes[signal] = tuple(
+                ((a * h + b) % prime) & mask for a, b in self._perms)
+        return hashes
+
+    def signature(self, signals) -> tuple:
+        vectors = [self._hashes(sig) for sig in signals]
+        if not vectors:
+            return ()
+        return tuple(map(min, *vectors)) if len(vectors) > 1 else vectors[0]
+
+    def _band_keys(self, sig: tuple):
+        rows = self.ROWS
+        for band in range(self.BANDS):
+            yield band, sig[band * rows:(band + 1) * rows]
+
+    def add(self, signals, payload) -> None:
+        signals = frozenset(signals)
+        sig = self.signature(signals)
+        if not sig:
+            return
+        item_id = len(self._items)
+        self._items.append((signals, payload))
+        for key in self._band_keys(sig):
+            self._buckets.setdefault(key, []).append(item_id)
+
+    def candidates(self, signals) -> set:
+        sig = self.signature(signals)
+        found = set()
+        if sig:
+            for key in self._band_keys(sig):
+                found.update(self._buckets.get(key, ()))
+        return found
+
+    def query(self, signals, n: int = 3, min_jaccard: float = 0.0) -> list:
+        """[(jaccard, payload)] for the n most similar items, best first (newest wins ties)."""
+        signals = frozenset(signals)
+        scored = []
+        for item_id in self.candidates(signals):
+            item_signals, payload = self._items[item_id]
+            j = len(signals & item_signals) / len(signals | item_signals)
+            if j >= min_jaccard:
+                scored.append((j, item_id, payload))
+        scored.sort(key=lambda x: (-x[0], -x[1]))
+        return [(j, payload) for j, _, payload in scored[:n]]
+
+    def __len__(self):
+        return len(self._items)
+
+
 class DecisionLogger:
     """
     Issue #20 — Maren Decision Library (MAS-on-the-Fly-inspired, arxiv 2602.13671).
 
     Phase 1 (current): Data collection only.
-    Logs every reward decision to decisions.jsonl so patterns can emerge over sessions.
+    Logs every reward decision to the decision store so patterns can emerge over sessions.
 
     Phase 2 (future, after 10+ sessions): Retrieve similar past decisions via event_type
     matching and inject as 'what worked before' context — exactly MAS-on-the-Fly's
@@ -555,17 +811,101 @@ class DecisionLogger:
     Log schema:
         ts, event_type, action, reward_type, drought, arcs_active,
         session_visible, arc_closed, response_snippet
+
+    Records live in the shared DecisionStore (SQLite). Retrieval is served from
+    in-memory ring indexes (per event type, per reward type, and per (event type,
+    reward type) pair), built from the store at construction and updated by
+    log() — the prompt path never touches the database. If the build fails,
+    the indexes stay empty and the next log() retries it.
+
+    Successful decisions are also indexed by their context signals in a
+    DecisionSimilarityIndex, so retrieval can find past successes in similar
+    situations (same party, enemy, arcs, drought) rather than just the latest
+    ones of the same event type.
     """
 
     MIN_ENTRIES_FOR_RETRIEVAL = 20  # Don't retrieve until we have enough data
+    RING_SIZE = 50                  # Entries kept per index key
+    MIN_SIMILARITY = 0.25           # Jaccard floor for "similar situation" matches
+
+    def __init__(self, store: DecisionStore):
+        self.store = store
+        self.subscribers = []   # fn(row_id, entry), called after each append
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._reset_indexes()
+        self._load()
+
+    def _reset_indexes(self):
+        self._count = 0
+        self._by_event = {}
+        self._by_reward = {}
+        self._by_pair = {}
+        self._similar = DecisionSimilarityIndex()
+
+    @staticmethod
+    def _entry_signals(entry: dict) -> list:
+        """Logged signals; older rows predate them, so fall back to type + drought."""
+        signals = entry.get('signals')
+        if signals:
+            return signals
+        return [f"event:{entry.get('event_type', 'unknown')}",
+                f"drought:{DecisionSimilarityIndex.drought_bucket(entry.get('drought', 0))}"]
+
+    def _index(self, entry: dict):
+        etype = entry.get('event_type', 'unknown')
+        rtype = entry.get('reward_type', 'none')
+        for index, key in ((self._by_event, etype), (self._by_reward, rtype),
+                           (self._by_pair, (etype, rtype))):
+            ring = index.get(key)
+            if ring is None:
+                ring = index[key] = deque(maxlen=self.RING_SIZE)
+            ring.append(entry)
+        if rtype == 'visible':
+            self._similar.add(self._entry_signals(entry), entry)
+        self._count += 1
+
+    def _load(self):
+        """Build the indexes from the decision store; left unloaded (for a retry) on failure."""
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                for entry in self.store.iter_entries():
+                    self._index(entry)
+            except Exception as e:
+                self._reset_indexes()
+                print(f"⚠️ Decision indexes not built ({e}); retrying on the next logged decision")
+                return
+            self._loaded = True
+
+    def recent(self, event_type: str = None, reward_type: str = None, n: int = 3) -> list:
+        """Most recent n entries matching the filters, oldest first (bounded by RING_SIZE)."""
+        if event_type is not None and reward_type is not None:
+            ring = self._by_pair.get((event_type, reward_type))
+        elif event_type is not None:
+            ring = self._by_event.get(event_type)
+        elif reward_type is not None:
+            ring = self._by_reward.get(reward_type)
+        else:
+            raise ValueError("recent() needs event_type and/or reward_type")
+        if not ring or n <= 0:
+            return []
+        return list(ring)[-n:]
+
+    def similar(self, signals, n: int = 3) -> list:
+        """Past successful decisions whose context signals best match, most similar first."""
+        with self._lock:
+            return [entry for _, entry in
+                    self._similar.query(signals, n=n, min_jaccard=self.MIN_SIMILARITY)]
 
-    def __init__(self, log_path: Path):
-        self.path = log_path
+    def count(self) -> int:
+        return self._count
 
     def log(self, event_type: str, action_cmd: str, reward_type: str,
             drought: int, arcs_active: int, session_visible: int,
-            arc_closed: str = None, response_snippet: str = ''):
-        """Append a decision record."""
+            arc_closed: str = None, response_snippet: str = '', signals=None):
+        """Append a decision record. signals: context signals (EventContext.signals)."""
         entry = {
             'ts': datetime.now().isoformat(),
             'event_type': event_type,
@@ -577,40 +917,47 @@ class DecisionLogger:
             'arc_closed': arc_closed,
             'snippet': response_snippet[:200] if response_snippet else '',
         }
+        if signals:
+            entry['signals'] = sorted(signals)
         try:
-            with open(self.path, 'a') as f:
-                f.write(json.dumps(entry) + '\n')
-        except Exception:
-            pass
+            row_id = self.store.append(entry)
+        except Exception as e:
+            print(f"⚠️ Decision not stored: {e}")
+            return
+        if self._loaded:
+            with self._lock:
+                self._index(entry)
+        else:
+            self._load()    # Retry a failed build; the entry is picked up from the store
+        for subscriber in self.subscribers:
+            try:
+                subscriber(row_id, entry)
+            except Exception as e:
+                name = getattr(subscriber, '__qualname__', repr(subscriber))
+                print(f"⚠️ Decision subscriber {name} failed: {e}")
 
-    def get_recent_patterns(self, event_type: str, n: int = 3) -> str:
+    def get_recent_patterns(self, event_type: str, n: int = 3, signals=None) -> str:
         """
-        Phase 2 retrieval: fetch recent successful decisions for the same event type.
+        Phase 2 retrieval: fetch past successful decisions made in situations
+        like this one (by context signals), falling back to the most recent
+        successes for the same event type.
         Returns empty string until MIN_ENTRIES_FOR_RETRIEVAL decisions are logged.
         """
         try:
-            if not self.path.exists():
-                return ''
-            entries = []
-            with open(self.path) as f:
-                for line in f:
-                    try:
-                        entries.append(json.loads(line.strip()))
-                    except Exception:
-                        pass
-
-            if len(entries) < self.MIN_ENTRIES_FOR_RETRIEVAL:
+            if self.count() < self.MIN_ENTRIES_FOR_RETRIEVAL:
                 return ''   # Not enough data yet
 
-            # Filter to visible rewards for the same event type (the "successes")
-            relevant = [e for e in entries
-                        if e['reward_type'] == 'visible' and e['event_type'] == event_type]
-            if not relevant:
+            # Visible rewards (the "successes") in the most similar situations
+            past = self.similar(signals, n=n) if signals else []
+            header = '=== PAST SUCCESSFUL DECISIONS (similar situations) ==='
+            if not past:
+                past = self.recent(event_type=event_type, reward_type='visible', n=n)
+                header = '=== PAST SUCCESSFUL DECISIONS (similar events) ==='
+            if not past:
                 return ''
 
-            recent = relevant[-n:]
-            lines = ['=== PAST SUCCESSFUL DECISIONS (similar events) ===']
-            for e in recent:
+            lines = [header]
+            for e in past:
                 arc_note = f" [closed {e['arc_closed']}]" if e.get('arc_closed') else ''
                 lines.append(f"• {e['event_type']} → {e['action']}{arc_note}")
             lines.append('Consider what made these work and whether the current moment is similar.')
@@ -624,103 +971,170 @@ class TrajectoryLearner:
     """
     Issue #37 — Trajectory Learning System (IBM arxiv 2603.10600-inspired).
 
-    Analyzes decisions.jsonl to extract strategic insights that guide future decisions.
+    Analyzes the decision store to extract strategic insights that guide future decisions.
     Based on "Trajectory-Informed Memory Generation for Self-Improving Agent Systems":
     - Trajectory Intelligence Extractor: parses decision logs
     - Contextual Learning Generator: produces strategy/recovery/optimization tips
     - Adaptive Memory Retrieval: injects learned strategies into prompts
 
+    Aggregates are maintained online: observe() folds each new decision in as
+    DecisionLogger appends it, so the strategies block is always current and
+    costs O(event types). They are snapshotted to trajectory_snapshot.json with
+    the last row id folded in; startup loads the snapshot and only replays rows
+    logged after it. Aggregates cover all history, including rows since
+    compacted out of the store.
+
     Output: structured "LEARNED STRATEGIES" block injected after player profile.
     Only activates after MIN_ENTRIES decisions are logged.
     """
 
     MIN_ENTRIES = 30  # Need enough data for meaningful patterns
-    CACHE_TTL_SEC = 3600  # Re-analyze every hour (not every prompt)
-
-    def __init__(self, decisions_path: Path):
-        self.decisions_path = decisions_path
-        self._cache = None
-        self._cache_time = 0
-
-    def analyze(self) -> dict:
-        """
-        Extract strategic patterns from decisions.jsonl.
-        Returns dict with: event_patterns, drought_recovery, strategy_tips.
-        """
-        if not self.decisions_path.exists():
-            return {}
-
+    SNAPSHOT_EVERY = 10  # Persist after this many observed decisions
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, store: DecisionStore, snapshot_path: Path = None):
+        self.store = store
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        self._reset()
+        self._unsaved = 0
+        self._load_snapshot()
+        self._catch_up()
+
+    def _reset(self):
+        self.last_id = 0
+        self.total = 0
+        self.event_stats = {}
+        self.drought_break_actions = {}   # GM function -> times it broke a drought
+        self.visible_drought_sum = 0
+        self.visible_count = 0
+        self.arc_closure_count = 0
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
         try:
-            entries = []
-            with open(self.decisions_path) as f:
-                for line in f:
-                    try:
-                        entries.append(json.loads(line.strip()))
-                    except Exception:
-                        pass
-
-            if len(entries) < self.MIN_ENTRIES:
-                return {}
-
-            # --- Trajectory Intelligence Extraction ---
+            with open(self.snapshot_path) as f:
+                snap = json.load(f)
+            if snap.get('version') != self.SNAPSHOT_VERSION:
+                return
+            self.last_id = snap['last_id']
+            self.total = snap['total']
+            self.event_stats = snap['event_stats']
+            self.drought_break_actions = snap['drought_break_actions']
+            self.visible_drought_sum = snap['visible_drought_sum']
+            self.visible_count = snap['visible_count']
+            self.arc_closure_count = snap['arc_closure_count']
+        except Exception:
+            self._reset()  # Corrupt snapshot — rebuild from the store
 
-            # 1. Event type effectiveness (none rate per type)
-            event_stats = {}
-            for e in entries:
-                etype = e.get('event_type', 'unknown')
-                rtype = e.get('reward_type', 'none')
-                if etype not in event_stats:
-                    event_stats[etype] = {'total': 0, 'visible': 0, 'ev': 0, 'none': 0}
-                event_stats[etype]['total'] += 1
-                event_stats[etype][rtype] = event_stats[etype].get(rtype, 0) + 1
+    def save_snapshot(self):
+        """Atomically write the aggregates (atomic_write: tmp file + fsync + rename)."""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            # Serialized under the lock so the aggregates match last_id exactly
+            snap = json.dumps({
+                'version': self.SNAPSHOT_VERSION,
+                'last_id': self.last_id,
+                'total': self.total,
+                'event_stats': self.event_stats,
+                'drought_break_actions': self.drought_break_actions,
+                'visible_drought_sum': self.visible_drought_sum,
+                'visible_count': self.visible_count,
+                'arc_closure_count': self.arc_closure_count,
+                'updated_at': datetime.now().isoformat(),
+            })
+            self._unsaved = 0
+        try:
+            atomic_write(self.snapshot_path, snap)
+        except Exception as e:
+            print(f"⚠️ Trajectory snapshot not saved: {e}")
 
+    def _catch_up(self):
+        """Fold in rows logged after the snapshot (all rows if there is none)."""
+        replayed = 0
+        try:
+            while True:
+                batch = self.store.entries_after(self.last_id)
+                if not batch:
+                    break
+                for row_id, entry in batch:
+                    self._fold(row_id, entry)
+                    replayed += 1
+        except Exception as e:
+            print(f"⚠️ Trajectory catch-up stopped after {replayed} rows: {e}")
+        if replayed:
+            self.save_snapshot()
+
+    def _fold(self, row_id: int, entry: dict):
+        if row_id <= self.last_id:
+            return  # Already folded (snapshot or catch-up)
+        self.last_id = row_id
+        self.total += 1
+
+        # 1. Event type effectiveness (none rate per type)
+        etype = entry.get('event_type', 'unknown')
+        rtype = entry.get('reward_type', 'none')
+        stats = self.event_stats.setdefault(etype, {'total': 0, 'visible': 0, 'ev': 0, 'none': 0})
+        stats['total'] += 1
+        stats[rtype] = stats.get(rtype, 0) + 1
+
+        if rtype == 'visible':
             # 2. Drought recovery patterns (what actions broke high droughts)
-            drought_breaks = []  # entries where drought was high and visible reward given
-            for e in entries:
-                if e.get('reward_type') == 'visible' and e.get('drought', 0) >= 5:
-                    drought_breaks.append({
-                        'drought': e['drought'],
-                        'event_type': e['event_type'],
-                        'action': e['action'],
-                    })
-
+            drought = entry.get('drought', 0) or 0
+            if drought >= 5:
+                action = entry.get('action', 'none')
+                func = action.split('(')[0] if '(' in action else action
+                self.drought_break_actions[func] = self.drought_break_actions.get(func, 0) + 1
             # 3. Average drought at visible reward
-            visible_droughts = [e.get('drought', 0) for e in entries if e.get('reward_type') == 'visible']
-            avg_drought_at_visible = sum(visible_droughts) / len(visible_droughts) if visible_droughts else 0
-
-            # 4. Arc closure success rate (when arcs are closed)
-            arc_closures = [e for e in entries if e.get('arc_closed')]
+            self.visible_drought_sum += drought
+            self.visible_count += 1
+
+        # 4. Arc closure success rate (when arcs are closed)
+        if entry.get('arc_closed'):
+            self.arc_closure_count += 1
+
+    def observe(self, row_id: int, entry: dict):
+        """DecisionLogger subscriber: fold one freshly logged decision in."""
+        with self._lock:
+            self._fold(row_id, entry)
+            self._unsaved += 1
+            due = self._unsaved >= self.SNAPSHOT_EVERY
+        if due:
+            self.save_snapshot()
 
+    def analyze(self) -> dict:
+        """
+        Current strategic aggregates (maintained online, no store scan).
+        Returns dict with: event_stats, drought_break_actions, avg_drought_at_visible, ...
+        """
+        with self._lock:
+            if self.total < self.MIN_ENTRIES:
+                return {}
             return {
-                'event_stats': event_stats,
-                'drought_breaks': drought_breaks,
-                'avg_drought_at_visible': avg_drought_at_visible,
-                'arc_closures': arc_closures,
-                'total_entries': len(entries),
+                'event_stats': {k: dict(v) for k, v in self.event_stats.items()},
+                'drought_break_actions': dict(self.drought_break_actions),
+                'avg_drought_at_visible': (self.visible_drought_sum / self.visible_count
+                                           if self.visible_count else 0),
+                'arc_closure_count': self.arc_closure_count,
+                'total_entries': self.total,
             }
 
-        except Exception:
-            return {}
-
     def get_strategies_block(self, current_event_type: str = None) -> str:
         """
         Generate "LEARNED STRATEGIES" block for prompt injection.
-        Caches analysis to avoid re-reading on every prompt.
+        Reads the online aggregates, so it is always current.
         """
-        now = time.time()
-        if self._cache is None or (now - self._cache_time) > self.CACHE_TTL_SEC:
-            self._cache = self.analyze()
-            self._cache_time = now
-
-        analysis = self._cache
+        analysis = self.analyze()
         if not analysis:
             return ''
 
         tips = []
         event_stats = analysis.get('event_stats', {})
-        drought_breaks = analysis.get('drought_breaks', [])
+        break_actions = analysis.get('drought_break_actions', {})
         avg_drought = analysis.get('avg_drought_at_visible', 0)
-        arc_closures = analysis.get('arc_closures', [])
+        arc_closures = analysis.get('arc_closure_count', 0)
 
         # --- Contextual Learning Generator ---
 
@@ -736,14 +1150,9 @@ class TrajectoryLearner:
             worst = max(underused, key=lambda x: x[1])
             tips.append(f"📊 UNDERUSED: {worst[0]} has {worst[1]}% none rate — these events are opportunities")
 
-        # Recovery tip: what breaks droughts
-        if drought_breaks:
-            # Group by action pattern
-            actions = {}
-            for db in drought_breaks:
-                action = db['action'].split('(')[0] if '(' in db['action'] else db['action']
-                actions[action] = actions.get(action, 0) + 1
-            top_action = max(actions.items(), key=lambda x: x[1])
+        # Recovery tip: what breaks droughts (grouped by action pattern)
+        if break_actions:
+            top_action = max(break_actions.items(), key=lambda x: x[1])
             tips.append(f"🔧 RECOVERY: {top_action[0]} broke drought {top_action[1]}x in past sessions")
 
         # Optimization tip: when to act
@@ -752,7 +1161,7 @@ class TrajectoryLearner:
 
         # Arc tip: what works for arc closure
         if arc_closures:
-            tips.append(f"🎯 ARCS: {len(arc_closures)} arc closures successful — explicit payoffs work")
+            tips.append(f"🎯 ARCS: {arc_closures} arc closures successful — explicit payoffs work")
 
         # Current event context
         if current_event_type and current_event_type in event_stats:
@@ -788,252 +1197,270 @@ class SkillExtractor:
     Key insight from XSkill: +33% improvement on tool use from skill extraction.
     Skills are more reusable than raw experiences because they abstract the context.
 
+    Clusters are maintained incrementally: observe() folds each visible
+    decision into its action group's frequency counters and marks only that
+    group dirty, so skills are regenerated for changed groups alone. A
+    signal → skill index is rebuilt alongside, and matching only touches
+    skills that share a signal with the current context. Groups and skills
+    are snapshotted to skills_snapshot.json; startup replays only rows logged
+    after the snapshot.
+
     Output: "APPLICABLE SKILLS" block with relevant procedural patterns.
     """
 
     MIN_ENTRIES = 20  # Need enough decisions to extract patterns
-    CACHE_TTL_SEC = 3600  # Re-extract skills hourly (expensive operation)
+    MIN_VISIBLE = 3  # ...and enough successes to cluster
+    MAX_SKILLS = 5
+    SNAPSHOT_EVERY = 10  # Persist after this many observed decisions
+    SNAPSHOT_VERSION = 1
+
+    # Condition phrases in priority order; only the first two make the pattern
+    CONTEXT_CONDITIONS = (
+        ('sweep', "after a clean sweep"),
+        ('clutch', "after a clutch battle"),
+        ('milestone', "on a level/evolution milestone"),
+    )
+    EMOTIONAL_CONDITIONS = (
+        ('dominance', "to reinforce dominance"),
+        ('resilience', "to acknowledge resilience"),
+    )
+
+    def __init__(self, store: DecisionStore, extractor: 'EntityTagExtractor' = None,
+                 snapshot_path: Path = None):
+        self.store = store
+        self.extractor = extractor or EntityTagExtractor.default()
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        self._reset()
+        self._unsaved = 0
+        self._load_snapshot()
+        self._catch_up()
+
+    def _reset(self):
+        self.last_id = 0
+        self.total = 0
+        self.visible = 0
+        self.groups = {}        # GM function -> {count, pokemon, context, emotional, example_snippet}
+        self.group_skills = {}  # GM function -> skill dict (groups with a pattern only)
+        self._dirty = set()
+        self._skills = []       # top MAX_SKILLS, most confident first
+        self._index = {}        # (kind, signal) -> [(position in _skills, boost), ...]
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path) as f:
+                snap = json.load(f)
+            if snap.get('version') != self.SNAPSHOT_VERSION:
+                return
+            self.last_id = snap['last_id']
+            self.total = snap['total']
+            self.visible = snap['visible']
+            self.groups = snap['groups']
+            self.group_skills = snap['skills']
+            self._rank_skills()
+        except Exception:
+            self._reset()  # Corrupt snapshot — rebuild from the store
+
+    def save_snapshot(self):
+        """Atomically write groups and skills (atomic_write: tmp file + fsync + rename)."""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            self._refresh()
+            snap = json.dumps({
+                'version': self.SNAPSHOT_VERSION,
+                'last_id': self.last_id,
+                'total': self.total,
+                'visible': self.visible,
+                'groups': self.groups,
+                'skills': self.group_skills,
+                'updated_at': datetime.now().isoformat(),
+            })
+            self._unsaved = 0
+        try:
+            atomic_write(self.snapshot_path, snap)
+        except Exception as e:
+            print(f"⚠️ Skill snapshot not saved: {e}")
 
-    def __init__(self, decisions_path: Path):
-        self.decisions_path = decisions_path
-        self._skills_cache = None
-        self._cache_time = 0
+    def _catch_up(self):
+        """Fold in rows logged after the snapshot (all rows if there is none)."""
+        replayed = 0
+        try:
+            while True:
+                batch = self.store.entries_after(self.last_id)
+                if not batch:
+                    break
+                for row_id, entry in batch:
+                    self._fold(row_id, entry)
+                    replayed += 1
+        except Exception as e:
+            print(f"⚠️ Skill catch-up stopped after {replayed} rows: {e}")
+        if replayed:
+            self.save_snapshot()
 
     def _extract_context_signals(self, snippet: str) -> dict:
         """
         Parse the response snippet to extract context signals for skill matching.
-        Returns dict with: pokemon_mentioned, action_context, emotional_tone.
+        Returns dict with: pokemon, action_context (sweep, clutch, rematch, ...),
+        emotional (resilience, dominance, underdog).
         """
-        signals = {
-            'pokemon': [],
-            'action_context': [],  # sweep, clutch, close_call, rematch, etc.
-            'emotional': [],  # resilience, dominance, underdog, etc.
+        found = self.extractor.extract(snippet)
+        return {
+            'pokemon': found['pokemon'],
+            'action_context': [t for t in ACTION_CONTEXT_TAGS if t in found['tags']],
+            'emotional': [t for t in EMOTIONAL_TAGS if t in found['tags']],
         }
 
-        snippet_lower = snippet.lower()
-
-        # Pokemon detection (common starters and team members)
-        pokemon_names = ['blaziken', 'combusken', 'torchic', 'swellow', 'ninjask',
-                         'slaking', 'kirlia', 'ralts', 'lombre', 'pelipper']
-        for poke in pokemon_names:
-            if poke in snippet_lower:
-                signals['pokemon'].append(poke.capitalize())
-
-        # Action context detection
-        if any(w in snippet_lower for w in ['sweep', 'swept', 'clean', 'one turn', 'no damage']):
-            signals['action_context'].append('sweep')
-        if any(w in snippet_lower for w in ['clutch', 'close', 'close call', 'close-call']):
-            signals['action_context'].append('clutch')
-        if any(w in snippet_lower for w in ['rematch', 're-match', 'revenge']):
-            signals['action_context'].append('rematch')
-        if any(w in snippet_lower for w in ['crit', 'critical']):
-            signals['action_context'].append('crit')
-        if any(w in snippet_lower for w in ['level', 'leveled', 'evolved', 'evolution']):
-            signals['action_context'].append('milestone')
-
-        # Emotional tone detection
-        if any(w in snippet_lower for w in ['tanked', 'pushed through', 'despite']):
-            signals['emotional'].append('resilience')
-        if any(w in snippet_lower for w in ['dominated', 'swept', 'clean']):
-            signals['emotional'].append('dominance')
-        if any(w in snippet_lower for w in ['underdog', 'type disadvantage', 'against odds']):
-            signals['emotional'].append('underdog')
-
-        return signals
-
-    def _cluster_successful_decisions(self, entries: list) -> list:
-        """
-        Group successful (visible reward) decisions by similar context.
-        Returns clusters of decisions that share context patterns.
-        """
-        visible = [e for e in entries if e.get('reward_type') == 'visible']
-        if len(visible) < 3:
-            return []
-
-        # Extract context signals for each visible decision
-        enriched = []
-        for e in visible:
-            signals = self._extract_context_signals(e.get('snippet', ''))
-            enriched.append({
-                **e,
-                'signals': signals,
-            })
+    def _fold(self, row_id: int, entry: dict):
+        if row_id <= self.last_id:
+            return  # Already folded (snapshot or catch-up)
+        self.last_id = row_id
+        self.total += 1
+        if entry.get('reward_type') != 'visible':
+            return  # Only successes are clustered
+        self.visible += 1
 
         # Group by action pattern (the GM command function)
-        action_groups = {}
-        for e in enriched:
-            action = e.get('action', 'none')
-            # Extract just the function name
-            if '(' in action:
-                func = action.split('(')[0].replace('GM.', '')
-            else:
-                func = action
-            if func not in action_groups:
-                action_groups[func] = []
-            action_groups[func].append(e)
-
-        # For each action group with 2+ entries, look for context patterns
-        clusters = []
-        for func, group in action_groups.items():
-            if len(group) < 2:
-                continue
-
-            # Find common context signals
-            all_pokemon = []
-            all_contexts = []
-            all_emotional = []
-            for e in group:
-                all_pokemon.extend(e['signals']['pokemon'])
-                all_contexts.extend(e['signals']['action_context'])
-                all_emotional.extend(e['signals']['emotional'])
-
-            # Count frequencies
-            from collections import Counter
-            pokemon_freq = Counter(all_pokemon)
-            context_freq = Counter(all_contexts)
-            emotional_freq = Counter(all_emotional)
-
-            # Extract common patterns (appearing in 50%+ of decisions)
-            threshold = len(group) / 2
-            common_pokemon = [p for p, c in pokemon_freq.items() if c >= threshold]
-            common_context = [c for c, cnt in context_freq.items() if cnt >= threshold]
-            common_emotional = [e for e, cnt in emotional_freq.items() if cnt >= threshold]
-
-            if common_pokemon or common_context or common_emotional:
-                clusters.append({
-                    'action': func,
-                    'count': len(group),
-                    'common_pokemon': common_pokemon,
-                    'common_context': common_context,
-                    'common_emotional': common_emotional,
-                    'example_snippet': group[-1].get('snippet', '')[:100],
-                })
-
-        return clusters
-
-    def _generate_skills(self, clusters: list) -> list:
+        action = entry.get('action', 'none') or 'none'
+        func = action.split('(')[0].replace('GM.', '') if '(' in action else action
+        group = self.groups.setdefault(func, {
+            'count': 0, 'pokemon': {}, 'context': {}, 'emotional': {}, 'example_snippet': '',
+        })
+        snippet = entry.get('snippet', '')
+        signals = self._extract_context_signals(snippet)
+        group['count'] += 1
+        for key, values in (('pokemon', signals['pokemon']),
+                            ('context', signals['action_context']),
+                            ('emotional', signals['emotional'])):
+            freq = group[key]
+            for v in values:
+                freq[v] = freq.get(v, 0) + 1
+        group['example_snippet'] = snippet[:100]
+        self._dirty.add(func)
+
+    def observe(self, row_id: int, entry: dict):
+        """DecisionLogger subscriber: fold one freshly logged decision in."""
+        with self._lock:
+            self._fold(row_id, entry)
+            self._unsaved += 1
+            due = self._unsaved >= self.SNAPSHOT_EVERY
+        if due:
+            self.save_snapshot()
+
+    def _generate_skill(self, action: str, group: dict):
         """
-        Convert context clusters into reusable procedural "skills".
-        Each skill is a natural-language pattern that can be applied.
+        Convert one action group into a reusable procedural "skill", or None
+        if no context signal appears in 50%+ of its decisions.
         """
-        skills = []
-
-        for cluster in clusters:
-            action = cluster['action']
-            count = cluster['count']
-            pokemon = cluster.get('common_pokemon', [])
-            context = cluster.get('common_context', [])
-            emotional = cluster.get('common_emotional', [])
-
-            # Generate skill description based on patterns
-            conditions = []
-            if pokemon:
-                conditions.append(f"when {'/'.join(pokemon)} is involved")
-            if 'sweep' in context:
-                conditions.append("after a clean sweep")
-            if 'clutch' in context:
-                conditions.append("after a clutch battle")
-            if 'milestone' in context:
-                conditions.append("on a level/evolution milestone")
-            if 'dominance' in emotional:
-                conditions.append("to reinforce dominance")
-            if 'resilience' in emotional:
-                conditions.append("to acknowledge resilience")
-
-            if not conditions:
-                conditions = ["in similar situations"]
-
-            # Map action to readable reward type
-            action_readable = {
-                'give': 'Give item from bag',
-                'giveItem': 'Equip held item',
-                'teachMove': 'Teach a new move',
-                'addExperience': 'Award bonus XP',
-                'setShiny': 'Make shiny',
-                'setFriendship': 'Max friendship',
-            }.get(action, f'Use GM.{action}')
-
-            skill = {
-                'pattern': ' + '.join(conditions[:2]),  # Limit to 2 conditions
-                'action': action_readable,
-                'confidence': count,  # How many times this pattern succeeded
-                'raw_action': action,
-            }
-            skills.append(skill)
+        count = group['count']
+        if count < 2:
+            return None
+        threshold = count / 2
+        pokemon = [p for p, c in group['pokemon'].items() if c >= threshold]
+        context = [c for c, n in group['context'].items() if n >= threshold]
+        emotional = [e for e, n in group['emotional'].items() if n >= threshold]
+        if not (pokemon or context or emotional):
+            return None
+
+        # Generate skill description based on patterns; remember which
+        # signals each rendered condition stands for (for the index)
+        conditions = []
+        if pokemon:
+            conditions.append((f"when {'/'.join(pokemon)} is involved",
+                               [('pokemon', p.lower()) for p in pokemon]))
+        for tag, text in self.CONTEXT_CONDITIONS:
+            if tag in context:
+                conditions.append((text, [('context', tag)]))
+        for tag, text in self.EMOTIONAL_CONDITIONS:
+            if tag in emotional:
+                conditions.append((text, []))
+        if not conditions:
+            conditions = [("in similar situations", [])]
+        conditions = conditions[:2]  # Limit to 2 conditions
+
+        # Map action to readable reward type
+        action_readable = {
+            'give': 'Give item from bag',
+            'giveItem': 'Equip held item',
+            'teachMove': 'Teach a new move',
+            'addExperience': 'Award bonus XP',
+            'setShiny': 'Make shiny',
+            'setFriendship': 'Max friendship',
+        }.get(action, f'Use GM.{action}')
+
+        return {
+            'pattern': ' + '.join(text for text, _ in conditions),
+            'action': action_readable,
+            'confidence': count,  # How many times this pattern succeeded
+            'raw_action': action,
+            'signals': [sig for _, sigs in conditions for sig in sigs],
+        }
 
-        # Sort by confidence (most reliable patterns first)
-        skills.sort(key=lambda x: -x['confidence'])
-        return skills[:5]  # Return top 5 skills
+    def _rank_skills(self):
+        """Pick the top skills and rebuild the signal → skill index."""
+        ranked = sorted(self.group_skills.values(), key=lambda x: -x['confidence'])
+        self._skills = ranked[:self.MAX_SKILLS]
+        index = {}
+        for pos, skill in enumerate(self._skills):
+            for kind, signal in skill.get('signals', []):
+                boost = 2 if kind == 'pokemon' else 1
+                index.setdefault((kind, signal), []).append((pos, boost))
+        self._index = index
+
+    def _refresh(self):
+        """Regenerate skills for groups changed since the last call (lock held)."""
+        if not self._dirty:
+            return
+        for func in self._dirty:
+            skill = self._generate_skill(func, self.groups[func])
+            if skill:
+                self.group_skills[func] = skill
+            else:
+                self.group_skills.pop(func, None)
+        self._dirty.clear()
+        self._rank_skills()
+
+    def _current(self) -> tuple:
+        """(skills, index) as of now; empty until there is enough data."""
+        with self._lock:
+            if self.total < self.MIN_ENTRIES or self.visible < self.MIN_VISIBLE:
+                return [], {}
+            self._refresh()
+            return list(self._skills), self._index
 
     def extract_skills(self) -> list:
         """
-        Main extraction method. Returns list of skill dicts.
-        Caches results for CACHE_TTL_SEC.
+        Main extraction method. Returns list of skill dicts, most confident first.
+        Only groups touched since the last call are re-scored.
         """
-        now = time.time()
-        if self._skills_cache is not None and (now - self._cache_time) < self.CACHE_TTL_SEC:
-            return self._skills_cache
-
-        if not self.decisions_path.exists():
-            return []
-
-        try:
-            entries = []
-            with open(self.decisions_path) as f:
-                for line in f:
-                    try:
-                        entries.append(json.loads(line.strip()))
-                    except Exception:
-                        pass
-
-            if len(entries) < self.MIN_ENTRIES:
-                return []
-
-            clusters = self._cluster_successful_decisions(entries)
-            skills = self._generate_skills(clusters)
-
-            self._skills_cache = skills
-            self._cache_time = now
-            return skills
-
-        except Exception:
-            return []
+        return self._current()[0]
 
     def get_applicable_skills(self, event_type: str, context_snippet: str = '') -> str:
         """
         Return skills block for prompt injection.
-        Filters to skills relevant to current context.
+        Filters to skills relevant to current context via the signal index.
         """
-        skills = self.extract_skills()
+        skills, index = self._current()
         if not skills:
             return ''
 
         # Extract signals from current context
         current_signals = self._extract_context_signals(context_snippet)
 
-        # Score skills by relevance to current context
-        scored_skills = []
-        for skill in skills:
-            score = skill['confidence']  # Base score
-
-            # Boost if pokemon matches current context
-            pattern_lower = skill['pattern'].lower()
-            for poke in current_signals['pokemon']:
-                if poke.lower() in pattern_lower:
-                    score += 2
+        # Base score is confidence; matching pokemon (+2) and action context
+        # (+1) boost only the skills the index lists for that signal
+        scores = [skill['confidence'] for skill in skills]
+        for kind, values in (('pokemon', [p.lower() for p in current_signals['pokemon']]),
+                             ('context', current_signals['action_context'])):
+            for signal in values:
+                for pos, boost in index.get((kind, signal), ()):
+                    scores[pos] += boost
 
-            # Boost if action context matches
-            for ctx in current_signals['action_context']:
-                if ctx in pattern_lower:
-                    score += 1
-
-            scored_skills.append((skill, score))
-
-        # Sort by relevance score
-        scored_skills.sort(key=lambda x: -x[1])
-
-        # Take top 3 relevant skills
-        relevant = [s[0] for s in scored_skills[:3]]
+        # Take top 3 relevant skills (stable: ties keep confidence order)
+        order = sorted(range(len(skills)), key=lambda pos: -scores[pos])
+        relevant = [skills[pos] for pos in order[:3]]
 
         if not relevant:
             return ''
@@ -1053,7 +1480,7 @@ class DecisionMemoryCompressor:
     
     The paper achieves 11x compression while maintaining 96% retrieval quality using a 4-field schema.
     
-    Applied to Agentic Emerald's decisions.jsonl:
+    Applied to Agentic Emerald's decision store:
     - decision_core: event_type, action, reward_type (essential)
     - gameplay_context: drought, arcs, Pokemon involved (situational)
     - narrative_tags: sweep/clutch/grind/story (searchable)
@@ -1067,45 +1494,21 @@ class DecisionMemoryCompressor:
     
     Impact: Reduces storage growth while preserving retrieval quality for
     TrajectoryLearner (#37) and SkillExtractor (#38).
+
+    Compaction runs on a background thread (start_background) so startup is
+    not blocked. The store streams it one batch at a time, each batch's
+    summary insert + row delete committing atomically, so a crash or stop()
+    mid-run loses nothing and the next start picks up where it left off.
     """
     
     COMPRESSION_AGE_DAYS = 7  # Decisions older than this get compressed
     COMPRESSION_BATCH_SIZE = 50  # Compress in batches of this size
     
-    def __init__(self, decisions_path: Path, compressed_path: Path = None):
-        self.decisions_path = decisions_path
-        self.compressed_path = compressed_path or decisions_path.parent / 'decisions_compressed.jsonl'
-    
-    def _extract_narrative_tags(self, snippet: str) -> list:
-        """Extract narrative tags from decision snippet."""
-        tags = []
-        snippet_lower = snippet.lower()
-        
-        if any(w in snippet_lower for w in ['sweep', 'swept', 'clean']):
-            tags.append('sweep')
-        if any(w in snippet_lower for w in ['clutch', 'close', 'close_call']):
-            tags.append('clutch')
-        if any(w in snippet_lower for w in ['grind', 'routine']):
-            tags.append('grind')
-        if any(w in snippet_lower for w in ['story', 'maxie', 'aqua', 'magma', 'badge', 'gym']):
-            tags.append('story')
-        if any(w in snippet_lower for w in ['crit', 'critical']):
-            tags.append('crit')
-        if any(w in snippet_lower for w in ['level', 'evolved']):
-            tags.append('milestone')
-        
-        return tags
-    
-    def _extract_pokemon_mentions(self, snippet: str) -> list:
-        """Extract Pokemon names from snippet."""
-        pokemon = []
-        snippet_lower = snippet.lower()
-        common_pokemon = ['blaziken', 'combusken', 'torchic', 'swellow', 'ninjask',
-                         'slaking', 'kirlia', 'ralts', 'gardevoir', 'lombre', 'ludicolo']
-        for p in common_pokemon:
-            if p in snippet_lower:
-                pokemon.append(p.capitalize())
-        return pokemon
+    def __init__(self, store: DecisionStore, extractor: 'EntityTagExtractor' = None):
+        self.store = store
+        self.extractor = extractor or EntityTagExtractor.default()
+        self._stop = threading.Event()
+        self._thread = None
     
     def _compress_batch(self, entries: list) -> dict:
         """
@@ -1135,10 +1538,9 @@ class DecisionMemoryCompressor:
         all_tags = set()
         all_pokemon = set()
         for e in entries:
-            tags = self._extract_narrative_tags(e.get('snippet', ''))
-            all_tags.update(tags)
-            pokemon = self._extract_pokemon_mentions(e.get('snippet', ''))
-            all_pokemon.update(pokemon)
+            found = self.extractor.extract(e.get('snippet', ''))
+            all_tags.update(t for t in NARRATIVE_TAGS if t in found['tags'])
+            all_pokemon.update(found['pokemon'])
         
         # outcome: preserve key decisions (visible rewards in full)
         visible_actions = []
@@ -1181,96 +1583,64 @@ class DecisionMemoryCompressor:
     def compress_old_decisions(self) -> dict:
         """
         Compress decisions older than COMPRESSION_AGE_DAYS.
+        Each batch's summary is inserted and its rows deleted in one store transaction.
         Returns stats about compression.
         """
-        if not self.decisions_path.exists():
-            return {'compressed': 0, 'kept': 0, 'ratio': 0}
-        
         try:
-            # Read all decisions
-            entries = []
-            with open(self.decisions_path) as f:
-                for line in f:
-                    try:
-                        entries.append(json.loads(line.strip()))
-                    except Exception:
-                        pass
-            
-            if len(entries) < self.COMPRESSION_BATCH_SIZE:
-                return {'compressed': 0, 'kept': len(entries), 'ratio': 1.0, 'reason': 'not enough entries'}
+            total = self.store.count()
+            if total < self.COMPRESSION_BATCH_SIZE:
+                return {'compressed': 0, 'kept': total, 'ratio': 1.0, 'reason': 'not enough entries'}
             
             # Split by age
             cutoff = datetime.now() - timedelta(days=self.COMPRESSION_AGE_DAYS)
             cutoff_str = cutoff.isoformat()
             
-            recent = []
-            old = []
-            for e in entries:
-                ts = e.get('ts', '')
-                if ts >= cutoff_str:
-                    recent.append(e)
-                else:
-                    old.append(e)
-            
-            if len(old) < self.COMPRESSION_BATCH_SIZE:
-                return {'compressed': 0, 'kept': len(entries), 'ratio': 1.0, 'reason': 'not enough old entries'}
-            
-            # Compress old entries in batches
-            summaries = []
-            for i in range(0, len(old), self.COMPRESSION_BATCH_SIZE):
-                batch = old[i:i + self.COMPRESSION_BATCH_SIZE]
-                summary = self._compress_batch(batch)
-                if summary:
-                    summaries.append(summary)
-            
-            # Load existing compressed summaries (if any) and append
-            existing_summaries = []
-            if self.compressed_path.exists():
-                try:
-                    with open(self.compressed_path) as f:
-                        for line in f:
-                            try:
-                                existing_summaries.append(json.loads(line.strip()))
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
+            if self.store.count(before=cutoff_str) < self.COMPRESSION_BATCH_SIZE:
+                return {'compressed': 0, 'kept': total, 'ratio': 1.0, 'reason': 'not enough old entries'}
             
-            # Write all compressed summaries
-            all_summaries = existing_summaries + summaries
-            with open(self.compressed_path, 'w') as f:
-                for s in all_summaries:
-                    f.write(json.dumps(s) + '\n')
-            
-            # Rewrite decisions.jsonl with only recent entries
-            with open(self.decisions_path, 'w') as f:
-                for e in recent:
-                    f.write(json.dumps(e) + '\n')
-            
-            original_count = len(entries)
-            compressed_count = len(old)
-            kept_count = len(recent)
-            compression_ratio = (len(summaries) / compressed_count) if compressed_count > 0 else 1.0
+            result = self.store.compact_before(cutoff_str, self._compress_batch,
+                                               self.COMPRESSION_BATCH_SIZE, should_stop=self._stop.is_set)
+            compressed_count = result['compressed']
+            compression_ratio = (result['summaries_created'] / compressed_count) if compressed_count > 0 else 1.0
             
             return {
                 'compressed': compressed_count,
-                'summaries_created': len(summaries),
-                'total_summaries': len(all_summaries),
-                'kept': kept_count,
+                'summaries_created': result['summaries_created'],
+                'total_summaries': self.store.compressed_count(),
+                'kept': total - compressed_count,
                 'compression_ratio': round(compression_ratio, 3),
-                'original_size': original_count,
+                'original_size': total,
             }
         
         except Exception as e:
             return {'error': str(e)}
     
+    def start_background(self, on_done=None) -> threading.Thread:
+        """Run compress_old_decisions on a daemon thread; on_done(result) when finished."""
+        def run():
+            result = self.compress_old_decisions()
+            if on_done:
+                on_done(result)
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='decision-compaction', daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def join(self, timeout: float = None):
+        """Wait for a background compaction to finish."""
+        if self._thread:
+            self._thread.join(timeout)
+    
+    def stop(self, timeout: float = 5.0):
+        """Ask a running compaction to stop after its current batch and wait for it."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+    
     def get_compressed_stats(self) -> dict:
         """
         Get statistics from compressed summaries for TrajectoryLearner.
         """
-        if not self.compressed_path.exists():
-            return {}
-        
         try:
             stats = {
                 'total_compressed': 0,
@@ -1281,25 +1651,19 @@ class DecisionMemoryCompressor:
                 'pokemon': set(),
             }
             
-            with open(self.compressed_path) as f:
-                for line in f:
-                    try:
-                        s = json.loads(line.strip())
-                        if s.get('type') != 'compressed_batch':
-                            continue
-                        
-                        stats['total_compressed'] += s.get('count', 0)
-                        stats['total_visible'] += s.get('outcome', {}).get('total_visible', 0)
-                        stats['arc_closures'].extend(s.get('gameplay_context', {}).get('arc_closures', []))
-                        stats['tags'].update(s.get('narrative_tags', []))
-                        stats['pokemon'].update(s.get('pokemon_involved', []))
-                        
-                        # Aggregate event distribution
-                        for evt, cnt in s.get('decision_core', {}).get('event_distribution', {}).items():
-                            stats['event_distribution'][evt] = stats['event_distribution'].get(evt, 0) + cnt
-                    
-                    except Exception:
-                        pass
+            for s in self.store.compressed_summaries():
+                if s.get('type') != 'compressed_batch':
+                    continue
+                
+                stats['total_compressed'] += s.get('count', 0)
+                stats['total_visible'] += s.get('outcome', {}).get('total_visible', 0)
+                stats['arc_closures'].extend(s.get('gameplay_context', {}).get('arc_closures', []))
+                stats['tags'].update(s.get('narrative_tags', []))
+                stats['pokemon'].update(s.get('pokemon_involved', []))
+                
+                # Aggregate event distribution
+                for evt, cnt in s.get('decision_core', {}).get('event_distribution', {}).items():
+                    stats['event_distribution'][evt] = stats['event_distribution'].get(evt, 0) + cnt
             
             stats['tags'] = list(stats['tags'])
             stats['pokemon'] = list(stats['pokemon'])
@@ -1910,6 +2274,752 @@ class RewardValidator:
         return (True, None, gm_call)
 
 
+@dataclass(frozen=True)
+class BattleMeta:
+    """Battle facts extracted once from the battle buffer."""
+    is_trainer: bool = False
+    is_close: bool = False
+    is_rematch: bool = False
+    enemy: str = ''
+    outcome: str = ''
+
+    @classmethod
+    def from_buffer(cls, buffer: list) -> 'BattleMeta':
+        fields = {}
+        for event in buffer or []:
+            if event.get('event') == 'START':
+                fields['is_trainer'] = bool(event.get('is_trainer', False))
+                fields['is_rematch'] = bool(event.get('is_rematch', False))
+                fields['enemy'] = event.get('enemy', '') or ''
+            elif event.get('event') == 'END':
+                fields['is_close'] = bool(event.get('was_close', False))
+                fields['outcome'] = event.get('outcome', '') or ''
+        return cls(**fields)
+
+
+@dataclass(frozen=True)
+class EventContext:
+    """
+    Immutable per-event snapshot, computed once when an event arrives.
+
+    Uncertainty scoring, the skip log, concise-mode selection, proactive arc
+    matching and the high-stakes check all read from the same snapshot, so one
+    event costs one PLAYTHROUGH.md parse and one drift calculation, and every
+    stage sees the same answer (no side effects from re-scoring).
+    """
+    event_type: str
+    uncertainty: float
+    drift: MappingProxyType
+    arcs: tuple                         # Of read-only arc mappings (MappingProxyType)
+    party_summary: str
+    party_size: int
+    party_avg_hp: int
+    battle: BattleMeta
+    created_at: float
+    signals: frozenset = frozenset()    # Similarity-search features (see DecisionSimilarityIndex)
+
+
+class SkippedEventAggregator:
+    """
+    Streaming run-length summary of skipped (low-uncertainty) events.
+
+    Replaces the old "last 20 one-line summaries" list. Each skipped event is
+    folded into running counters — species tallies with level ranges, battle
+    outcomes, party HP trend, items/money/NPCs from exploration, and the time
+    span — so a grind session of any length renders as a constant-size block.
+    Memory is bounded: species keys are capped at MAX_SPECIES (the rest fold
+    into an overflow count) and everything else is scalar.
+    """
+
+    MAX_SPECIES = 32         # Distinct species tracked before folding into "other"
+    MAX_SPECIES_SHOWN = 6    # Species listed in the rendered block
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.first_time = None
+        self.last_time = None
+        self.by_type = {}
+        self.species = {}        # name -> [count, min_level, max_level]
+        self.species_other = 0
+        self.outcomes = {}
+        self.hp_first = None
+        self.hp_last = None
+        self.hp_min = None
+        self.hp_total = 0
+        self.hp_samples = 0
+        self.close_calls = 0
+        self.items_gained = 0
+        self.money_change = 0
+        self.npc_count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def to_dict(self) -> dict:
+        """Plain copy of the running counters (for the runtime checkpoint)."""
+        data = dict(vars(self))
+        data['by_type'] = dict(self.by_type)
+        data['species'] = {name: list(v) for name, v in list(self.species.items())}
+        data['outcomes'] = dict(self.outcomes)
+        return data
+
+    def restore(self, data: dict):
+        """Inverse of to_dict; unknown keys are ignored, missing ones keep defaults."""
+        self.clear()
+        for key, value in data.items():
+            if key in vars(self):
+                setattr(self, key, value)
+
+    def add(self, event_type: str, context: dict, ectx: 'EventContext' = None):
+        """Fold one skipped event into the running summary."""
+        now = time.time()
+        if self.first_time is None:
+            self.first_time = now
+        self.last_time = now
+        self.count += 1
+        self.by_type[event_type] = self.by_type.get(event_type, 0) + 1
+
+        if event_type == 'BATTLE_SUMMARY':
+            battle = ectx.battle if ectx else BattleMeta.from_buffer(context.get('buffer', []))
+            self._add_species(battle.enemy)
+            if battle.outcome:
+                self.outcomes[battle.outcome] = self.outcomes.get(battle.outcome, 0) + 1
+            if battle.is_close:
+                self.close_calls += 1
+            for event in context.get('buffer', []):
+                if event.get('event') == 'END' and 'hp_after' in event:
+                    self._add_hp(event['hp_after'])
+        elif event_type == 'EXPLORATION_SUMMARY':
+            state = context.get('state', {}) or {}
+            self.items_gained += state.get('itemsGained', 0) or 0
+            self.money_change += state.get('moneyChange', 0) or 0
+            self.npc_count += state.get('dialogueCount', 0) or 0
+
+    def _add_species(self, enemy: str):
+        if not enemy:
+            return
+        # Battle buffer stores "Name L<level>"
+        name, _, level = enemy.rpartition(' L')
+        if not name:
+            name, level = enemy, ''
+        level = int(level) if level.isdigit() else None
+        entry = self.species.get(name)
+        if entry is None:
+            if len(self.species) >= self.MAX_SPECIES:
+                self.species_other += 1
+                return
+            self.species[name] = [1, level, level]
+            return
+        entry[0] += 1
+        if level is not None:
+            entry[1] = level if entry[1] is None else min(entry[1], level)
+            entry[2] = level if entry[2] is None else max(entry[2], level)
+
+    def _add_hp(self, hp: int):
+        if self.hp_first is None:
+            self.hp_first = hp
+        self.hp_last = hp
+        self.hp_min = hp if self.hp_min is None else min(self.hp_min, hp)
+        self.hp_total += hp
+        self.hp_samples += 1
+
+    def render(self) -> str:
+        """Render the constant-size SINCE LAST UPDATE block."""
+        if not self.count:
+            return ''
+        span_min = int((self.last_time - self.first_time) / 60)
+        block = f"\n=== SINCE LAST UPDATE ({self.count} routine events over {span_min} min) ===\n"
+
+        battles = self.by_type.get('BATTLE_SUMMARY', 0)
+        if battles:
+            ranked = sorted(self.species.items(), key=lambda kv: -kv[1][0])
+            shown = []
+            for name, (n, lo, hi) in ranked[:self.MAX_SPECIES_SHOWN]:
+                levels = ''
+                if lo is not None:
+                    levels = f" (L{lo})" if lo == hi else f" (L{lo}-{hi})"
+                shown.append(f"{name} x{n}{levels}")
+            rest = sum(v[0] for _, v in ranked[self.MAX_SPECIES_SHOWN:]) + self.species_other
+            if rest:
+                shown.append(f"{rest} others")
+            block += f"• {battles} wild battles: {', '.join(shown) or 'unknown'}\n"
+            if self.outcomes:
+                block += "• Outcomes: " + ", ".join(
+                    f"{n} {o}" for o, n in sorted(self.outcomes.items(), key=lambda kv: -kv[1])
+                ) + "\n"
+            if self.hp_samples:
+                block += (f"• Party HP after battles: {self.hp_first}% → {self.hp_last}% "
+                          f"(low {self.hp_min}%, avg {self.hp_total // self.hp_samples}%)")
+                if self.close_calls:
+                    block += f", {self.close_calls} close call{'s' if self.close_calls != 1 else ''}"
+                block += "\n"
+
+        explorations = self.by_type.get('EXPLORATION_SUMMARY', 0)
+        if explorations:
+            parts = []
+            if self.items_gained:
+                parts.append(f"+{self.items_gained} items")
+            if self.money_change:
+                parts.append(f"${'+' if self.money_change > 0 else ''}{self.money_change}")
+            if self.npc_count:
+                parts.append(f"{self.npc_count} NPCs")
+            block += f"• {explorations} exploration stretches" + (f": {', '.join(parts)}" if parts else '') + "\n"
+
+        others = {t: n for t, n in self.by_type.items()
+                  if t not in ('BATTLE_SUMMARY', 'EXPLORATION_SUMMARY')}
+        if others:
+            block += "• Other: " + ", ".join(f"{t} x{n}" for t, n in others.items()) + "\n"
+        return block
+
+
+class StateDump:
+    """
+    Change-detecting state dump: state/current.txt for the agent, plus current.json.
+
+    Meaningful events used to rebuild and rewrite current.txt every time. Now
+    update() hashes the fields the agent cares about (party, bag, money,
+    badges, map, battle) and does nothing else when the hash is unchanged.
+    Play time and tile position are volatile: they are refreshed whenever the
+    files are written but never trigger a write by themselves.
+
+    On a change, the event is reduced once to a structured snapshot (names
+    resolved, bag capped at BAG_LIMIT), written as current.json and rendered
+    to current.txt. render() produces fresh text on demand. With fifo
+    enabled (POSIX), state/current.fifo serves a fresh render to whichever
+    process opens it for reading.
+    """
+
+    BAG_LIMIT = 20
+    STAT_KEYS = (('hp', 'HP'), ('attack', 'ATK'), ('defense', 'DEF'), ('speed', 'SPD'),
+                 ('sp_attack', 'SPA'), ('sp_defense', 'SPD'))
+
+    def __init__(self, state_dir: Path, species_names: dict, fifo: bool = False):
+        self.text_path = state_dir / 'current.txt'
+        self.json_path = state_dir / 'current.json'
+        self.fifo_path = state_dir / 'current.fifo'
+        self.species_names = species_names
+        self._hash = None
+        self._latest = None     # Raw data of the last update (for on-demand renders)
+        self.stats = {'updates': 0, 'writes': 0, 'fifo_reads': 0}
+        if fifo:
+            self._start_fifo()
+
+    @classmethod
+    def _stable_fields(cls, data: dict) -> tuple:
+        return (
+            data.get('player_name'), data.get('money', 0), data.get('badge_count', 0),
+            data.get('map_group', 0), data.get('map_num', 0),
+            data.get('party') or [], (data.get('bag_items') or [])[:cls.BAG_LIMIT],
+            bool(data.get('in_battle', False)), data.get('enemy_pokemon'),
+        )
+
+    def update(self, data: dict) -> bool:
+        """Record the latest game state; rewrite the files only if relevant fields changed."""
+        self.stats['updates'] += 1
+        self._latest = data
+        encoded = json.dumps(self._stable_fields(data), sort_keys=True, default=str).encode()
+        digest = hashlib.blake2b(encoded, digest_size=16).digest()
+        if digest == self._hash:
+            return False
+        self._hash = digest
+        snap = self.snapshot(data)
+        self._write(self.json_path, json.dumps(snap, indent=1))
+        self._write(self.text_path, self.render(snap))
+        self.stats['writes'] += 1
+        return True
+
+    @staticmethod
+    def _write(path: Path, text: str):
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def snapshot(self, data: dict) -> dict:
+        """Structured, name-resolved view of a game state event."""
+        play_time = data.get('play_time', {})
+        party = []
+        for p in data.get('party') or []:
+            species_id = p.get('species', 0)
+            species_name = self.species_names.get(species_id, f"Species#{species_id}")
+            status_val = p.get('status', 0)
+            pp = p.get('pp', [0, 0, 0, 0])
+            moves = p.get('moves', [0, 0, 0, 0])
+            nature_id = p.get('nature', 0)
+            held = p.get('held_item', 0)
+            party.append({
+                'slot': p.get('slot', 0),
+                'nickname': p.get('nickname', species_name),
+                'species': species_name,
+                'level': p.get('level', 1),
+                'hp': p.get('current_hp', 0),
+                'max_hp': p.get('max_hp', 1),
+                'status': next((tag for bits, tag in STATUS_TAGS if status_val & bits), None),
+                'moves': [{'id': move_id, 'name': MOVE_NAMES.get(move_id, f"Move#{move_id}"),
+                           'pp': pp[i] if i < len(pp) else None}
+                          for i, move_id in enumerate(moves) if move_id > 0],
+                'move_ids': moves,
+                'stats': {k: p.get(k, 0) for k, _ in self.STAT_KEYS[1:]},
+                'evs': p.get('evs') or {},
+                'ivs': p.get('ivs') or {},
+                'nature': NATURE_NAMES[nature_id] if nature_id < len(NATURE_NAMES) else f"Nature#{nature_id}",
+                'held_item': f"Item#{held}" if held > 0 else None,
+                'experience': p.get('experience', 0),
+            })
+        enemy = data.get('enemy_pokemon') if data.get('in_battle', False) else None
+        if enemy:
+            enemy = {
+                'species': self.species_names.get(enemy.get('species', 0), f"Species#{enemy.get('species', 0)}"),
+                'level': enemy.get('level', '?'), 'hp': enemy.get('hp', '?'), 'max_hp': enemy.get('maxHp', '?'),
+                'stats': {k: enemy.get(k, '?') for k in ('attack', 'defense', 'speed')},
+            }
+        return {
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'player': {
+                'name': data.get('player_name', 'Unknown'),
+                'play_time': [play_time.get('hours', 0), play_time.get('minutes', 0)],
+                'money': data.get('money', 0),
+                'badges': data.get('badge_count', 0),
+                'map': [data.get('map_group', 0), data.get('map_num', 0)],
+                'position': [data.get('player_x', 0), data.get('player_y', 0)],
+            },
+            'party': party,
+            'bag': [{'id': item.get('id', 0), 'qty': item.get('qty', 0)}
+                    for item in (data.get('bag_items') or [])[:self.BAG_LIMIT]],
+            'in_battle': bool(data.get('in_battle', False)),
+            'enemy': enemy,
+        }
+
+    def render(self, snap: dict = None) -> str:
+        """current.txt text for a snapshot (default: fresh from the latest update)."""
+        if snap is None:
+            snap = self.snapshot(self._latest or {})
+        player = snap['player']
+        lines = [
+            f"# CURRENT STATE — {snap['updated_at']}",
+            "# Auto-updated when the game state changes. Read this before taking actions.",
+            "",
+            "## PLAYER",
+            f"Name: {player['name']}",
+            f"Play Time: {player['play_time'][0]}h {player['play_time'][1]}m",
+            f"Money: ${player['money']:,}",
+            f"Badges: {player['badges']}",
+            f"Location: Map {player['map'][0]}-{player['map'][1]} @ ({player['position'][0]}, {player['position'][1]})",
+            "",
+            "## PARTY",
+        ]
+        for p in snap['party']:
+            status = f" [{p['status']}]" if p['status'] else ""
+            lines.append(f"[{p['slot']}] {p['nickname']} ({p['species']}) L{p['level']} | HP {p['hp']}/{p['max_hp']}{status}")
+            moves = ', '.join(f"{m['name']}({'?' if m['pp'] is None else m['pp']})" for m in p['moves'])
+            lines.append(f"    Moves: [{moves}]")
+            lines.append(f"    Move IDs: {p['move_ids']}")
+            stats = p['stats']
+            lines.append(f"    Stats: " + ' | '.join(f"{label} {stats[k]}" for k, label in self.STAT_KEYS[1:]))
+            for label, values in (('EVs', p['evs']), ('IVs', p['ivs'])):
+                if values:
+                    lines.append(f"    {label}: " + ' | '.join(f"{short} {values.get(k, 0)}" for k, short in self.STAT_KEYS))
+            lines.append(f"    Nature: {p['nature']} | Held: {p['held_item'] or 'None'}")
+            lines.append(f"    EXP: {p['experience']:,}")
+            lines.append("")
+
+        lines.append(f"## BAG (first {self.BAG_LIMIT} items)")
+        lines.extend(f"  Item#{item['id']} x{item['qty']}" for item in snap['bag'])
+        if not snap['bag']:
+            lines.append("  (empty or not readable)")
+        lines.append("")
+
+        lines.append("## BATTLE STATE")
+        if snap['in_battle']:
+            lines.append("In Battle: YES")
+            enemy = snap['enemy']
+            if enemy:
+                lines.append(f"Enemy: {enemy['species']} L{enemy['level']} | HP {enemy['hp']}/{enemy['max_hp']}")
+                es = enemy['stats']
+                lines.append(f"Enemy Stats: ATK {es['attack']} | DEF {es['defense']} | SPD {es['speed']}")
+        else:
+            lines.append("In Battle: NO")
+        return '\n'.join(lines)
+
+    # ── On-demand reads ─────────────────────────────────────────────────
+
+    def _start_fifo(self):
+        if not hasattr(os, 'mkfifo'):
+            return
+        try:
+            if self.fifo_path.exists():
+                self.fifo_path.unlink()
+            os.mkfifo(self.fifo_path)
+        except OSError:
+            return
+        threading.Thread(target=self._serve_fifo, daemon=True).start()
+
+    def _serve_fifo(self):
+        """Each open of current.fifo gets one fresh render (open blocks until a reader)."""
+        while True:
+            try:
+                with open(self.fifo_path, 'w') as f:
+                    f.write(self.render())
+                self.stats['fifo_reads'] += 1
+            except BrokenPipeError:
+                pass    # Reader closed early
+            except OSError:
+                return
+            time.sleep(0.05)  # Let the reader see EOF before reopening
+
+
+class BattleDigest:
+    """
+    Turn-by-turn battle digest built from the Lua text and damage streams.
+
+    The raw battle_dialogue stream contains duplicated and partial strings
+    (the text buffer is sampled mid-render), and battle_log carries numbers
+    without context. The digest dedups the text, parses Gen 3 message
+    templates ("X used Y!", "A critical hit!", "X fainted!", "Go! X!") into
+    action rows, and attaches damage from battle_log in order: player moves
+    take 'attack' entries, foe moves take 'damage_taken' entries.
+
+    Output size is bounded: at most MAX_ROWS action rows (head and tail kept,
+    middle elided), MAX_EVENTS faint/switch/level events, and MAX_UNPARSED
+    leftover lines such as trainer dialogue.
+    """
+
+    MAX_ROWS = 12
+    MAX_EVENTS = 8
+    MAX_UNPARSED = 3
+    _KNOWN_MOVES = None
+
+    USED_RE = re.compile(r"^(?:(Wild|Foe) )?(.+?) used (.+?)!")
+    FAINT_RE = re.compile(r"^(?:(Wild|Foe) )?(.+?) fainted!")
+    GO_RE = re.compile(r"^(?:Go!|Do it!|Go for it,|Your foe's weak! Get 'm,) (.+?)!")
+    SENT_RE = re.compile(r"sent out (.+?)!")
+    RECALL_RE = re.compile(r"^(.+?), (?:come back|that's enough|OK!)")
+    LEVEL_RE = re.compile(r"^(.+?) grew to LV\. ?(\d+)")
+    FLAGS = (
+        ('critical hit', 'crit'),
+        ("super effective", 'super effective'),
+        ('not very effective', 'resisted'),
+        ("doesn't affect", 'no effect'),
+        ('missed', 'missed'),
+    )
+    NOISE = ('What will', 'appeared!', 'Got away safely', 'EXP. Points')
+
+    def __init__(self, battle_dialogue: list, battle_log: list):
+        self.rows = []          # dicts: side, actor, move, damage, hp, flags
+        self.events = []        # short strings: faints, switches, level ups
+        self.unparsed = []
+        self._parse(self._dedup(battle_dialogue or []), battle_log or [])
+
+    @staticmethod
+    def _dedup(texts: list) -> list:
+        """
+        Collapse adjacent repeats and partial renders that the next line completes.
+        Non-adjacent repeats are real (the same move used on two turns) and kept.
+        """
+        cleaned = []
+        for text in texts:
+            text = ' '.join(str(text).split())
+            if not text:
+                continue
+            if cleaned and text.startswith(cleaned[-1]):
+                cleaned[-1] = text       # previous line was a partial (or exact repeat) of this one
+            elif cleaned and cleaned[-1].startswith(text):
+                continue                 # partial of the line we already have
+            else:
+                cleaned.append(text)
+        return cleaned
+
+    @staticmethod
+    def _name(raw: str) -> str:
+        return raw.strip().title()
+
+    def _parse(self, texts: list, battle_log: list):
+        attacks = [e for e in battle_log if e.get('type') == 'attack']
+        hits = [e for e in battle_log if e.get('type') == 'damage_taken']
+
+        for text in texts:
+            m = self.USED_RE.match(text)
+            if m:
+                side = 'foe' if m.group(1) else 'you'
+                row = {'side': side, 'actor': self._name(m.group(2)),
+                       'move': self._name(m.group(3)), 'damage': None, 'hp': None, 'flags': []}
+                if side == 'you':
+                    idx = self._match_attack(attacks, row['move'])
+                    if idx is not None:
+                        self._apply_damage(row, attacks.pop(idx))
+                elif hits:
+                    self._apply_damage(row, hits.pop(0))
+                self.rows.append(row)
+                continue
+            flag = next((f for needle, f in self.FLAGS if needle in text), None)
+            if flag:
+                if self.rows and flag not in self.rows[-1]['flags']:
+                    self.rows[-1]['flags'].append(flag)
+                continue
+            m = self.FAINT_RE.match(text)
+            if m:
+                self.events.append(f"{'Foe ' if m.group(1) else ''}{self._name(m.group(2))} fainted")
+                continue
+            m = self.GO_RE.match(text) or self.SENT_RE.search(text)
+            if m:
+                prefix = 'Foe sent out' if self.SENT_RE.search(text) else 'Sent out'
+                self.events.append(f"{prefix} {self._name(m.group(1))}")
+                continue
+            m = self.RECALL_RE.match(text)
+            if m:
+                self.events.append(f"Recalled {self._name(m.group(1))}")
+                continue
+            m = self.LEVEL_RE.match(text)
+            if m:
+                self.events.append(f"{self._name(m.group(1))} grew to L{m.group(2)}")
+                continue
+            if any(n in text for n in self.NOISE) or text in self.unparsed:
+                continue
+            self.unparsed.append(text)
+
+        # Damage the text stream never explained (text missed or not captured)
+        for entry in attacks:
+            move_id = entry.get('moveId', 0)
+            row = {'side': 'you', 'actor': '', 'move': MOVE_NAMES.get(move_id, f"Move#{move_id}"),
+                   'damage': None, 'hp': None, 'flags': []}
+            self._apply_damage(row, entry)
+            self.rows.append(row)
+        for entry in hits:
+            row = {'side': 'foe', 'actor': '', 'move': '?', 'damage': None, 'hp': None, 'flags': []}
+            self._apply_damage(row, entry)
+            self.rows.append(row)
+
+    @staticmethod
+    def _match_attack(attacks: list, move: str):
+        """Index of the first 'attack' entry for this move (status moves have none)."""
+        names = [MOVE_NAMES.get(entry.get('moveId', 0)) for entry in attacks]
+        for i, name in enumerate(names):
+            if name is not None and name.lower() == move.lower():
+                return i
+        # A known move with no matching hit did no damage (status move, miss)
+        if move.lower() in BattleDigest._known_moves():
+            return None
+        # Moves missing from MOVE_NAMES can't be checked; take the oldest unnamed hit
+        return next((i for i, name in enumerate(names) if name is None), None)
+
+    @staticmethod
+    def _known_moves() -> set:
+        if BattleDigest._KNOWN_MOVES is None:
+            BattleDigest._KNOWN_MOVES = {name.lower() for name in MOVE_NAMES.values()}
+        return BattleDigest._KNOWN_MOVES
+
+    @staticmethod
+    def _apply_damage(row: dict, entry: dict):
+        row['damage'] = entry.get('damage', 0)
+        if entry.get('type') == 'attack':
+            move_id = entry.get('moveId', 0)
+            if move_id in MOVE_NAMES:
+                row['move'] = MOVE_NAMES[move_id]
+            row['hp'] = f"foe {entry.get('enemyHP', '?')}/{entry.get('enemyMaxHP', '?')}"
+        else:
+            row['hp'] = f"you {entry.get('hp', '?')}"
+
+    def _format_row(self, i: int, row: dict) -> str:
+        who = row['actor'] or ('You' if row['side'] == 'you' else 'Foe')
+        if row['side'] == 'foe' and row['actor']:
+            who = f"Foe {who}"
+        line = f"{i:>2}. {who}: {row['move']}"
+        if row['damage'] is not None:
+            line += f" -{row['damage']}HP ({row['hp']})"
+        if row['flags']:
+            line += f" [{', '.join(row['flags'])}]"
+        return line
+
+    def render(self) -> str:
+        """Render the digest block, or '' if there was nothing to digest."""
+        if not (self.rows or self.events or self.unparsed):
+            return ''
+        block = f"\n=== BATTLE DIGEST ({len(self.rows)} actions) ===\n"
+        numbered = list(enumerate(self.rows, 1))
+        if len(numbered) > self.MAX_ROWS:
+            head = self.MAX_ROWS // 3
+            tail = self.MAX_ROWS - head
+            omitted = len(numbered) - self.MAX_ROWS
+            shown = numbered[:head] + [None] + numbered[-tail:]
+        else:
+            omitted, shown = 0, numbered
+        for item in shown:
+            if item is None:
+                block += f"    … {omitted} actions omitted …\n"
+            else:
+                block += self._format_row(*item) + "\n"
+        if self.events:
+            events = self.events[-self.MAX_EVENTS:]
+            block += f"Events: {'; '.join(events)}\n"
+        for text in self.unparsed[-self.MAX_UNPARSED:]:
+            block += f"Text: \"{text[:80]}\"\n"
+        return block
+
+
+class PromptDeltaTracker:
+    """
+    Tracks which prompt sections a session-persistent backend has already seen.
+
+    clawdbot keeps a session per --session-id and direct mode replays
+    conversation_history, so re-sending an unchanged profile, strategy list or
+    arc ledger on every event only burns input tokens. Each section is keyed by
+    name and fingerprinted; a section is sent again only if its text changed or
+    it was last sent max_age turns ago (older turns may have left the backend's
+    window). Omitted sections are listed in a one-line UNCHANGED marker.
+
+    Sections are recorded as "seen" only after the backend answers (commit);
+    a failed call discards them so the next prompt re-sends. reset() forces a
+    full refresh (session reset, history compression).
+    """
+
+    def __init__(self, max_age: int = 20):
+        self.max_age = max_age
+        self.turn = 0
+        self.sent = {}          # name -> (fingerprint, turn)
+        self._pending = {}
+        self._unchanged = []
+
+    def begin(self):
+        self._pending = {}
+        self._unchanged = []
+
+    def section(self, name: str, text: str) -> str:
+        """Return text if the backend needs it, '' if it already has it."""
+        if not text:
+            return text
+        fingerprint = hash(text)
+        seen = self.sent.get(name)
+        if seen and seen[0] == fingerprint and self.turn - seen[1] < self.max_age:
+            self._unchanged.append(name)
+            return ''
+        self._pending[name] = (fingerprint, self.turn)
+        return text
+
+    def omitted(self) -> list:
+        """Sections the prompt being built left out as already seen."""
+        return list(self._unchanged)
+
+    def marker(self) -> str:
+        if not self._unchanged:
+            return ''
+        return (f"\n=== UNCHANGED (still in effect from earlier in this session): "
+                f"{', '.join(self._unchanged)} ===\n")
+
+    def commit(self):
+        self.sent.update(self._pending)
+        self.turn += 1
+        self.begin()
+
+    def discard(self):
+        self.begin()
+
+    def reset(self):
+        self.sent = {}
+        self.begin()
+
+
+class ConversationHistoryManager:
+    """
+    Token-accounted conversation history for direct (Anthropic API) mode.
+
+    Replaces "keep the last 40 messages": turns are kept verbatim while their
+    estimated size fits budget_tokens. Once the history goes over budget, the
+    oldest turns are folded into a running summary until usage drops to
+    low_water * budget. The hysteresis means compaction happens every few
+    turns, not on every call. The summary is carried in the system prompt,
+    so messages still alternate user/assistant.
+
+    Token counts are estimates (CHARS_PER_TOKEN), good enough for budgeting.
+    The summarize callable turns a list of {event_type, prompt, response}
+    entries into one summary line.
+    """
+
+    CHARS_PER_TOKEN = 4
+    MESSAGE_OVERHEAD = 4     # Role/framing tokens per message
+    MAX_SUMMARY_LINES = 8
+
+    def __init__(self, budget_tokens: int = 24000, low_water: float = 0.6, summarize=None):
+        self.budget_tokens = budget_tokens
+        self.low_water = low_water
+        self.summarize = summarize
+        self.turns = []             # [(prompt, response, tokens)]
+        self.verbatim_tokens = 0
+        self.summary_lines = []
+        self.folded_turns = 0
+        self.folded_tokens = 0      # Raw size of everything folded so far
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        return len(text) // cls.CHARS_PER_TOKEN + cls.MESSAGE_OVERHEAD
+
+    def messages(self, prompt: str) -> list:
+        """Message list for the next call: verbatim turns plus the new prompt."""
+        messages = []
+        for user, assistant, _ in self.turns:
+            messages.append({"role": "user", "content": user})
+            messages.append({"role": "assistant", "content": assistant})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def summary_block(self) -> str:
+        if not self.summary_lines:
+            return ''
+        return ("\n\n=== EARLIER IN THIS SESSION (compacted) ===\n"
+                + "\n".join(self.summary_lines) + "\n")
+
+    def make_room(self, prompt: str) -> int:
+        """Fold turns until the next prompt fits the hard budget. Returns turns folded."""
+        needed = self.estimate_tokens(prompt)
+        if self.verbatim_tokens + needed <= self.budget_tokens:
+            return 0
+        return self._fold_until(self.budget_tokens - needed)
+
+    def record(self, prompt: str, response: str) -> int:
+        """Store a completed turn; compact if over budget. Returns turns folded."""
+        tokens = self.estimate_tokens(prompt) + self.estimate_tokens(response)
+        self.turns.append((prompt, response, tokens))
+        self.verbatim_tokens += tokens
+        if self.verbatim_tokens <= self.budget_tokens:
+            return 0
+        return self._fold_until(int(self.budget_tokens * self.low_water))
+
+    def _fold_until(self, target_tokens: int) -> int:
+        folded = []
+        while self.turns and self.verbatim_tokens > target_tokens:
+            user, assistant, tokens = self.turns.pop(0)
+            self.verbatim_tokens -= tokens
+            self.folded_tokens += tokens
+            folded.append({
+                'event_type': user.split('\n', 1)[0].replace('EVENT:', '').strip() or 'unknown',
+                'prompt': user,
+                'response': assistant,
+            })
+        if not folded:
+            return 0
+        self.folded_turns += len(folded)
+        line = self.summarize(folded) if self.summarize else f"{len(folded)} earlier turns"
+        self.summary_lines.append(line)
+        self.summary_lines = self.summary_lines[-self.MAX_SUMMARY_LINES:]
+        return len(folded)
+
+    def stats(self, prompt: str) -> dict:
+        """Token accounting for a call about to be made with this prompt."""
+        summary_tokens = self.estimate_tokens(self.summary_block()) if self.summary_lines else 0
+        sent = self.verbatim_tokens + summary_tokens + self.estimate_tokens(prompt)
+        return {
+            'sent': sent,
+            'verbatim_turns': len(self.turns),
+            'folded_turns': self.folded_turns,
+            'saved': max(0, self.folded_tokens - summary_tokens),
+        }
+
+
 class PokemonGM:
     def __init__(self, config: dict, base_path: Path):
         self.config = config
@@ -1931,12 +3041,13 @@ class PokemonGM:
         self.agent_memory_dir = agent_workspace / 'memory'  # where PLAYTHROUGH.md lives
         self.state_dir = agent_workspace / 'state'
         self.memory_dir = base_path / paths.get('memory_dir', './memory')
-        self.events_file = self.state_dir / 'events.jsonl'
         self.response_file = self.state_dir / 'gm_response.txt'
         
         # Species names
         species_file = base_path / paths.get('species_file', './data/emerald_species.json')
         self.species_names = load_species_names(species_file)
+        # One compiled species/move/tag matcher shared by skills, compression and summaries
+        self.text_extractor = EntityTagExtractor(self.species_names, MOVE_NAMES)
         
         # Agent settings
         self.agent_id = agent_config.get('id', 'pokemon-gm')
@@ -1956,7 +3067,12 @@ class PokemonGM:
                 sys.exit(1)
             self.anthropic_client = anthropic.Anthropic(api_key=self.api_key)
             self.system_prompt = self._load_system_prompt(agent_workspace)
-            self.conversation_history = []  # For multi-turn context
+            # Multi-turn context, kept verbatim up to a token budget then compacted
+            self.history_summary_mode = agent_config.get('history_summary', 'heuristic')
+            self.conversation_history = ConversationHistoryManager(
+                budget_tokens=agent_config.get('history_token_budget', 24000),
+                summarize=self._summarize_direct_turns,
+            )
         elif self.agent_mode in ('claude', 'codex'):
             self.system_prompt = self._load_system_prompt(agent_workspace)
         
@@ -1982,18 +3098,29 @@ class PokemonGM:
         session_config = config.get('session', {})
         self.session_persistent = session_config.get('persistent', False)
         self.session_file = base_path / session_config.get('session_file', './state/session_id.txt')
-        self.session_history_file = self.state_dir / 'session.json'
+        # Append-only journal + periodic snapshot (session.json); prompts are
+        # only kept (in a content-addressed blob store) if keep_prompts is set
+        self.session_journal = SessionJournal(
+            self.state_dir, keep_prompts=session_config.get('keep_prompts', False))
         self.session_history = []
         self.compressed_summaries = []  # Issue #14: KLong-inspired compressed history
         self.COMPRESSION_THRESHOLD = 20  # Compress when history reaches this size
         self.last_badge_count = 0  # Track badge milestones for compression triggers
         
+        # Prompt-delta mode: clawdbot sessions and direct-mode conversation_history
+        # already hold earlier prompts, so only changed sections are re-sent.
+        self.prompt_delta = None
+        # Direct mode also refreshes whenever conversation history is compacted.
+        if self.agent_mode in ('clawdbot', 'direct') and session_config.get('prompt_delta', True):
+            self.prompt_delta = PromptDeltaTracker(max_age=session_config.get('delta_refresh_every', 20))
+        
         # Runtime state
+        self._shut_down = False
         self.sock = None
         self.connected = False
         self.agent_busy = False
         self.pending_events = []
-        self.skipped_events = []  # Accumulate low-uncertainty events for context
+        self.skipped_events = SkippedEventAggregator()  # Run-length summary of low-uncertainty events
         self.current_state = {}  # Latest game state for helpers
         self.move_usage = {}  # {moveId: count} for mastery tracking
         
@@ -2009,11 +3136,12 @@ class PokemonGM:
         self.session_visible_rewards = 0  # Visible rewards this session
 
         # GRIND_SUMMARY tracking (AgentConductor-inspired — issue #15)
-        # When N events are skipped OR 10 minutes pass without an agent invoke,
+        # When N events are skipped OR the timeout passes without an agent invoke,
         # synthesize a lightweight GRIND_SUMMARY to keep Maren's narrative continuity.
+        # The SINCE LAST UPDATE block is constant-size, so the batch can be large.
         self.last_agent_invoke_time = time.time()
-        self.GRIND_BATCH_SIZE = 8       # Trigger after this many skipped events
-        self.GRIND_TIMEOUT_SEC = 600    # Trigger after 10 min of silence
+        self.GRIND_BATCH_SIZE = session_config.get('grind_batch_size', 40)   # Skipped events
+        self.GRIND_TIMEOUT_SEC = session_config.get('grind_timeout_min', 10) * 60  # Silence
 
         # Issue #25 — Drought Breaker (Evaluating Stochasticity paper, arxiv 2602.23271)
         # Adds structure/constraints to reduce agent variance when drought is high.
@@ -2027,6 +3155,7 @@ class PokemonGM:
         # Counter this with event-driven system reminders that restate core purpose.
         # Triggered when: high drought AND consecutive "none" responses AND no recent reminder.
         self.events_since_system_reminder = 0
+        self._prompt_consumes = {}          # Deferred build_prompt side effects (see _consume_prompt_state)
         self.SYSTEM_REMINDER_INTERVAL = 10  # Min events between system reminders
         self.consecutive_none_count = 0     # Track consecutive "none" responses
 
@@ -2045,6 +3174,9 @@ class PokemonGM:
         self.DRIFT_CRITICAL = 0.90        # Escalate at >90% none rate
         self.drift_history = []           # Recent decisions: 'visible', 'ev', 'none'
         
+        # Last seen party size for exploration scoring (advanced in _build_event_context)
+        self._last_party_size = None
+        
         # Battle tracking
         self.battle_history = []
         self.battle_buffer = []
@@ -2061,43 +3193,75 @@ class PokemonGM:
         self.state_dir.mkdir(parents=True, exist_ok=True)
         self.memory_dir.mkdir(parents=True, exist_ok=True)
 
+        # Recorded mGBA events for offline replay: buffered, gzip segments + index
+        events_config = config.get('events', {})
+        self.event_journal = EventJournal(
+            self.state_dir / 'events',
+            segment_bytes=int(events_config.get('segment_mb', 16) * 1024 * 1024),
+            max_segments=events_config.get('max_segments', EventJournal.MAX_SEGMENTS),
+        )
+
+        # state/current.txt + current.json, rewritten only when the game state changes
+        self.state_dump = StateDump(self.state_dir, self.species_names,
+                                    fifo=config.get('state_dump', {}).get('fifo', False))
+
+        # Runtime checkpoint: drought/drift/reward/battle history, trainer encounters,
+        # the skipped-event summary and stats survive restarts (write-behind, versioned)
+        self.runtime_checkpoint = RuntimeCheckpoint(self.state_dir)
+        self._checkpoint_lock = threading.Lock()
+        self._last_runtime_state = None
+        if session_config.get('warm_restart', True):
+            self._restore_runtime_state()
+
         # Issue #19 — Player Attribute Profiling (EXACT-inspired)
         self.player_profile = PlayerProfileTracker(
             profile_path=self.state_dir / 'player_profile.json',
             species_names=self.species_names,
         )
 
+        # Shared decision storage (SQLite, WAL). Migrates decisions.jsonl on first run.
+        self.decision_store = DecisionStore.for_state_dir(self.state_dir)
+        if self.decision_store.import_report:
+            report = self.decision_store.import_report
+            C = Colors
+            self.log(
+                f"{C.CYAN}🗄 DECISIONS MIGRATED{C.RESET}  {report['imported']} from decisions.jsonl"
+                + (f" ({report['malformed']} malformed lines skipped: {report['malformed_lines']})"
+                   if report['malformed'] else '')
+            )
+        if self.decision_store.compressed_import_report:
+            report = self.decision_store.compressed_import_report
+            self.log(
+                f"🗄 {report['imported']} compressed batches migrated from decisions_compressed.jsonl"
+                + (f" ({report['malformed']} malformed lines skipped: {report['malformed_lines']})"
+                   if report['malformed'] else '')
+            )
+
         # Issue #20 — Decision Logger (MAS-on-the-Fly phase 1: data collection)
-        self.decision_logger = DecisionLogger(
-            log_path=self.state_dir / 'decisions.jsonl',
-        )
+        self.decision_logger = DecisionLogger(self.decision_store)
 
         # Issue #37 — Trajectory Learning (IBM arxiv 2603.10600-inspired)
         # Extracts strategic insights from past decisions for prompt injection
         self.trajectory_learner = TrajectoryLearner(
-            decisions_path=self.state_dir / 'decisions.jsonl',
+            self.decision_store,
+            snapshot_path=self.state_dir / 'trajectory_snapshot.json',
         )
+        self.decision_logger.subscribers.append(self.trajectory_learner.observe)
 
         # Issue #38 — Skill Extraction (XSkill-inspired, arxiv 2603.12056)
         # Extracts reusable procedural "skills" from successful decision patterns
         self.skill_extractor = SkillExtractor(
-            decisions_path=self.state_dir / 'decisions.jsonl',
+            self.decision_store,
+            self.text_extractor,
+            snapshot_path=self.state_dir / 'skills_snapshot.json',
         )
+        self.decision_logger.subscribers.append(self.skill_extractor.observe)
 
         # Issue #41 — Decision Memory Compression (Structured Distillation-inspired, arxiv 2603.13017)
         # Compresses old decisions using 4-field schema: 11x compression, 96% retrieval quality
-        self.decision_compressor = DecisionMemoryCompressor(
-            decisions_path=self.state_dir / 'decisions.jsonl',
-        )
-        # Run compression on startup if decisions.jsonl exists
-        compression_result = self.decision_compressor.compress_old_decisions()
-        if compression_result.get('compressed', 0) > 0:
-            C = Colors
-            self.log(
-                f"{C.CYAN}📦 DECISION COMPRESS{C.RESET}  "
-                f"{compression_result['compressed']} old → {compression_result['summaries_created']} summaries "
-                f"(kept {compression_result['kept']} recent)"
-            )
+        self.decision_compressor = DecisionMemoryCompressor(self.decision_store, self.text_extractor)
+        # Run compression on startup, in the background so startup isn't blocked
+        self.decision_compressor.start_background(on_done=self._on_decisions_compressed)
 
         # Issue #40 — Auto-Arc Generation (Story Hook Detection)
         # When ARC LEDGER is nearly empty, generate new narrative arcs from team state
@@ -2141,35 +3305,103 @@ class PokemonGM:
         
         return "\n\n---\n\n".join(prompt_parts)
     
+    def _runtime_state(self) -> dict:
+        """Copy of the runtime counters for the checkpoint (safe from either thread)."""
+        now = time.time()
+        return {
+            'ev_drought_count': self.ev_drought_count,
+            'consecutive_none_count': self.consecutive_none_count,
+            'events_since_system_reminder': self.events_since_system_reminder,
+            'session_visible_rewards': self.session_visible_rewards,
+            'reward_history': list(self.reward_history),
+            'drift_history': list(self.drift_history),
+            'battle_history': list(self.battle_history),
+            # Only encounters still inside the 30-min rematch window matter
+            'trainer_encounters': {key: list(times)
+                                   for key, times in list(self.trainer_encounters.items())
+                                   if times and now - times[-1] < 1800},
+            'move_usage': {str(k): v for k, v in list(self.move_usage.items())},
+            'skipped_events': self.skipped_events.to_dict(),
+            'battles_won': self.battles_won,
+            'pokemon_caught': self.pokemon_caught,
+            'close_calls': self.close_calls,
+            'last_battle_lead': self.last_battle_lead,
+            'last_battle_lead_time': self.last_battle_lead_time,
+        }
+
+    def _restore_runtime_state(self):
+        """Warm restart from the runtime checkpoint; fields it lacks keep their defaults."""
+        state = self.runtime_checkpoint.load()
+        if not state:
+            return
+        try:
+            for key in ('ev_drought_count', 'consecutive_none_count', 'events_since_system_reminder',
+                        'session_visible_rewards', 'reward_history', 'drift_history',
+                        'battle_history', 'trainer_encounters', 'battles_won', 'pokemon_caught',
+                        'close_calls', 'last_battle_lead', 'last_battle_lead_time'):
+                if key in state:
+                    setattr(self, key, state[key])
+            self.move_usage = {int(k): v for k, v in state.get('move_usage', {}).items()}
+            self.skipped_events.restore(state.get('skipped_events', {}))
+        except (TypeError, ValueError, AttributeError) as e:
+            self.log(f"⚠️ Runtime checkpoint not restored ({e}); starting cold")
+            return
+        self._last_runtime_state = state
+        C = Colors
+        checkpoint = self.runtime_checkpoint
+        self.log(
+            f"{C.CYAN}♻ WARM RESTART{C.RESET}  drought={self.ev_drought_count}, "
+            f"{len(self.drift_history)} drift / {len(self.battle_history)} battles, "
+            f"{len(self.skipped_events)} skipped pending ({checkpoint.load_ms}ms"
+            + (f", migrated from v{checkpoint.migrated_from}" if checkpoint.migrated_from else '')
+            + ")"
+        )
+
+    def _checkpoint_runtime(self, flush: bool = False):
+        """Hand the runtime state to the write-behind checkpoint if it changed."""
+        with self._checkpoint_lock:
+            state = self._runtime_state()
+            if state != self._last_runtime_state:
+                self._last_runtime_state = state
+                self.runtime_checkpoint.update(state)
+            if flush:
+                self.runtime_checkpoint.flush()
+
     def _load_session_history(self):
-        """Load previous session history from file if it exists"""
-        if self.session_history_file.exists():
+        """Load previous session history: snapshot + journal tail, in one pass"""
+        journal = self.session_journal
+        if journal.snapshot_path.exists() or journal.journal_path.exists():
             try:
-                with open(self.session_history_file) as f:
-                    data = json.load(f)
-                    self.session_history = data.get('history', [])
-                    self.compressed_summaries = data.get('compressed_summaries', [])
-                    self.last_badge_count = data.get('last_badge_count', 0)
-                    total = len(self.session_history) + len(self.compressed_summaries)
-                    self.log(f"📜 Loaded {len(self.session_history)} events + {len(self.compressed_summaries)} summaries")
-
-                    # Startup compression: handle large legacy sessions that were never compressed.
-                    # If session has accumulated many events before compression was implemented,
-                    # compress now in multiple passes until below threshold.
-                    if len(self.session_history) >= self.COMPRESSION_THRESHOLD * 2:
-                        original_count = len(self.session_history)
-                        passes = 0
-                        while len(self.session_history) >= self.COMPRESSION_THRESHOLD * 2:
-                            self._compress_session_history(trigger='startup')
-                            passes += 1
-                            if passes > 20:  # Safety limit
-                                break
-                        C = Colors
-                        self.log(
-                            f"{C.CYAN}📦 STARTUP COMPRESS{C.RESET}  "
-                            f"{original_count} → {len(self.session_history)} events "
-                            f"({len(self.compressed_summaries)} summaries, {passes} passes)"
-                        )
+                state = journal.load()
+                self.session_history = state['history']
+                self.compressed_summaries = state['compressed_summaries']
+                self.last_badge_count = state['last_badge_count']
+                self.log(
+                    f"📜 Loaded {len(self.session_history)} events + {len(self.compressed_summaries)} summaries"
+                    + (f" ({state['replayed']} from journal)" if state['replayed'] else '')
+                )
+
+                # Startup compression: handle large legacy sessions that were never compressed.
+                # If session has accumulated many events before compression was implemented,
+                # compress now in multiple passes until below threshold.
+                compacted = bool(state['replayed'])
+                if len(self.session_history) >= self.COMPRESSION_THRESHOLD * 2:
+                    original_count = len(self.session_history)
+                    passes = 0
+                    while len(self.session_history) >= self.COMPRESSION_THRESHOLD * 2:
+                        self._compress_session_history(trigger='startup')
+                        passes += 1
+                        if passes > 20:  # Safety limit
+                            break
+                    compacted = True
+                    C = Colors
+                    self.log(
+                        f"{C.CYAN}📦 STARTUP COMPRESS{C.RESET}  "
+                        f"{original_count} → {len(self.session_history)} events "
+                        f"({len(self.compressed_summaries)} summaries, {passes} passes)"
+                    )
+                if compacted:
+                    self._save_session_history()  # Fold the journal into one fresh snapshot
             except Exception as e:
                 self.log(f"⚠️ Failed to load session history: {e}")
                 self.session_history = []
@@ -2177,23 +3409,25 @@ class PokemonGM:
         else:
             self.log("📝 Starting new session")
     
+    def _session_state(self) -> dict:
+        """Snapshot contents for the session journal."""
+        return {
+            'started_at': datetime.fromtimestamp(self.session_start).isoformat(),
+            'history': list(self.session_history),
+            'compressed_summaries': list(self.compressed_summaries),
+            'last_badge_count': self.last_badge_count,
+            'stats': {
+                'battles_won': self.battles_won,
+                'pokemon_caught': self.pokemon_caught,
+                'close_calls': self.close_calls
+            }
+        }
+    
     def _save_session_history(self):
-        """Save session history to file for next run"""
+        """Snapshot session history now (startup compaction and shutdown; see SessionJournal)"""
         if self.session_persistent:
             try:
-                session_data = {
-                    'started_at': datetime.fromtimestamp(self.session_start).isoformat(),
-                    'history': self.session_history,
-                    'compressed_summaries': self.compressed_summaries,
-                    'last_badge_count': self.last_badge_count,
-                    'stats': {
-                        'battles_won': self.battles_won,
-                        'pokemon_caught': self.pokemon_caught,
-                        'close_calls': self.close_calls
-                    }
-                }
-                with open(self.session_history_file, 'w') as f:
-                    json.dump(session_data, f, indent=2)
+                self.session_journal.snapshot(self._session_state())
             except Exception as e:
                 self.log(f"⚠️ Failed to save session history: {e}")
 
@@ -2206,22 +3440,54 @@ class PokemonGM:
 
         This ensures important early-game arcs aren't lost in long playthroughs
         while keeping recent history at full fidelity for immediate context.
+        Returns True if anything was compressed.
         """
         if len(self.session_history) < self.COMPRESSION_THRESHOLD:
-            return  # Not enough history to compress
+            return False  # Not enough history to compress
 
         # Take the oldest half of history
         split_point = len(self.session_history) // 2
         old_history = self.session_history[:split_point]
         self.session_history = self.session_history[split_point:]
 
+        compressed = self._summarize_history_entries(old_history, trigger)
+        self.compressed_summaries.append(compressed)
+        C = Colors
+        self.log(f"{C.CYAN}📦 COMPRESSED{C.RESET}  {len(old_history)} events → summary #{len(self.compressed_summaries)}")
+        self._journal_session({
+            'op': 'compress', 'split': split_point, 'summary': compressed,
+            'last_badge_count': self.last_badge_count,
+        })
+        # History changed shape — next prompt re-sends every section in full
+        if getattr(self, 'prompt_delta', None):
+            self.prompt_delta.reset()
+        return True
+    
+    def _on_decisions_compressed(self, compression_result: dict):
+        """Background compaction finished (see DecisionMemoryCompressor.start_background)."""
+        if compression_result.get('compressed', 0) > 0:
+            C = Colors
+            self.log(
+                f"{C.CYAN}📦 DECISION COMPRESS{C.RESET}  "
+                f"{compression_result['compressed']} old → {compression_result['summaries_created']} summaries "
+                f"(kept {compression_result['kept']} recent)"
+            )
+        elif compression_result.get('error'):
+            self.log(f"⚠️ Decision compression failed: {compression_result['error']}")
+
+    def _summarize_history_entries(self, entries: list, trigger: str) -> dict:
+        """
+        Fold session-history style entries ({event_type, prompt, response})
+        into one structured summary dict. Shared by session history
+        compression and direct-mode conversation compaction.
+        """
         # Extract key events and patterns from old history
         event_types = {}
         key_decisions = []
         visible_rewards = []
-        arcs_mentioned = set()
+        arc_counts = {}
 
-        for entry in old_history:
+        for entry in entries:
             # Count event types
             etype = entry.get('event_type', 'unknown')
             event_types[etype] = event_types.get(etype, 0) + 1
@@ -2235,15 +3501,18 @@ class PokemonGM:
                     if action.lower() != 'none' and 'GM.' in action:
                         key_decisions.append(action)
 
-            # Look for arc mentions
-            for arc_word in ['Ralts', 'Combusken', 'Lombre', 'shiny', 'Blaze Kick', 'Giga Drain']:
-                if arc_word.lower() in response.lower():
-                    arcs_mentioned.add(arc_word)
+            # Look for arc mentions (any species or move, plus shiny)
+            found = self.text_extractor.extract(response)
+            for arc_word in found['pokemon'] + found['moves'] + [t for t in found['tags'] if t == 'shiny']:
+                arc_counts[arc_word] = arc_counts.get(arc_word, 0) + 1
 
             # Track visible rewards
             if 'teachMove' in response or 'setShiny' in response or 'giveItem' in response:
                 visible_rewards.append(etype)
 
+        # Most-mentioned arcs only; every response names the party
+        arcs_mentioned = sorted(arc_counts, key=lambda a: -arc_counts[a])[:6]
+
         # Build summary
         summary_parts = []
         if event_types:
@@ -2258,35 +3527,35 @@ class PokemonGM:
 
         compressed = {
             'type': 'history_summary',
-            'covers': f"{len(old_history)} interactions",
+            'covers': f"{len(entries)} interactions",
             'compressed_at': trigger,
             'timestamp': datetime.now().isoformat(),
             'summary': ' | '.join(summary_parts) if summary_parts else 'Routine gameplay',
             'key_decisions': key_decisions[-5:] if key_decisions else [],
-            'arcs': list(arcs_mentioned),
+            'arcs': arcs_mentioned,
         }
 
-        self.compressed_summaries.append(compressed)
-        C = Colors
-        self.log(f"{C.CYAN}📦 COMPRESSED{C.RESET}  {len(old_history)} events → summary #{len(self.compressed_summaries)}")
-        self._save_session_history()
-    
+        return compressed
+
+    def _journal_session(self, record: dict):
+        """Append one record to the session journal (snapshots when due)"""
+        if self.session_persistent:
+            try:
+                self.session_journal.append(record, self._session_state)
+            except Exception as e:
+                self.log(f"⚠️ Failed to save session history: {e}")
+
     def _add_to_session_history(self, event_type: str, agent_prompt: str, agent_response: str):
-        """Record an agent interaction in session history"""
+        """Record an agent interaction in session history (the prompt itself is not kept)"""
         if self.session_persistent:
-            self.session_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'event_type': event_type,
-                'prompt': agent_prompt,
-                'response': agent_response
-            })
+            entry = self.session_journal.make_entry(
+                datetime.now().isoformat(), event_type, agent_prompt, agent_response)
+            self.session_history.append(entry)
+            self._journal_session({'op': 'add', 'entry': entry})
             
             # Issue #14: Trigger compression if history exceeds threshold
             if len(self.session_history) >= self.COMPRESSION_THRESHOLD:
                 self._compress_session_history(trigger='threshold')
-            else:
-                # Save after each interaction
-                self._save_session_history()
     
     def log(self, msg: str):
         ts = datetime.now().strftime("%H:%M:%S")
@@ -2412,115 +3681,18 @@ class PokemonGM:
             return False
     
     def write_event(self, event_type: str, data: dict):
-        event = {"time": datetime.now().isoformat(), "type": event_type, **data}
-        with open(self.events_file, 'a') as f:
-            f.write(json.dumps(event) + "\n")
+        """Record an event in the buffered, rotating journal (state/events/)."""
+        try:
+            self.event_journal.append(event_type, data)
+        except (OSError, TypeError, ValueError):
+            pass  # Recording is best-effort; never drop the live event
     
     def write_state_dump(self, data: dict):
         """
-        Write full game state to state/current.txt for agent to read.
-        Called on every event so it's always current.
+        Refresh state/current.txt + current.json for the agent to read.
+        Called on meaningful events; files are only rewritten when the state changed.
         """
-        state_file = self.state_dir / 'current.txt'
-        lines = []
-        lines.append(f"# CURRENT STATE — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"# Auto-updated on every game event. Read this before taking actions.")
-        lines.append("")
-        
-        # Player info
-        lines.append("## PLAYER")
-        lines.append(f"Name: {data.get('player_name', 'Unknown')}")
-        play_time = data.get('play_time', {})
-        lines.append(f"Play Time: {play_time.get('hours', 0)}h {play_time.get('minutes', 0)}m")
-        lines.append(f"Money: ${data.get('money', 0):,}")
-        lines.append(f"Badges: {data.get('badge_count', 0)}")
-        lines.append(f"Location: Map {data.get('map_group', 0)}-{data.get('map_num', 0)} @ ({data.get('player_x', 0)}, {data.get('player_y', 0)})")
-        lines.append("")
-        
-        # Party
-        lines.append("## PARTY")
-        party = data.get('party') or []
-        for p in party:
-            slot = p.get('slot', 0)
-            species_id = p.get('species', 0)
-            species_name = self.species_names.get(species_id, f"Species#{species_id}")
-            nickname = p.get('nickname', species_name)
-            level = p.get('level', 1)
-            hp = p.get('current_hp', 0)
-            max_hp = p.get('max_hp', 1)
-            
-            # Status
-            status_val = p.get('status', 0)
-            status_str = ""
-            if status_val & 0x07: status_str = " [SLP]"
-            elif status_val & 0x08: status_str = " [PSN]"
-            elif status_val & 0x10: status_str = " [BRN]"
-            elif status_val & 0x20: status_str = " [FRZ]"
-            elif status_val & 0x40: status_str = " [PAR]"
-            elif status_val & 0x80: status_str = " [TOX]"
-            
-            lines.append(f"[{slot}] {nickname} ({species_name}) L{level} | HP {hp}/{max_hp}{status_str}")
-            
-            # Moves
-            moves = p.get('moves', [0, 0, 0, 0])
-            pp = p.get('pp', [0, 0, 0, 0])
-            move_strs = []
-            for i, move_id in enumerate(moves):
-                if move_id > 0:
-                    move_name = MOVE_NAMES.get(move_id, f"Move#{move_id}")
-                    move_strs.append(f"{move_name}({pp[i] if i < len(pp) else '?'})")
-            lines.append(f"    Moves: [{', '.join(move_strs)}]")
-            lines.append(f"    Move IDs: {moves}")
-            
-            # Stats
-            lines.append(f"    Stats: ATK {p.get('attack', 0)} | DEF {p.get('defense', 0)} | SPD {p.get('speed', 0)} | SPA {p.get('sp_attack', 0)} | SPD {p.get('sp_defense', 0)}")
-            
-            # EVs
-            evs = p.get('evs', {})
-            if evs:
-                lines.append(f"    EVs: HP {evs.get('hp', 0)} | ATK {evs.get('attack', 0)} | DEF {evs.get('defense', 0)} | SPD {evs.get('speed', 0)} | SPA {evs.get('sp_attack', 0)} | SPD {evs.get('sp_defense', 0)}")
-            
-            # IVs
-            ivs = p.get('ivs', {})
-            if ivs:
-                lines.append(f"    IVs: HP {ivs.get('hp', 0)} | ATK {ivs.get('attack', 0)} | DEF {ivs.get('defense', 0)} | SPD {ivs.get('speed', 0)} | SPA {ivs.get('sp_attack', 0)} | SPD {ivs.get('sp_defense', 0)}")
-            
-            # Nature + held item
-            nature_id = p.get('nature', 0)
-            nature_names = ['Hardy', 'Lonely', 'Brave', 'Adamant', 'Naughty', 'Bold', 'Docile', 'Relaxed', 'Impish', 'Lax', 'Timid', 'Hasty', 'Serious', 'Jolly', 'Naive', 'Modest', 'Mild', 'Quiet', 'Bashful', 'Rash', 'Calm', 'Gentle', 'Sassy', 'Careful', 'Quirky']
-            nature_name = nature_names[nature_id] if nature_id < len(nature_names) else f"Nature#{nature_id}"
-            held = p.get('held_item', 0)
-            held_str = f"Item#{held}" if held > 0 else "None"
-            lines.append(f"    Nature: {nature_name} | Held: {held_str}")
-            lines.append(f"    EXP: {p.get('experience', 0):,}")
-            lines.append("")
-        
-        # Bag items (summary)
-        lines.append("## BAG (first 20 items)")
-        bag = (data.get('bag_items') or [])[:20]
-        for item in bag:
-            lines.append(f"  Item#{item.get('id', 0)} x{item.get('qty', 0)}")
-        if not bag:
-            lines.append("  (empty or not readable)")
-        lines.append("")
-        
-        # Battle state
-        lines.append("## BATTLE STATE")
-        if data.get('in_battle', False):
-            lines.append("In Battle: YES")
-            enemy = data.get('enemy_pokemon')
-            if enemy:
-                enemy_species = self.species_names.get(enemy.get('species', 0), f"Species#{enemy.get('species', 0)}")
-                lines.append(f"Enemy: {enemy_species} L{enemy.get('level', '?')} | HP {enemy.get('hp', '?')}/{enemy.get('maxHp', '?')}")
-                lines.append(f"Enemy Stats: ATK {enemy.get('attack', '?')} | DEF {enemy.get('defense', '?')} | SPD {enemy.get('speed', '?')}")
-        else:
-            lines.append("In Battle: NO")
-        
-        # Write atomically
-        tmp_file = state_file.with_suffix('.tmp')
-        with open(tmp_file, 'w') as f:
-            f.write('\n'.join(lines))
-        tmp_file.rename(state_file)
+        self.state_dump.update(data)
     
     def detect_trainer_rematch(self, enemy_species: int, enemy_level: int) -> bool:
         """
@@ -2545,13 +3717,92 @@ class PokemonGM:
         
         return is_rematch
     
-    def score_event_uncertainty(self, event_type: str, context: dict) -> float:
+    def _build_event_context(self, event_type: str, context: dict) -> EventContext:
+        """
+        Compute the immutable EventContext for an incoming event.
+        
+        This is the only place per-event derived state is computed: battle
+        metadata, drift, the structured arc ledger, party summary and the CATTS
+        uncertainty score. It is also the only place _last_party_size advances,
+        so re-reading the snapshot later never changes the answer.
+        """
+        state = context.get('state', {}) or {}
+        party = state.get('party', []) or []
+        if party:
+            avg_hp = sum(
+                (p.get('current_hp', 0) / max(p.get('max_hp', 1), 1)) * 100
+                for p in party
+            ) / len(party)
+        else:
+            avg_hp = 100
+        
+        battle = BattleMeta.from_buffer(context.get('buffer', []))
+        drift = self._calculate_drift_score()
+        arcs = tuple(MappingProxyType(arc) for arc in self._get_pending_arcs_structured())
+        
+        party_changed = False
+        if event_type == 'EXPLORATION_SUMMARY':
+            party_size = len([p for p in party if p.get('species', 0) > 0])
+            party_changed = (self._last_party_size is not None
+                             and party_size != self._last_party_size)
+            self._last_party_size = party_size
+        
+        uncertainty = self.score_event_uncertainty(
+            event_type, context,
+            battle=battle, drift=drift, arcs=arcs, party_changed=party_changed,
+        )
+        
+        return EventContext(
+            event_type=event_type,
+            uncertainty=uncertainty,
+            drift=MappingProxyType(drift),
+            arcs=arcs,
+            party_summary=self.format_party(party),
+            party_size=len(party),
+            party_avg_hp=int(avg_hp),
+            battle=battle,
+            created_at=time.time(),
+            signals=self._situation_signals(event_type, party, battle, arcs),
+        )
+
+    def _situation_signals(self, event_type: str, party: list, battle: BattleMeta,
+                           arcs: tuple) -> frozenset:
+        """
+        Context signals describing this moment, for decision similarity search:
+        event type, drought bucket, party/enemy species, open arcs, battle tags.
+        """
+        signals = {
+            f"event:{event_type}",
+            f"drought:{DecisionSimilarityIndex.drought_bucket(self.ev_drought_count)}",
+        }
+        for p in party:
+            if p.get('species', 0) > 0:
+                signals.add(f"poke:{self.get_species_name(p['species']).lower()}")
+        if battle.enemy:
+            signals.add(f"enemy:{battle.enemy.rsplit(' L', 1)[0].lower()}")
+        for flag, tag in ((battle.is_trainer, 'trainer'), (battle.is_close, 'clutch'),
+                          (battle.is_rematch, 'rematch')):
+            if flag:
+                signals.add(f"tag:{tag}")
+        if battle.outcome:
+            signals.add(f"outcome:{battle.outcome.lower()}")
+        for arc in arcs:
+            if arc.get('arc_name'):
+                signals.add(f"arc:{arc['arc_name'].lower()}")
+        return frozenset(signals)
+    
+    def score_event_uncertainty(self, event_type: str, context: dict,
+                                battle: BattleMeta = None, drift: dict = None,
+                                arcs: tuple = (), party_changed: bool = False) -> float:
         """
         Score event uncertainty (0-1) to decide if agent invocation is needed.
         Higher uncertainty = more likely to invoke agent.
         
         Based on CATTS framework: allocate compute to high-uncertainty decisions.
         
+        Pure function of its inputs — callers pass precomputed battle/drift/arcs
+        (see _build_event_context) instead of having them recomputed here.
+        
         Returns: uncertainty score (0-1)
         """
         # High uncertainty — always invoke
@@ -2560,23 +3811,15 @@ class PokemonGM:
         
         # Battle outcomes — depends on context
         if event_type == 'BATTLE_SUMMARY':
-            buffer = context.get('buffer', [])
-            
-            # Extract battle metadata
-            is_trainer = False
-            is_close = False
-            for event in buffer:
-                if event.get('event') == 'START':
-                    is_trainer = event.get('is_trainer', False)
-                elif event.get('event') == 'END':
-                    is_close = event.get('was_close', False)
+            if battle is None:
+                battle = BattleMeta.from_buffer(context.get('buffer', []))
             
             # Trainer battles are high-uncertainty (narrative implications)
-            if is_trainer:
-                return 0.9 if is_close else 0.7
+            if battle.is_trainer:
+                return 0.9 if battle.is_close else 0.7
             
             # Wild battle, not close → low uncertainty (routine grinding)
-            if not is_close:
+            if not battle.is_close:
                 return 0.2
             
             # Wild battle, close call → medium uncertainty
@@ -2587,33 +3830,20 @@ class PokemonGM:
         # Most exploration events are truly routine and don't warrant agent reasoning.
         # Only invoke agent when exploration has narrative potential.
         if event_type == 'EXPLORATION_SUMMARY':
-            return self._score_exploration_uncertainty(context)
+            return self._score_exploration_uncertainty(
+                context, drift=drift or {}, arcs=arcs, party_changed=party_changed)
         
         # Unknown events — medium uncertainty
         return 0.5
     
-    def should_invoke_agent(self, event_type: str, context: dict, threshold: float = 0.15) -> bool:
+    def should_invoke_agent(self, ectx: EventContext, threshold: float = 0.15) -> bool:
         """
         Determine if agent should be invoked for this event.
         Threshold 0.15 (low) means most events invoke the agent — skips only very routine
         wild battles (uncertainty 0.2 but threshold 0.15 still passes them).
         Raise threshold toward 0.4 to be more selective.
         """
-        uncertainty = self.score_event_uncertainty(event_type, context)
-        return uncertainty >= threshold
-    
-    def _summarize_event(self, event_type: str, context: dict) -> str:
-        """Create a brief summary of a skipped event for batching context"""
-        if event_type == 'BATTLE_SUMMARY':
-            buffer = context.get('buffer', [])
-            for event in buffer:
-                if event.get('event') == 'START':
-                    return f"Wild battle vs {event.get('enemy', '???')}"
-            return "Wild battle"
-        elif event_type == 'EXPLORATION_SUMMARY':
-            return context.get('summary', 'Explored')
-        else:
-            return event_type
+        return ectx.uncertainty >= threshold
     
     def _classify_reward(self, action_cmd: str) -> str:
         """
@@ -2681,7 +3911,8 @@ class PokemonGM:
             'visible': visible_count,
         }
 
-    def _score_exploration_uncertainty(self, context: dict) -> float:
+    def _score_exploration_uncertainty(self, context: dict, drift: dict = None,
+                                       arcs: tuple = (), party_changed: bool = False) -> float:
         """
         Issue #35 — Exploration Pre-filtering (data-driven optimization).
         
@@ -2699,6 +3930,9 @@ class PokemonGM:
         - Pending arcs mention exploration-related triggers
         - High drought (Maren needs to act SOMEWHERE)
         
+        Party-size tracking lives in _build_event_context; this method only
+        reads the party_changed flag it computed, so scoring has no side effects.
+        
         Returns: uncertainty score (0-1). Below threshold = skip agent.
         """
         state = context.get('state', {})
@@ -2711,12 +3945,8 @@ class PokemonGM:
             return 0.9
         
         # Party composition change — deposit/withdrawal has narrative weight
-        # Check if party size changed from last known state
-        current_party = state.get('party', [])
-        current_party_size = len([p for p in current_party if p.get('species', 0) > 0])
-        if hasattr(self, '_last_party_size') and current_party_size != self._last_party_size:
+        if party_changed:
             score = max(score, 0.7)  # Party change is significant
-        self._last_party_size = current_party_size
         
         # Large item gain — stocking up for something important
         items_gained = state.get('itemsGained', 0)
@@ -2733,12 +3963,10 @@ class PokemonGM:
             score = max(score, 0.6)  # Drought pressure elevates importance
         
         # Critical drift — agent is systematically passive, force more invocations
-        drift = self._calculate_drift_score()
-        if drift.get('severity') == 'critical':
+        if (drift or {}).get('severity') == 'critical':
             score = max(score, 0.5)
         
         # Pending IMMEDIATE arcs — always be ready to close them
-        arcs = self._get_pending_arcs_structured()
         has_immediate = any(a['status'] == 'IMMEDIATE' for a in arcs)
         if has_immediate:
             score = max(score, 0.5)
@@ -3015,7 +4243,8 @@ class PokemonGM:
         
         return result[:5]
 
-    def _get_proactive_arc_suggestions(self, event_type: str, ctx: dict) -> str:
+    def _get_proactive_arc_suggestions(self, event_type: str, ctx: dict,
+                                       ectx: EventContext, arcs: list) -> str:
         """
         Issue #33 — Quality-Aware Arc Prompting (A-MAC-inspired, arxiv 2603.05549).
 
@@ -3030,13 +4259,11 @@ class PokemonGM:
 
         Returns: formatted suggestion block or empty string.
         """
-        arcs = self._get_pending_arcs_structured()
         if not arcs:
             return ''
 
         # Only do proactive suggestions for high-uncertainty events
-        uncertainty = self.score_event_uncertainty(event_type, ctx)
-        if uncertainty < 0.6:
+        if ectx.uncertainty < 0.6:
             return ''  # Low uncertainty — use passive injection instead
 
         # Extract context clues from the event
@@ -3520,34 +4747,33 @@ class PokemonGM:
         
         return False
 
-    def prompt_agent_async(self, event_type: str, context: dict):
+    def prompt_agent_async(self, event_type: str, context: dict, ectx: EventContext = None):
         """Send event to AI agent in background thread (with uncertainty check)"""
+        # Derived state is computed once, at arrival — queued events keep theirs
+        if ectx is None:
+            ectx = self._build_event_context(event_type, context)
+        
         # Always invoke for high-uncertainty events, skip routine ones
-        if not self.should_invoke_agent(event_type, context):
-            uncertainty = self.score_event_uncertainty(event_type, context)
+        if not self.should_invoke_agent(ectx):
             C = Colors
-            self.log(f"{C.DIM}⏭ Skip (uncertainty {uncertainty:.2f}): {event_type}{C.RESET}")
-            # Accumulate skipped event for context in next significant event
-            self.skipped_events.append({
-                'type': event_type,
-                'time': datetime.now().isoformat(),
-                'summary': self._summarize_event(event_type, context)
-            })
-            # Keep max 20 skipped events
-            if len(self.skipped_events) > 20:
-                self.skipped_events = self.skipped_events[-20:]
+            self.log(f"{C.DIM}⏭ Skip (uncertainty {ectx.uncertainty:.2f}): {event_type}{C.RESET}")
+            # Fold skipped event into the running summary for the next significant event
+            self.skipped_events.add(event_type, context, ectx)
             return
         
         if self.agent_busy:
             self.log(f"⏳ Agent busy, queueing: {event_type}")
-            self.pending_events.append((event_type, context))
+            self.pending_events.append((event_type, context, ectx))
             return
         
         def run_agent():
             self.agent_busy = True
             self.last_agent_invoke_time = time.time()  # Track for GRIND_SUMMARY timeout
             try:
-                prompt = self.build_prompt(event_type, context)
+                prompt = self.build_prompt(event_type, context, ectx)
+                if self.agent_mode == 'direct':
+                    prompt = self._fit_direct_history(prompt, event_type, context, ectx)
+                self._consume_prompt_state()
                 C = Colors
                 self.log(f"{C.MAGENTA}▲ THINKING...{C.RESET}  {C.DIM}{event_type}{C.RESET}")
                 
@@ -3560,6 +4786,12 @@ class PokemonGM:
                 else:  # clawdbot (default)
                     response_text = self._call_clawdbot(prompt)
                 
+                if self.prompt_delta:
+                    if response_text:
+                        self.prompt_delta.commit()
+                    else:
+                        self.prompt_delta.discard()
+                
                 if response_text:
                     C = Colors
                     self.log(f"{C.GREEN}▼ AI RESPONSE{C.RESET}")
@@ -3654,6 +4886,7 @@ class PokemonGM:
                         session_visible=self.session_visible_rewards,
                         arc_closed=arc_closed_name,
                         response_snippet=response_text[:200],
+                        signals=ectx.signals if ectx else None,
                     )
 
                     # Execute all extracted GM calls (with validation — Issue #24)
@@ -3672,15 +4905,13 @@ class PokemonGM:
                         if corrected and corrected != gm_call:
                             print(f"  {C.YELLOW}⚠ AUTO-CORRECTED: {error_msg}{C.RESET}")
                         
-                        shell_cmd = f"echo '{final_cmd}' | nc -w 1 {self.socket_host} {self.socket_port}"
                         readable = self.get_readable_action(final_cmd)
                         if reward_type == 'visible':
                             print(f"  {C.BOLD}{C.YELLOW}★ VISIBLE: {readable}{C.RESET}")
                         else:
                             print(f"  {C.BOLD}{C.GREEN}⚡ {readable}{C.RESET}")
                         try:
-                            subprocess.run(shell_cmd, shell=True, timeout=5,
-                                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                            self._send_gm_command(final_cmd)
                             print(f"  {C.GREEN}✓ {final_cmd}{C.RESET}")
                             
                             # Issue #28: Auto-Arc Detection — close matching arc if visible reward
@@ -3714,12 +4945,10 @@ class PokemonGM:
                                 heuristic_cmd = self._get_heuristic_reward(event_type)
                                 if heuristic_cmd:
                                     print(f"  {C.BOLD}{C.MAGENTA}🔄 DROUGHT BREAKER: Agent said none, forcing heuristic reward{C.RESET}")
-                                    shell_cmd = f"echo '{heuristic_cmd}' | nc -w 1 {self.socket_host} {self.socket_port}"
                                     readable = self.get_readable_action(heuristic_cmd)
                                     print(f"  {C.BOLD}{C.YELLOW}★ FORCED: {readable}{C.RESET}")
                                     try:
-                                        subprocess.run(shell_cmd, shell=True, timeout=5,
-                                                     stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                                        self._send_gm_command(heuristic_cmd)
                                         print(f"  {C.GREEN}✓ {heuristic_cmd}{C.RESET}")
                                         # Reset drought since we gave a visible reward
                                         self.ev_drought_count = 0
@@ -3736,6 +4965,7 @@ class PokemonGM:
                                             session_visible=self.session_visible_rewards,
                                             arc_closed=None,
                                             response_snippet="[DROUGHT BREAKER — heuristic reward forced]",
+                                            signals=ectx.signals if ectx else None,
                                         )
                                     except subprocess.TimeoutExpired:
                                         print(f"  {C.YELLOW}✓ Sent{C.RESET}")
@@ -3750,12 +4980,23 @@ class PokemonGM:
                 self.log(f"❌ Agent error: {e}")
             finally:
                 self.agent_busy = False
+                self._checkpoint_runtime()
                 if self.pending_events:
-                    next_event, next_ctx = self.pending_events.pop(0)
-                    self.prompt_agent_async(next_event, next_ctx)
+                    next_event, next_ctx, next_ectx = self.pending_events.pop(0)
+                    self.prompt_agent_async(next_event, next_ctx, next_ectx)
         
+        self._start_agent(run_agent)
+    
+    def _start_agent(self, run_agent):
+        """Run one agent turn off the event loop (tools/replay_eval.py runs it inline)."""
         threading.Thread(target=run_agent, daemon=True).start()
     
+    def _send_gm_command(self, cmd: str):
+        """Deliver a GM.* call to the Lua side over the command socket."""
+        shell_cmd = f"echo '{cmd}' | nc -w 1 {self.socket_host} {self.socket_port}"
+        subprocess.run(shell_cmd, shell=True, timeout=5,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    
     def _call_clawdbot(self, prompt: str) -> str:
         """Call agent via Clawdbot CLI - agent writes response to gm_response.txt"""
         # Clear previous response
@@ -3795,30 +5036,83 @@ class PokemonGM:
         self.log("⚠️ Clawdbot: timed out waiting for gm_response.txt")
         return ""
     
+    def _fit_direct_history(self, prompt: str, event_type: str, context: dict,
+                            ectx: EventContext) -> str:
+        """
+        Make room in direct-mode history for an unusually large prompt.
+
+        Folded turns may be the ones that carried sections this prompt marked
+        UNCHANGED, so if anything was folded while sections were omitted, the
+        prompt is rebuilt with a full refresh before it is sent.
+        """
+        history = self.conversation_history
+        if not history.make_room(prompt) or not self.prompt_delta:
+            return prompt
+        omitted = self.prompt_delta.omitted()
+        self.prompt_delta.reset()
+        if omitted:
+            self.log(f"🧮 History folded; re-sending {', '.join(omitted)}")
+            skipped_block = self._prompt_consumes.get('skipped_events')
+            # Same turn, so not build_prompt (replay counts one build per turn)
+            prompt = self._compose_prompt(event_type, context, ectx)
+            if skipped_block and skipped_block not in prompt:
+                self.log("⚠️ Rebuilt prompt lost the skipped-events block; appending it")
+                prompt += skipped_block
+            history.make_room(prompt)  # The full prompt is larger
+        return prompt
+    
     def _call_anthropic_direct(self, prompt: str) -> str:
         """Call Anthropic API directly (no Clawdbot required)"""
-        # Add to conversation history
-        self.conversation_history.append({"role": "user", "content": prompt})
+        history = self.conversation_history
         
-        # Keep history manageable (last 20 turns)
-        if len(self.conversation_history) > 40:
-            self.conversation_history = self.conversation_history[-40:]
+        usage = history.stats(prompt)
+        C = Colors
+        self.log(f"{C.DIM}🧮 History ~{usage['sent']} tok sent "
+                 f"({usage['verbatim_turns']} turns verbatim, {usage['folded_turns']} folded, "
+                 f"~{usage['saved']} tok saved){C.RESET}")
         
         response = self.anthropic_client.messages.create(
             model=self.agent_model,
             max_tokens=1024,
-            system=self.system_prompt,
-            messages=self.conversation_history
+            system=self.system_prompt + history.summary_block(),
+            messages=history.messages(prompt)
         )
         
         assistant_message = response.content[0].text
-        self.conversation_history.append({"role": "assistant", "content": assistant_message})
+        # Only completed turns enter history, so roles always alternate
+        if history.record(prompt, assistant_message) and self.prompt_delta:
+            # Folded turns took their context sections with them
+            self.prompt_delta.reset()
         
         # Write to response file (for compatibility)
         self.response_file.write_text(assistant_message)
         
         return assistant_message
     
+    def _summarize_direct_turns(self, entries: list) -> str:
+        """Summary line for direct-mode turns folded out of conversation history."""
+        if self.history_summary_mode == 'model':
+            try:
+                transcript = "\n\n".join(
+                    f"{e['prompt'][:1500]}\n--- RESPONSE ---\n{e['response'][:800]}" for e in entries
+                )
+                response = self.anthropic_client.messages.create(
+                    model=self.agent_model,
+                    max_tokens=300,
+                    system="Summarize these Game Master turns in 2-3 sentences. Keep rewards given, "
+                           "promises made and arcs opened or closed. Drop routine detail.",
+                    messages=[{"role": "user", "content": transcript}],
+                )
+                return f"[{len(entries)} turns] {response.content[0].text.strip()}"
+            except Exception as e:
+                self.log(f"⚠️ Model summary failed, using heuristic: {e}")
+        
+        compressed = self._summarize_history_entries(entries, 'direct_history')
+        line = f"[{compressed['covers']}] {compressed['summary']}"
+        if compressed['key_decisions']:
+            line += f" | Actions: {', '.join(compressed['key_decisions'][:3])}"
+        return line
+
     def _call_claude_cli(self, prompt: str) -> str:
         """Call Claude CLI (uses Claude Code/Max subscription via OAuth)"""
         # Build the full prompt with system context
@@ -3854,16 +5148,37 @@ class PokemonGM:
             self.log(f"⚠️ Codex CLI error: {result.stderr[:100]}")
             return ""
     
-    def build_prompt(self, event_type: str, ctx: dict) -> str:
-        """Build context-rich prompt for the agent"""
+    def build_prompt(self, event_type: str, ctx: dict, ectx: EventContext = None) -> str:
+        """Build context-rich prompt for the agent (once per agent turn)"""
+        return self._compose_prompt(event_type, ctx, ectx)
+
+    def _consume_prompt_state(self):
+        """
+        Apply the state changes of the prompt about to be sent: clear the skipped
+        events it summarized and restart the system-reminder count if it carried
+        one. _compose_prompt only records them, so a refresh rebuild sees the
+        same state as the first build.
+        """
+        consumed, self._prompt_consumes = self._prompt_consumes, {}
+        if 'skipped_events' in consumed:
+            self.skipped_events.clear()
+        if 'system_reminder' in consumed:
+            self.events_since_system_reminder = 0
+
+    def _compose_prompt(self, event_type: str, ctx: dict, ectx: EventContext = None) -> str:
         state = ctx.get('state', {})
         party = state.get('party', [])
+        if ectx is None:
+            ectx = self._build_event_context(event_type, ctx)
+        if self.prompt_delta:
+            self.prompt_delta.begin()
+        self._prompt_consumes = {}   # Applied by _consume_prompt_state once the prompt is final
         
         # Issue #40 — Auto-Arc Generation (Story Hook Detection)
         # Before building prompt, check if we need new arcs. If ARC LEDGER is nearly
         # empty, generate new story hooks from current team state. This addresses the
         # root cause of 91% "none" rate: Maren has nothing to work toward.
-        pending_arcs = self._get_pending_arcs_structured()
+        pending_arcs = list(ectx.arcs)
         if self.arc_generator.needs_new_arcs(pending_arcs):
             new_arcs = self.arc_generator.maybe_generate_arcs(
                 pending_arcs=pending_arcs,
@@ -3874,21 +5189,13 @@ class PokemonGM:
             if new_arcs:
                 # Re-fetch arcs after generation
                 pending_arcs = self._get_pending_arcs_structured()
-        
-        # Calculate party health
-        if party:
-            avg_hp = sum(
-                (p.get('current_hp', 0) / max(p.get('max_hp', 1), 1)) * 100
-                for p in party
-            ) / len(party)
-        else:
-            avg_hp = 100
+        structured_arcs = pending_arcs
         
         session_mins = int((time.time() - self.session_start) / 60)
         
         prompt = f"EVENT: {event_type}\n"
-        prompt += f"Party: {self.format_party(party)}\n"
-        prompt += f"Party HP: {int(avg_hp)}% avg\n"
+        prompt += f"Party: {ectx.party_summary}\n"
+        prompt += f"Party HP: {ectx.party_avg_hp}% avg\n"
         prompt += f"Session: {session_mins} mins | Badges: {state.get('badge_count', 0)}\n"
         prompt += f"Stats: {self.battles_won} wins, {self.pokemon_caught} caught, {self.close_calls} close calls\n"
         prompt += f"Rewards: {self.session_visible_rewards} visible this session | drought={self.ev_drought_count}\n"
@@ -3906,7 +5213,7 @@ class PokemonGM:
         if event_type == 'BATTLE_SUMMARY':
             buffer = ctx.get('buffer', [])
             prompt += "=== BATTLE COMPLETE ===\n"
-            prompt += "Read the battle text below to determine what happened.\n"
+            prompt += "Read the battle digest below to determine what happened.\n"
             
             for event in buffer:
                 ev = event.get('event', '')
@@ -3924,29 +5231,8 @@ class PokemonGM:
                 elif ev == 'CAUGHT':
                     prompt += f"🎉 Caught: {event.get('pokemon')}\n"
             
-            battle_dialogue = ctx.get('battle_dialogue', [])
-            if battle_dialogue:
-                prompt += "\n=== BATTLE TEXT (what the game showed) ===\n"
-                for text in battle_dialogue[-30:]:
-                    prompt += f"• {text}\n"
-            
-            # Battle damage log from Lua
-            battle_log = ctx.get('battle_log', [])
-            if battle_log:
-                prompt += "\n=== DAMAGE LOG ===\n"
-                for entry in battle_log[-20:]:
-                    etype = entry.get('type', '')
-                    if etype == 'attack':
-                        move_id = entry.get('moveId', 0)
-                        move_name = MOVE_NAMES.get(move_id, f"Move#{move_id}")
-                        damage = entry.get('damage', 0)
-                        enemy_hp = entry.get('enemyHP', '?')
-                        enemy_max = entry.get('enemyMaxHP', '?')
-                        prompt += f"• {move_name} dealt {damage} damage (enemy: {enemy_hp}/{enemy_max})\n"
-                    elif etype == 'damage_taken':
-                        damage = entry.get('damage', 0)
-                        hp = entry.get('hp', '?')
-                        prompt += f"• Took {damage} damage (HP now: {hp})\n"
+            # Merge the text and damage streams into a bounded per-turn table
+            prompt += BattleDigest(ctx.get('battle_dialogue', []), ctx.get('battle_log', [])).render()
         
         elif event_type == 'EXPLORATION_SUMMARY':
             state = ctx.get('state', {})
@@ -3993,8 +5279,7 @@ class PokemonGM:
         # Research (arxiv 2603.05433, 2603.05488) shows reasoning models often produce
         # "performative" CoT that wastes 70-80% of tokens without changing the answer.
         # For low-uncertainty routine events, request abbreviated response format.
-        event_uncertainty = self.score_event_uncertainty(event_type, ctx)
-        if event_uncertainty < self.CONCISE_MODE_THRESHOLD and event_type not in ('GRIND_SUMMARY',):
+        if ectx.uncertainty < self.CONCISE_MODE_THRESHOLD and event_type not in ('GRIND_SUMMARY',):
             prompt += "\n⚡ CONCISE MODE — This is a routine event.\n"
             prompt += "Skip OBSERVATION/PATTERN/MEMORY. Just respond with:\n"
             prompt += "  ACTION: <GM.xxx> or ACTION: none\n"
@@ -4002,24 +5287,22 @@ class PokemonGM:
         
         # Add accumulated skipped events as context
         if self.skipped_events:
-            prompt += f"\n=== SINCE LAST UPDATE ({len(self.skipped_events)} routine events) ===\n"
-            for event in self.skipped_events:
-                prompt += f"• {event.get('summary', event.get('type'))}\n"
-            prompt += "\n"
-            # Clear after including
-            self.skipped_events = []
+            skipped_block = self.skipped_events.render() + "\n"
+            prompt += skipped_block
+            self._prompt_consumes['skipped_events'] = skipped_block  # Cleared once sent
         
         # Add session history context if available (Issue #14: KLong-inspired compression)
         if self.session_persistent:
             # Inject compressed summaries first (older history)
             if self.compressed_summaries:
-                prompt += f"\n=== COMPRESSED HISTORY ({len(self.compressed_summaries)} summaries) ===\n"
+                history_block = f"\n=== COMPRESSED HISTORY ({len(self.compressed_summaries)} summaries) ===\n"
                 for i, summary in enumerate(self.compressed_summaries[-3:], 1):  # Last 3 summaries
-                    prompt += f"[Summary {i}] {summary.get('covers', '?')} | {summary.get('summary', '')}\n"
+                    history_block += f"[Summary {i}] {summary.get('covers', '?')} | {summary.get('summary', '')}\n"
                     if summary.get('key_decisions'):
-                        prompt += f"  Key actions: {', '.join(summary['key_decisions'][:3])}\n"
+                        history_block += f"  Key actions: {', '.join(summary['key_decisions'][:3])}\n"
                     if summary.get('arcs'):
-                        prompt += f"  Arcs: {', '.join(summary['arcs'])}\n"
+                        history_block += f"  Arcs: {', '.join(summary['arcs'])}\n"
+                prompt += self._delta_section('COMPRESSED HISTORY', history_block)
 
             # Then inject recent history
             # Issue #26 — Context Pollution Fix (MIT arxiv 2602.24287)
@@ -4080,13 +5363,12 @@ class PokemonGM:
             prompt += "QUESTION TO ASK YOURSELF:\n"
             prompt += "If I were a player, would I notice Maren is here? If no, act.\n"
             prompt += f"{'='*56}\n\n"
-            # Reset the reminder counter
-            self.events_since_system_reminder = 0
+            self._prompt_consumes['system_reminder'] = True  # Counter resets once sent
 
         # Issue #34 — Drift Detection System (SAHOO paper, arxiv 2603.06333)
         # Unlike consecutive-based tracking (Drought Breaker), this monitors the
         # overall pattern across recent decisions. High drift = systematic passivity.
-        drift = self._calculate_drift_score()
+        drift = ectx.drift
         if drift['severity'] == 'critical':
             # CRITICAL: >90% of recent decisions are invisible (none or EVs)
             prompt += f"\n{'='*56}\n"
@@ -4131,12 +5413,13 @@ class PokemonGM:
             relevant_narrative = self._get_relevant_narrative(event_type, max_chars=max_chars)
             if relevant_narrative:
                 label = "major event — full context" if is_major else "filtered by event type"
-                prompt += f"\n=== NARRATIVE HISTORY ({label}) ===\n{relevant_narrative}\n"
+                prompt += self._delta_section(
+                    'NARRATIVE HISTORY', f"\n=== NARRATIVE HISTORY ({label}) ===\n{relevant_narrative}\n")
 
         # Issue #33 — Quality-Aware Arc Prompting (A-MAC-inspired, arxiv 2603.05549)
         # For high-uncertainty events, proactively suggest arc opportunities
         # "Content type prior is the most influential factor" — A-MAC paper
-        proactive_arcs = self._get_proactive_arc_suggestions(event_type, ctx)
+        proactive_arcs = self._get_proactive_arc_suggestions(event_type, ctx, ectx, structured_arcs)
         if proactive_arcs:
             prompt += f"\n{proactive_arcs}\n"
 
@@ -4145,14 +5428,15 @@ class PokemonGM:
         pending_arcs = self._get_pending_arcs()
         if pending_arcs and not proactive_arcs:
             # Only show passive list if we didn't already show proactive suggestions
-            prompt += f"\n=== PENDING ARC PAYOFFS (you promised these in PLAYTHROUGH.md) ===\n"
+            arcs_block = f"\n=== PENDING ARC PAYOFFS (you promised these in PLAYTHROUGH.md) ===\n"
             for arc in pending_arcs:
-                prompt += f"• {arc}\n"
-            prompt += "\nIf this event creates an opportunity to deliver a payoff, DO IT. Don't defer again.\n"
+                arcs_block += f"• {arc}\n"
+            arcs_block += "\nIf this event creates an opportunity to deliver a payoff, DO IT. Don't defer again.\n"
             # Issue #17 — Arc delivery confirmation instruction
-            prompt += ("When you deliver a promised arc, include this tag in your response:\n"
-                       "  ARC_CLOSED: <exact arc name from ledger>\n"
-                       "The daemon will automatically mark it DELIVERED in PLAYTHROUGH.md.\n")
+            arcs_block += ("When you deliver a promised arc, include this tag in your response:\n"
+                           "  ARC_CLOSED: <exact arc name from ledger>\n"
+                           "The daemon will automatically mark it DELIVERED in PLAYTHROUGH.md.\n")
+            prompt += self._delta_section('PENDING ARC PAYOFFS', arcs_block)
         
         # Reward drought warning — escalate to visible if Maren has been invisible too long
         # Issue #25 — Drought Breaker (Evaluating Stochasticity, arxiv 2602.23271)
@@ -4187,20 +5471,23 @@ class PokemonGM:
         # Inject behavioral profile so Maren can tailor rewards to who this player actually is.
         profile_block = self.player_profile.get_context_block()
         if profile_block:
-            prompt += f"\n{profile_block}\n"
+            prompt += self._delta_section('PLAYER PROFILE', f"\n{profile_block}\n")
 
         # Issue #20 — Decision Library retrieval (MAS-on-the-Fly, phase 2)
         # Only activates after MIN_ENTRIES_FOR_RETRIEVAL decisions are logged.
-        past_decisions = self.decision_logger.get_recent_patterns(event_type=event_type)
+        past_decisions = self.decision_logger.get_recent_patterns(
+            event_type=event_type,
+            signals=ectx.signals if ectx else None,
+        )
         if past_decisions:
-            prompt += f"\n{past_decisions}\n"
+            prompt += self._delta_section('PAST DECISIONS', f"\n{past_decisions}\n")
 
         # Issue #37 — Trajectory Learning (IBM arxiv 2603.10600-inspired)
         # Extracts strategic insights from past decisions and injects as learned strategies.
-        # Activates after MIN_ENTRIES decisions logged. Caches analysis for 1 hour.
+        # Activates after MIN_ENTRIES decisions logged. Aggregates are maintained online.
         strategies_block = self.trajectory_learner.get_strategies_block(current_event_type=event_type)
         if strategies_block:
-            prompt += f"\n{strategies_block}\n"
+            prompt += self._delta_section('LEARNED STRATEGIES', f"\n{strategies_block}\n")
 
         # Issue #38 — Skill Extraction (XSkill-inspired, arxiv 2603.12056)
         # Extracts reusable procedural "skills" from successful decision patterns.
@@ -4211,20 +5498,23 @@ class PokemonGM:
             context_snippet=prompt[-500:] if len(prompt) > 500 else prompt  # Recent context for matching
         )
         if skills_block:
-            prompt += f"\n{skills_block}\n"
+            prompt += self._delta_section('SKILLS', f"\n{skills_block}\n")
 
         # Issue #23 — Learning Directives ("Tell Me What To Learn", arxiv 2602.23201)
         # Inject configurable focus areas to guide what Maren pays attention to.
         directives_block = self.learning_directives.get_context_block()
         if directives_block:
-            prompt += f"\n{directives_block}\n"
+            prompt += self._delta_section('LEARNING DIRECTIVES', f"\n{directives_block}\n")
+
+        if self.prompt_delta:
+            prompt += self.prompt_delta.marker()
 
         # Issue #39 — Self-Verification Prompt (Cross-Context Review, arxiv 2603.12123)
         # Research finding: "LLMs catch more errors when explicitly verifying decisions"
         # (28.6% F1 vs 24.6% for same-session review, p=0.008)
         # Applied: For high-stakes moments, inject verification checklist.
         # This forces explicit reasoning before acting, catching decision errors.
-        is_high_stakes = self._is_high_stakes_decision(event_type, pending_arcs, drift)
+        is_high_stakes = self._is_high_stakes_decision(event_type, pending_arcs, drift, ectx.battle)
         if is_high_stakes:
             prompt += "\n=== DECISION VERIFICATION (Cross-Context Review) ===\n"
             prompt += "HIGH-STAKES MOMENT DETECTED. Before acting, verify:\n"
@@ -4247,7 +5537,14 @@ class PokemonGM:
 
         return prompt
 
-    def _is_high_stakes_decision(self, event_type: str, pending_arcs: list, drift: dict) -> bool:
+    def _delta_section(self, name: str, text: str) -> str:
+        """Pass a stable prompt section through the delta tracker (if enabled)."""
+        if self.prompt_delta is None:
+            return text
+        return self.prompt_delta.section(name, text)
+
+    def _is_high_stakes_decision(self, event_type: str, pending_arcs: list, drift: dict,
+                                 battle: BattleMeta = None) -> bool:
         """
         Determine if the current decision context is high-stakes.
         
@@ -4270,10 +5567,8 @@ class PokemonGM:
                     return True
         
         # Trainer rematch or major battle
-        if hasattr(self, 'battle_buffer') and self.battle_buffer:
-            for entry in self.battle_buffer:
-                if entry.get('is_rematch') or entry.get('is_trainer'):
-                    return True
+        if battle is not None and (battle.is_rematch or battle.is_trainer):
+            return True
         
         # Drift severity is elevated
         if drift.get('severity') in ('warning', 'critical'):
@@ -4468,8 +5763,9 @@ class PokemonGM:
             try:
                 badge_int = int(badge_count) if isinstance(badge_count, str) else badge_count
                 if badge_int > self.last_badge_count and len(self.session_history) >= 10:
-                    self._compress_session_history(trigger=f'badge_{badge_int}')
                     self.last_badge_count = badge_int
+                    if not self._compress_session_history(trigger=f'badge_{badge_int}'):
+                        self._journal_session({'op': 'meta', 'last_badge_count': badge_int})
             except (ValueError, TypeError):
                 pass
 
@@ -4562,9 +5858,49 @@ class PokemonGM:
         print(f"  {C.DIM}Retrying every 5 seconds...{C.RESET}\n")
 
     def run(self):
-        """Main event loop"""
+        """Main event loop. Buffered state is flushed however the loop ends."""
         self.print_banner()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._on_sigterm)
+        try:
+            self._event_loop()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
 
+    @staticmethod
+    def _on_sigterm(signum, frame):
+        raise SystemExit(128 + signum)  # Unwinds run() through its finally
+
+    def shutdown(self):
+        """Flush the event journal, session, profile and runtime checkpoint (once)."""
+        if self._shut_down:
+            return
+        self._shut_down = True
+        self.log("👋 Shutting down")
+        for step in (self.event_journal.close, self.decision_compressor.stop,
+                     self._save_session_history, self.player_profile.flush,
+                     lambda: self._checkpoint_runtime(flush=True)):
+            try:
+                step()
+            except Exception as e:
+                self.log(f"⚠️ Shutdown step failed: {e}")
+        for label, stats in (('Profile', self.player_profile.flush_stats),
+                             ('Checkpoint', self.runtime_checkpoint.stats)):
+            self.log(
+                f"💾 {label}: {stats['updates']} updates → {stats['writes']} writes "
+                f"({stats['coalesced']} coalesced), last flush {stats['last_flush_ms']}ms, "
+                f"max {stats['max_flush_ms']}ms"
+            )
+        dump = self.state_dump.stats
+        self.log(f"📄 State dump: {dump['updates']} updates → {dump['writes']} writes, "
+                 f"{dump['fifo_reads']} on-demand reads")
+        ev = self.event_journal.stats
+        self.log(f"🎞 Events: {ev['events']} recorded in {ev['flushes']} flushes, "
+                 f"{ev['bytes_in'] / 1e6:.1f}MB → {ev['bytes_out'] / 1e6:.1f}MB gzip")
+
+    def _event_loop(self):
         _waiting_shown = False
         while True:
             if not self.connected:
@@ -4583,9 +5919,13 @@ class PokemonGM:
                     for line in data.strip().split('\n'):
                         if line:
                             try:
-                                self.process_event(json.loads(line))
+                                event = json.loads(line)
                             except json.JSONDecodeError:
-                                pass
+                                continue
+                            # Recorded for offline replay (tools/replay_eval.py)
+                            self.write_event(event.get('event_type', 'unknown'), event)
+                            self.process_event(event)
+                            self._checkpoint_runtime()
 
                 # ── GRIND_SUMMARY check (AgentConductor-inspired — issue #15) ──
                 # Trigger a lightweight batch prompt if:
@@ -4619,9 +5959,6 @@ class PokemonGM:
                     self.log("❌ Connection lost, reconnecting...")
                     self.connected = False
                     time.sleep(2)
-            except KeyboardInterrupt:
-                self.log("👋 Shutting down")
-                break
             except Exception as e:
                 self.log(f"❌ Error: {e}")
                 self.connected = False
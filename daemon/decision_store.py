@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Decision Store — SQLite-backed storage for Maren's reward decisions.
+
+One module owns decisions: DecisionLogger writes through it, and
+TrajectoryLearner, SkillExtractor, DecisionMemoryCompressor and
+tools/health_check.py read through its typed query helpers. Aggregations run as
+SQL instead of each consumer re-parsing decisions.jsonl with its own loop.
+
+- WAL mode: the daemon can write while health_check reads.
+- Indexes on ts, event_type and reward_type.
+- JSONL import/export: on first open an existing decisions.jsonl is imported,
+  then renamed to decisions.jsonl.imported. The import is recorded in
+  legacy_imports in the same transaction, so a crash before the rename or a
+  second process migrating at the same time never imports a file twice.
+  export_jsonl() writes the old format back out. Malformed lines are counted
+  and reported, not dropped silently.
+- Compaction streams old rows in batches: each batch becomes a
+  compressed_batches row and is deleted in one transaction. No file is rewritten.
+
+Run: python3 daemon/decision_store.py export <state_dir> [out.jsonl]
+     python3 daemon/decision_store.py import <state_dir> <in.jsonl>
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+# Columns of the decisions table, in DecisionLogger's log schema order
+COLUMNS = ('ts', 'event_type', 'action', 'reward_type', 'drought',
+           'arcs_active', 'session_visible', 'arc_closed', 'snippet')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts              TEXT NOT NULL DEFAULT '',
+    event_type      TEXT NOT NULL DEFAULT 'unknown',
+    action          TEXT NOT NULL DEFAULT 'none',
+    reward_type     TEXT NOT NULL DEFAULT 'none',
+    drought         INTEGER NOT NULL DEFAULT 0,
+    arcs_active     INTEGER NOT NULL DEFAULT 0,
+    session_visible INTEGER NOT NULL DEFAULT 0,
+    arc_closed      TEXT,
+    snippet         TEXT NOT NULL DEFAULT '',
+    extra           TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_ts ON decisions(ts);
+CREATE INDEX IF NOT EXISTS idx_decisions_event_type ON decisions(event_type);
+CREATE INDEX IF NOT EXISTS idx_decisions_reward_type ON decisions(reward_type);
+
+CREATE TABLE IF NOT EXISTS compressed_batches (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    period_start TEXT,
+    period_end   TEXT,
+    count        INTEGER NOT NULL DEFAULT 0,
+    body         TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS legacy_imports (
+    name     TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    imported INTEGER NOT NULL,
+    PRIMARY KEY (name, size, mtime_ns)
+);
+"""
+
+
+class DecisionStore:
+    """Shared decision storage. Thread-safe; one connection guarded by a lock."""
+
+    DB_NAME = 'decisions.db'
+    JSONL_NAME = 'decisions.jsonl'
+    COMPRESSED_JSONL_NAME = 'decisions_compressed.jsonl'
+
+    def __init__(self, db_path: Path, legacy_jsonl: Path = None, legacy_compressed: Path = None):
+        self.path = Path(db_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self.import_report = None
+        self.compressed_import_report = None
+
+        if legacy_jsonl is not None and Path(legacy_jsonl).exists():
+            self.import_report = self._migrate(
+                Path(legacy_jsonl), self._row_values, self._insert_decisions)
+        if legacy_compressed is not None and Path(legacy_compressed).exists():
+            self.compressed_import_report = self._migrate(
+                Path(legacy_compressed), lambda summary: summary, self._insert_summaries)
+
+    @classmethod
+    def for_state_dir(cls, state_dir: Path) -> 'DecisionStore':
+        """Open (and if needed migrate) the store under an agent state directory."""
+        state_dir = Path(state_dir)
+        return cls(
+            state_dir / cls.DB_NAME,
+            legacy_jsonl=state_dir / cls.JSONL_NAME,
+            legacy_compressed=state_dir / cls.COMPRESSED_JSONL_NAME,
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ── Writes ──────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _row_values(entry: dict) -> tuple:
+        extra = {k: v for k, v in entry.items() if k not in COLUMNS}
+        return (
+            entry.get('ts') or '',
+            entry.get('event_type') or 'unknown',
+            entry.get('action') or 'none',
+            entry.get('reward_type') or 'none',
+            int(entry.get('drought') or 0),
+            int(entry.get('arcs_active') or 0),
+            int(entry.get('session_visible') or 0),
+            entry.get('arc_closed') or None,
+            entry.get('snippet') or '',
+            json.dumps(extra) if extra else None,
+        )
+
+    def append(self, entry: dict) -> int:
+        """Insert one decision record. Returns its row id."""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                f"INSERT INTO decisions ({', '.join(COLUMNS)}, extra) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                self._row_values(entry),
+            )
+            return cur.lastrowid
+
+    @staticmethod
+    def _read_jsonl(jsonl_path: Path, convert) -> tuple:
+        """(converted records, malformed line numbers) for a JSONL file of objects."""
+        records, malformed = [], []
+        with open(jsonl_path) as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    if not isinstance(entry, dict):
+                        raise ValueError('not an object')
+                    records.append(convert(entry))
+                except (ValueError, TypeError):
+                    malformed.append(lineno)
+        return records, malformed
+
+    @staticmethod
+    def _report(records: list, malformed: list) -> dict:
+        return {'imported': len(records), 'malformed': len(malformed), 'malformed_lines': malformed[:20]}
+
+    def _insert_decisions(self, rows: list):
+        self._conn.executemany(
+            f"INSERT INTO decisions ({', '.join(COLUMNS)}, extra) "
+            f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+            rows,
+        )
+
+    def _insert_summaries(self, summaries: list):
+        for summary in summaries:
+            self._insert_summary(summary)
+
+    def import_jsonl(self, jsonl_path: Path) -> dict:
+        """Import a decisions.jsonl file. Returns {'imported', 'malformed', 'malformed_lines'}."""
+        rows, malformed = self._read_jsonl(jsonl_path, self._row_values)
+        with self._lock, self._conn:
+            self._insert_decisions(rows)
+        return self._report(rows, malformed)
+
+    def _migrate(self, jsonl_path: Path, convert, insert):
+        """
+        Import a legacy JSONL file exactly once, then rename it to .imported.
+
+        The rows and a legacy_imports record keyed by (name, size, mtime) commit
+        in one BEGIN IMMEDIATE transaction: a concurrent migration waits for the
+        write lock and then finds the record. If the process dies before the
+        rename, the next open finds the record and only renames. Returns the
+        import report, or None if the file had already been imported.
+        """
+        try:
+            stat = jsonl_path.stat()
+            records, malformed = self._read_jsonl(jsonl_path, convert)
+        except FileNotFoundError:
+            return None  # Another process migrated and renamed it just now
+        key = (jsonl_path.name, stat.st_size, stat.st_mtime_ns)
+        report = None
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                done = self._conn.execute(
+                    "SELECT 1 FROM legacy_imports WHERE name = ? AND size = ? AND mtime_ns = ?", key).fetchone()
+                if not done:
+                    insert(records)
+                    self._conn.execute(
+                        "INSERT INTO legacy_imports (name, size, mtime_ns, imported) VALUES (?, ?, ?, ?)",
+                        key + (len(records),))
+                    report = self._report(records, malformed)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        try:
+            jsonl_path.rename(Path(str(jsonl_path) + '.imported'))
+        except FileNotFoundError:
+            pass  # Another process migrating the same file renamed it first
+        return report
+
+    def export_jsonl(self, out_path: Path) -> int:
+        """Write all decisions back out in the original JSONL format. Returns row count."""
+        count = 0
+        with open(out_path, 'w') as f:
+            for entry in self.iter_entries():
+                f.write(json.dumps(entry) + '\n')
+                count += 1
+        return count
+
+    def _insert_summary(self, summary: dict):
+        self._conn.execute(
+            "INSERT INTO compressed_batches (period_start, period_end, count, body) VALUES (?, ?, ?, ?)",
+            (summary.get('period_start'), summary.get('period_end'),
+             summary.get('count', 0), json.dumps(summary)),
+        )
+
+    def compact_before(self, cutoff_ts: str, summarize, batch_size: int, should_stop=None) -> dict:
+        """
+        Replace decisions older than cutoff_ts with compressed summaries.
+
+        Streams one batch_size slice at a time (oldest first): summarize(batch)
+        -> dict runs without holding the store lock, then that slice's summary
+        insert and row delete commit as one transaction. Memory stays bounded
+        by the batch, appends are never blocked for long, and a crash leaves
+        every slice either fully compacted or untouched. Summaries are only
+        ever appended. should_stop() is polled between slices.
+        """
+        compressed = created = 0
+        while not (should_stop and should_stop()):
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT * FROM decisions WHERE ts < ? ORDER BY ts, id LIMIT ?",
+                    (cutoff_ts, batch_size)).fetchall()
+            if not rows:
+                break
+            summary = summarize([self._to_entry(r) for r in rows])
+            ids = [(r['id'],) for r in rows]
+            with self._lock, self._conn:
+                if summary:
+                    self._insert_summary(summary)
+                self._conn.executemany("DELETE FROM decisions WHERE id = ?", ids)
+            compressed += len(rows)
+            created += 1 if summary else 0
+        return {'compressed': compressed, 'summaries_created': created}
+
+    # ── Reads ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _to_entry(row: sqlite3.Row) -> dict:
+        entry = {col: row[col] for col in COLUMNS}
+        if row['extra']:
+            try:
+                entry.update(json.loads(row['extra']))
+            except ValueError:
+                pass
+        return entry
+
+    @staticmethod
+    def _where(event_type=None, reward_type=None, since=None, before=None, action=None) -> tuple:
+        clauses, params = [], []
+        for column, op, value in (('event_type', '=', event_type), ('reward_type', '=', reward_type),
+                                  ('ts', '>=', since), ('ts', '<', before), ('action', '=', action)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def count(self, event_type: str = None, reward_type: str = None,
+              since: str = None, before: str = None, action: str = None) -> int:
+        where, params = self._where(event_type, reward_type, since, before, action)
+        return self._query(f"SELECT COUNT(*) FROM decisions{where}", params)[0][0]
+
+    def count_action_prefix(self, prefix: str) -> int:
+        """Decisions whose action starts with prefix (e.g. 'FORCED')."""
+        return self._query("SELECT COUNT(*) FROM decisions WHERE substr(action, 1, ?) = ?",
+                           (len(prefix), prefix))[0][0]
+
+    def recent(self, event_type: str = None, reward_type: str = None, n: int = 3) -> list:
+        """Most recent n decisions matching the filters, oldest first."""
+        where, params = self._where(event_type, reward_type)
+        rows = self._query(f"SELECT * FROM decisions{where} ORDER BY id DESC LIMIT ?", params + [n])
+        return [self._to_entry(r) for r in reversed(rows)]
+
+    def entries_after(self, last_id: int, limit: int = 500) -> list:
+        """[(row_id, entry)] for rows with id > last_id, in log order (for catch-up)."""
+        rows = self._query("SELECT * FROM decisions WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit))
+        return [(row['id'], self._to_entry(row)) for row in rows]
+
+    def iter_entries(self):
+        """Yield every decision in log order without holding the lock across the scan."""
+        last_id = 0
+        while True:
+            batch = self.entries_after(last_id)
+            if not batch:
+                return
+            for _, entry in batch:
+                yield entry
+            last_id = batch[-1][0]
+
+    def arc_closures(self) -> list:
+        rows = self._query("SELECT * FROM decisions WHERE arc_closed IS NOT NULL AND arc_closed != '' ORDER BY id")
+        return [self._to_entry(r) for r in rows]
+
+    def action_breakdown(self) -> list:
+        """[(event_type, total, none_actions)] ordered by total desc — health_check's table."""
+        rows = self._query(
+            "SELECT event_type, COUNT(*) AS total, SUM(action = 'none') AS none_actions "
+            "FROM decisions GROUP BY event_type ORDER BY total DESC")
+        return [(r['event_type'], r['total'], r['none_actions']) for r in rows]
+
+    def max_drought(self) -> int:
+        return self._query("SELECT COALESCE(MAX(drought), 0) FROM decisions")[0][0]
+
+    def recent_action_none_rate(self, n: int = 30) -> float:
+        """Share of the last n decisions whose action was 'none' (0-1)."""
+        row = self._query(
+            "SELECT COUNT(*), SUM(action = 'none') FROM "
+            "(SELECT action FROM decisions ORDER BY id DESC LIMIT ?)", (n,))[0]
+        return (row[1] or 0) / row[0] if row[0] else 0.0
+
+    def compressed_summaries(self) -> list:
+        rows = self._query("SELECT body FROM compressed_batches ORDER BY id")
+        out = []
+        for row in rows:
+            try:
+                out.append(json.loads(row['body']))
+            except ValueError:
+                pass
+        return out
+
+    def compressed_count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM compressed_batches")[0][0]
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('export', 'import'):
+        print(__doc__.strip().split('\n\n')[-1])
+        sys.exit(1)
+    store = DecisionStore.for_state_dir(Path(sys.argv[2]))
+    if store.import_report:
+        print(f"Migrated decisions.jsonl: {store.import_report}")
+    if store.compressed_import_report:
+        print(f"Migrated decisions_compressed.jsonl: {store.compressed_import_report}")
+    if sys.argv[1] == 'export':
+        out = Path(sys.argv[3]) if len(sys.argv) > 3 else Path(sys.argv[2]) / 'decisions.export.jsonl'
+        print(f"Exported {store.export_jsonl(out)} decisions to {out}")
+    else:
+        print(f"Imported: {store.import_jsonl(Path(sys.argv[3]))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Event Journal — buffered, rotating, gzip-compressed record of mGBA events.
+
+write_event used to open state/events.jsonl in append mode for every event,
+and the file grew forever (full-state payloads make it multi-GB over a long
+playthrough). Now, under state/events/:
+
+- Events are buffered in memory and flushed after FLUSH_EVENTS events,
+  FLUSH_BYTES of JSON, FLUSH_INTERVAL_SEC after the first buffered event,
+  or on close(). Each flush is written as one gzip member, appended to the
+  current segment (events-<first id>.jsonl.gz). Concatenated members are a
+  valid gzip file, so `zcat` still works.
+- Every flushed event gets an index line (event_id, ts, type, offset of its
+  member) in events-<first id>.idx. The index is written after its member,
+  so it never points at data that isn't on disk.
+- Segments rotate at segment_bytes (compressed) and on every start, and only
+  the newest max_segments are kept.
+
+EventJournalReader seeks by event id or time through the index and
+decompresses only the members it needs.
+
+Run: python3 daemon/event_journal.py <events_dir> [--from-id N] [--since ISO] [--type T] [--limit N]
+     python3 daemon/event_journal.py <events_dir> --stats
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+SEGMENT_GLOB = 'events-*.jsonl.gz'
+
+
+def _segment_paths(directory: Path, first_id: int) -> tuple:
+    stem = f"events-{first_id:010d}"
+    return directory / f"{stem}.jsonl.gz", directory / f"{stem}.idx"
+
+
+def _list_segments(directory: Path) -> list:
+    """[(first_id, data_path, index_path)] oldest first."""
+    segments = []
+    for path in directory.glob(SEGMENT_GLOB):
+        try:
+            first_id = int(path.name[len('events-'):].split('.', 1)[0])
+        except ValueError:
+            continue
+        segments.append((first_id, *_segment_paths(directory, first_id)))
+    return sorted(segments)
+
+
+def _read_index(index_path: Path) -> list:
+    """[(event_id, ts, type, offset)] for one segment; a torn last line is ignored."""
+    entries = []
+    if not index_path.exists():
+        return entries
+    with open(index_path) as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) != 4:
+                continue
+            try:
+                entries.append((int(parts[0]), float(parts[1]), parts[2], int(parts[3])))
+            except ValueError:
+                continue
+    return entries
+
+
+class EventJournal:
+    """Buffered writer for the event journal. Thread-safe."""
+
+    FLUSH_EVENTS = 64           # Events per gzip member
+    FLUSH_BYTES = 512 * 1024    # JSON bytes per gzip member
+    FLUSH_INTERVAL_SEC = 5      # Max age of a buffered event
+    SEGMENT_BYTES = 16 * 1024 * 1024
+    MAX_SEGMENTS = 64
+
+    def __init__(self, directory: Path, segment_bytes: int = None, max_segments: int = None):
+        self.dir = Path(directory)
+        self.segment_bytes = segment_bytes or self.SEGMENT_BYTES
+        self.max_segments = max_segments if max_segments is not None else self.MAX_SEGMENTS
+        self._lock = threading.Lock()
+        self._buffer = []       # [(event_id, ts, type, line)]
+        self._buffer_bytes = 0
+        self._timer = None
+        self._file = None
+        self._index = None
+        self._offset = 0
+        self.stats = {'events': 0, 'flushes': 0, 'bytes_in': 0, 'bytes_out': 0, 'segments': 0,
+                      'dropped': 0}
+        self._next_id = self._last_id() + 1
+
+    def _last_id(self) -> int:
+        for _, _, index_path in reversed(_list_segments(self.dir) if self.dir.exists() else []):
+            entries = _read_index(index_path)
+            if entries:
+                return entries[-1][0]
+        return 0
+
+    def append(self, event_type: str, data: dict) -> int:
+        """Buffer one event; returns its event id."""
+        now = time.time()
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            event = {"time": datetime.fromtimestamp(now).isoformat(), "type": event_type, **data,
+                     "event_id": event_id}
+            line = json.dumps(event) + "\n"
+            self._buffer.append((event_id, now, event_type, line))
+            self._buffer_bytes += len(line)
+            due = len(self._buffer) >= self.FLUSH_EVENTS or self._buffer_bytes >= self.FLUSH_BYTES
+            if due:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.FLUSH_INTERVAL_SEC, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return event_id
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        raw = ''.join(line for *_, line in self._buffer).encode()
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 → gzip container
+        member = compressor.compress(raw) + compressor.flush()
+        try:
+            if self._file is None:
+                self._open_segment(self._buffer[0][0])
+            offset = self._offset
+            self._file.write(member)
+            self._file.flush()
+            self._offset += len(member)
+            # Index after data: an index line always points at a complete member
+            self._index.write(''.join(
+                f"{event_id}\t{ts:.3f}\t{etype.replace(chr(9), ' ')}\t{offset}\n"
+                for event_id, ts, etype, _ in self._buffer))
+            self._index.flush()
+        except OSError:
+            # Recording is best-effort: drop this batch, start a fresh segment next time
+            self.stats['dropped'] += len(self._buffer)
+            self._buffer = []
+            self._buffer_bytes = 0
+            self._close_segment()
+            return
+        self.stats['events'] += len(self._buffer)
+        self.stats['flushes'] += 1
+        self.stats['bytes_in'] += len(raw)
+        self.stats['bytes_out'] += len(member)
+        self._buffer = []
+        self._buffer_bytes = 0
+        if self._offset >= self.segment_bytes:
+            self._close_segment()
+
+    def _open_segment(self, first_id: int):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        data_path, index_path = _segment_paths(self.dir, first_id)
+        self._file = open(data_path, 'ab')
+        self._index = open(index_path, 'a')
+        self._offset = self._file.tell()
+        self.stats['segments'] += 1
+        self._prune()
+
+    def _close_segment(self):
+        for f in (self._file, self._index):
+            if f is not None:
+                try:
+                    f.close()
+                except OSError:
+                    pass
+        self._file = self._index = None
+
+    def _prune(self):
+        if not self.max_segments:
+            return
+        segments = _list_segments(self.dir)
+        for _, data_path, index_path in segments[:-self.max_segments]:
+            for path in (data_path, index_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._close_segment()
+
+
+class EventJournalReader:
+    """Seek and read the event journal by event id or time range."""
+
+    def __init__(self, directory: Path):
+        self.dir = Path(directory)
+
+    def segments(self) -> list:
+        return _list_segments(self.dir)
+
+    def index(self):
+        """All (event_id, ts, type, offset) index entries, oldest first."""
+        for _, _, index_path in self.segments():
+            yield from _read_index(index_path)
+
+    def read(self, from_id: int = None, since: float = None, until: float = None, types=None):
+        """
+        Yield events (dicts, as passed to write_event plus time/type/event_id)
+        with id >= from_id and since <= ts < until, optionally only given types.
+        """
+        types = set(types) if types else None
+        segments = self.segments()
+        for i, (first_id, data_path, index_path) in enumerate(segments):
+            next_first = segments[i + 1][0] if i + 1 < len(segments) else None
+            if from_id is not None and next_first is not None and next_first <= from_id:
+                continue  # Whole segment is before from_id
+            entries = _read_index(index_path)
+            if not entries:
+                continue
+            if since is not None and entries[-1][1] < since:
+                continue
+            if until is not None and entries[0][1] >= until:
+                return
+            wanted = {}  # member offset -> event ids wanted from it
+            for event_id, ts, etype, offset in entries:
+                if from_id is not None and event_id < from_id:
+                    continue
+                if since is not None and ts < since:
+                    continue
+                if until is not None and ts >= until:
+                    break
+                if types is not None and etype not in types:
+                    continue
+                wanted.setdefault(offset, set()).add(event_id)
+            if not wanted:
+                continue
+            with open(data_path, 'rb') as f:
+                for offset in sorted(wanted):
+                    ids = wanted[offset]
+                    for line in self._read_member(f, offset):
+                        try:
+                            event = json.loads(line)
+                        except ValueError:
+                            continue
+                        if event.get('event_id') in ids:
+                            yield event
+
+    @staticmethod
+    def _read_member(f, offset: int) -> list:
+        """Decompress the single gzip member starting at offset into lines."""
+        f.seek(offset)
+        decompressor = zlib.decompressobj(31)
+        out = []
+        while not decompressor.eof:
+            chunk = f.read(64 * 1024)
+            if not chunk:
+                break  # Torn member (crash mid-write); keep what decoded
+            try:
+                out.append(decompressor.decompress(chunk))
+            except zlib.error:
+                break
+        return b''.join(out).decode(errors='replace').splitlines()
+
+    def stats(self) -> dict:
+        segments = self.segments()
+        entries = list(self.index())
+        return {
+            'segments': len(segments),
+            'events': len(entries),
+            'bytes': sum(p.stat().st_size for _, p, _ in segments if p.exists()),
+            'first_id': entries[0][0] if entries else None,
+            'last_id': entries[-1][0] if entries else None,
+            'first_ts': entries[0][1] if entries else None,
+            'last_ts': entries[-1][1] if entries else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Read the event journal')
+    parser.add_argument('directory', type=Path, help='Journal directory (agent/state/events)')
+    parser.add_argument('--from-id', type=int)
+    parser.add_argument('--since', help='ISO timestamp')
+    parser.add_argument('--until', help='ISO timestamp')
+    parser.add_argument('--type', action='append', help='Only this event type (repeatable)')
+    parser.add_argument('--limit', type=int)
+    parser.add_argument('--stats', action='store_true', help='Summary instead of events')
+    args = parser.parse_args()
+
+    reader = EventJournalReader(args.directory)
+    if args.stats:
+        s = reader.stats()
+        span = ''
+        if s['events']:
+            span = (f" | {datetime.fromtimestamp(s['first_ts']):%Y-%m-%d %H:%M} → "
+                    f"{datetime.fromtimestamp(s['last_ts']):%Y-%m-%d %H:%M}")
+        print(f"{s['segments']} segments, {s['events']} events (ids {s['first_id']}–{s['last_id']}), "
+              f"{s['bytes'] / 1024:.0f}KB{span}")
+        return
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    until = datetime.fromisoformat(args.until).timestamp() if args.until else None
+    for n, event in enumerate(reader.read(args.from_id, since, until, args.type)):
+        if args.limit is not None and n >= args.limit:
+            break
+        try:
+            sys.stdout.write(json.dumps(event) + "\n")
+        except BrokenPipeError:
+            break
+
+
+if __name__ == '__main__':
+    main()
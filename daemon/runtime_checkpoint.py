@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Runtime Checkpoint — crash-safe, write-behind persistence of daemon counters.
+
+PokemonGM keeps drought, drift, reward and battle history, trainer
+encounters, the skipped-event summary and session stats in memory only, so
+a restart used to reset all of them and drought/drift logic started cold.
+
+- WriteBehindFile is the write-behind mechanism (also used by
+  PlayerProfileTracker): callers mark it dirty on change, and the file is
+  written after FLUSH_EVERY changes, FLUSH_INTERVAL_SEC after the first
+  unsaved change, or on flush(). Writes go through atomic_write(): a temp file
+  that is fsynced and renamed, so a crash leaves the old or the new file,
+  never a torn one.
+- RuntimeCheckpoint stores {'version', 'saved_at', 'state'} as
+  runtime_checkpoint.json. load() migrates older versions one step at a time
+  through MIGRATIONS ({from_version: fn(state) -> state}). A newer or
+  unreadable checkpoint is set aside (.v<N> / .corrupt) and the daemon
+  starts cold.
+
+Run: python3 daemon/runtime_checkpoint.py <state_dir>    # summary of the checkpoint
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+def atomic_write(path: Path, data: str):
+    """Replace path with data: temp file + fsync + os.replace."""
+    path = Path(path)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class WriteBehindFile:
+    """Coalesces changes into periodic atomic writes of serialize()'s output."""
+
+    FLUSH_EVERY = 10            # Changes coalesced into one write
+    FLUSH_INTERVAL_SEC = 30     # Max age of an unsaved change
+
+    def __init__(self, path: Path, serialize, flush_every: int = None,
+                 flush_interval: float = None):
+        self.path = Path(path)
+        self.serialize = serialize  # () -> str, called at flush time
+        self.flush_every = flush_every or self.FLUSH_EVERY
+        self.flush_interval = flush_interval or self.FLUSH_INTERVAL_SEC
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # One writer at a time (timer vs explicit flush)
+        self._dirty = 0         # Changes since the last flush
+        self._timer = None
+        self.stats = {'updates': 0, 'writes': 0, 'coalesced': 0,
+                      'last_flush_ms': 0.0, 'max_flush_ms': 0.0}
+
+    def mark_dirty(self):
+        """Record a change; write now if FLUSH_EVERY are pending, else arm the timer."""
+        with self._lock:
+            self._dirty += 1
+            self.stats['updates'] += 1
+            due = self._dirty >= self.flush_every
+            if not due and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write now if there are unsaved changes (temp file + fsync + rename)."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                pending = self._dirty
+                self._dirty = 0
+            start = time.perf_counter()
+            try:
+                atomic_write(self.path, self.serialize())
+            except Exception:
+                with self._lock:
+                    self._dirty += pending  # Retry on the next flush
+                return
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            stats = self.stats
+            stats['writes'] += 1
+            stats['coalesced'] += pending - 1
+            stats['last_flush_ms'] = round(elapsed_ms, 2)
+            stats['max_flush_ms'] = round(max(stats['max_flush_ms'], elapsed_ms), 2)
+
+
+class RuntimeCheckpoint:
+    """Versioned checkpoint of runtime state, written through WriteBehindFile."""
+
+    FILE_NAME = 'runtime_checkpoint.json'
+    VERSION = 1
+    # {from_version: fn(state) -> state at from_version + 1}
+    MIGRATIONS = {}
+
+    def __init__(self, state_dir: Path, flush_every: int = None, flush_interval: float = None):
+        self.path = Path(state_dir) / self.FILE_NAME
+        self._state = None      # Latest collected state (replaced, never mutated)
+        self._writer = WriteBehindFile(self.path, self._serialize, flush_every, flush_interval)
+        self.load_ms = 0.0
+        self.migrated_from = None
+
+    @property
+    def stats(self) -> dict:
+        return self._writer.stats
+
+    def _serialize(self) -> str:
+        return json.dumps({
+            'version': self.VERSION,
+            'saved_at': datetime.now().isoformat(),
+            'state': self._state,
+        })
+
+    def load(self, set_aside: bool = True) -> dict:
+        """Checkpointed state migrated to VERSION, or None (missing, unreadable, newer)."""
+        if not self.path.exists():
+            return None
+        start = time.perf_counter()
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            version = data['version']
+            state = data['state']
+        except Exception as e:
+            return self._reject('.corrupt', f"unreadable ({e})", set_aside)
+        if version > self.VERSION:
+            return self._reject(f'.v{version}', f"from a newer version (v{version})", set_aside)
+        if version < self.VERSION:
+            self.migrated_from = version
+        while version < self.VERSION:
+            migrate = self.MIGRATIONS.get(version)
+            if migrate is None:
+                return self._reject(f'.v{version}', f"v{version} has no migration", set_aside)
+            state = migrate(state)
+            version += 1
+        self.load_ms = round((time.perf_counter() - start) * 1000, 2)
+        return state
+
+    def _reject(self, suffix: str, reason: str, set_aside: bool):
+        if not set_aside:
+            print(f"⚠️ Runtime checkpoint {reason}")
+            return None
+        # Keep the file for inspection instead of overwriting it on the next flush
+        aside = self.path.with_name(self.path.name + suffix)
+        try:
+            self.path.rename(aside)
+        except OSError:
+            pass
+        print(f"⚠️ Runtime checkpoint {reason}; starting cold, kept {aside.name}")
+        return None
+
+    def update(self, state: dict):
+        """Record the latest state (a fresh dict the caller won't mutate)."""
+        self._state = state
+        self._writer.mark_dirty()
+
+    def flush(self, state: dict = None):
+        if state is not None:
+            self._state = state
+            self._writer.mark_dirty()
+        self._writer.flush()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().split('\n\n')[-1])
+        sys.exit(1)
+    checkpoint = RuntimeCheckpoint(Path(sys.argv[1]))
+    if not checkpoint.path.exists():
+        print(f"No checkpoint at {checkpoint.path}")
+        return
+    state = checkpoint.load(set_aside=False)
+    if state is None:
+        return
+    with open(checkpoint.path) as f:
+        saved_at = json.load(f).get('saved_at', '?')
+    print(f"Checkpoint v{checkpoint.VERSION} saved {saved_at}, loaded in {checkpoint.load_ms}ms"
+          + (f" (migrated from v{checkpoint.migrated_from})" if checkpoint.migrated_from else ''))
+    for key, value in sorted(state.items()):
+        if isinstance(value, (list, dict)):
+            value = f"{type(value).__name__}[{len(value)}]"
+        print(f"  {key:<30} {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Session Journal — append-only persistence for persistent-mode session history.
+
+session.json used to be rewritten in full (indent=2, every stored prompt)
+after each agent interaction and after every compression pass. Now:
+
+- session.journal.jsonl is append-only. Each interaction or compression is
+  one small record with a sequence number.
+- session.json is a periodic snapshot of the folded state (tmp file + fsync
+  + rename), written every SNAPSHOT_EVERY records and at shutdown. It
+  records the last sequence number it includes, and the journal is
+  truncated after it.
+- Startup loads the snapshot and replays the journal tail in one pass.
+  Records the snapshot already covers are skipped, so a crash between the
+  snapshot rename and the truncate is harmless. A torn last line is ignored.
+- Prompts are not kept in history. Only the response's ACTION line is read
+  back. With keep_prompts they go to a content-addressed BlobStore
+  (state/blobs/, gzip, sha256) and entries hold a prompt_ref.
+
+A legacy session.json (no version) loads as a snapshot at sequence 0.
+
+Run: python3 daemon/session_journal.py <state_dir>    # summary of journal + snapshot
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+SNAPSHOT_VERSION = 2
+
+
+class BlobStore:
+    """Content-addressed, gzip-compressed text blobs: blobs/ab/abcdef....gz"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.gz"
+
+    def put(self, text: str) -> str:
+        data = text.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():  # Same content, same blob
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            with gzip.open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        with gzip.open(self._path(digest), 'rb') as f:
+            return f.read().decode()
+
+
+def empty_state() -> dict:
+    return {'history': [], 'compressed_summaries': [], 'last_badge_count': 0}
+
+
+def apply(state: dict, record: dict):
+    """Fold one journal record into state (shared by live writes and replay)."""
+    op = record.get('op')
+    if op == 'add':
+        state['history'].append(record['entry'])
+    elif op == 'compress':
+        state['history'] = state['history'][record['split']:]
+        state['compressed_summaries'].append(record['summary'])
+    if 'last_badge_count' in record:
+        state['last_badge_count'] = record['last_badge_count']
+
+
+class SessionJournal:
+    """Append-only session journal plus periodic snapshots. Thread-safe."""
+
+    SNAPSHOT_NAME = 'session.json'
+    JOURNAL_NAME = 'session.journal.jsonl'
+    SNAPSHOT_EVERY = 50  # Journal records between snapshots
+
+    def __init__(self, state_dir: Path, keep_prompts: bool = False):
+        self.state_dir = Path(state_dir)
+        self.snapshot_path = self.state_dir / self.SNAPSHOT_NAME
+        self.journal_path = self.state_dir / self.JOURNAL_NAME
+        self.blobs = BlobStore(self.state_dir / 'blobs') if keep_prompts else None
+        self._lock = threading.Lock()
+        self._seq = 0               # Last sequence number written or replayed
+        self._since_snapshot = 0    # Journal records not yet in a snapshot
+        self._file = None
+
+    # ── Load ────────────────────────────────────────────────────────────
+
+    def load(self) -> dict:
+        """
+        Snapshot + journal tail → state dict with history, compressed_summaries,
+        last_badge_count, started_at and 'replayed' (journal records applied).
+        """
+        state = empty_state()
+        snap_seq = 0
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path) as f:
+                snap = json.load(f)
+            state['history'] = snap.get('history', [])
+            state['compressed_summaries'] = snap.get('compressed_summaries', [])
+            state['last_badge_count'] = snap.get('last_badge_count', 0)
+            state['started_at'] = snap.get('started_at')
+            snap_seq = snap.get('seq', 0)
+            if snap.get('version') != SNAPSHOT_VERSION:
+                state['history'] = [self._strip_prompt(e) for e in state['history']]
+
+        replayed = 0
+        self._seq = snap_seq
+        if self.journal_path.exists():
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write from a crash
+                    seq = record.get('seq', 0)
+                    if seq <= snap_seq:
+                        continue  # Already in the snapshot
+                    apply(state, record)
+                    self._seq = max(self._seq, seq)
+                    replayed += 1
+        self._since_snapshot = replayed
+        state['replayed'] = replayed
+        return state
+
+    def _strip_prompt(self, entry: dict) -> dict:
+        """Legacy entries carried the full prompt; move it to a blob or drop it."""
+        prompt = entry.pop('prompt', None)
+        if prompt and self.blobs:
+            entry['prompt_ref'] = self.blobs.put(prompt)
+        return entry
+
+    # ── Write ───────────────────────────────────────────────────────────
+
+    def make_entry(self, timestamp: str, event_type: str, prompt: str, response: str) -> dict:
+        entry = {'timestamp': timestamp, 'event_type': event_type, 'response': response}
+        if self.blobs and prompt:
+            entry['prompt_ref'] = self.blobs.put(prompt)
+        return entry
+
+    def append(self, record: dict, state_fn=None):
+        """
+        Append one record ({'op': 'add' | 'compress' | 'meta', ...}). When SNAPSHOT_EVERY
+        records have accumulated, state_fn() is snapshotted and the journal reset.
+        """
+        with self._lock:
+            self._seq += 1
+            record = {'seq': self._seq, **record}
+            if self._file is None:
+                self.state_dir.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.journal_path, 'a')
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+            self._since_snapshot += 1
+            if state_fn is not None and self._since_snapshot >= self.SNAPSHOT_EVERY:
+                # Under the lock, so no record can land between state and truncate
+                self._write_snapshot(state_fn())
+
+    def snapshot(self, state: dict):
+        """Atomically write state as session.json, then truncate the journal."""
+        with self._lock:
+            self._write_snapshot(state)
+
+    def _write_snapshot(self, state: dict):
+        data = {'version': SNAPSHOT_VERSION, 'seq': self._seq, **state}
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # Records up to seq are in the snapshot; a crash before this
+        # truncate only means they are skipped on replay
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        open(self.journal_path, 'w').close()
+        self._since_snapshot = 0
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> dict:
+        """Sizes for health checks (does not load history)."""
+        journal_records = 0
+        if self.journal_path.exists():
+            with open(self.journal_path) as f:
+                journal_records = sum(1 for _ in f)
+        return {
+            'snapshot_bytes': self.snapshot_path.stat().st_size if self.snapshot_path.exists() else 0,
+            'journal_records': journal_records,
+            'journal_bytes': self.journal_path.stat().st_size if self.journal_path.exists() else 0,
+        }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().split('\n\n')[-1])
+        sys.exit(1)
+    journal = SessionJournal(Path(sys.argv[1]))
+    stats = journal.stats()
+    state = journal.load()
+    print(f"Snapshot: {stats['snapshot_bytes']} bytes | journal: {stats['journal_records']} records, "
+          f"{stats['journal_bytes']} bytes")
+    print(f"History: {len(state['history'])} entries | summaries: {len(state['compressed_summaries'])} | "
+          f"last badge: {state['last_badge_count']} | replayed: {state['replayed']}")
+
+
+if __name__ == '__main__':
+    main()
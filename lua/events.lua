@@ -7,6 +7,14 @@
 console:log("📦 Events.lua VERSION: 2026-02-07-final")
 
 local Events = {}
+local Text = require("text")
+
+-- State module (set by game_master_v2.lua via Events.setState); nil until wired
+local State = nil
+
+function Events.setState(stateModule)
+    State = stateModule
+end
 
 -- ============================================================================
 -- CONFIGURATION
@@ -69,6 +77,19 @@ Events.ADDRS = {
     BAG_BERRIES_OFFSET = 0x0790,    -- bagPocket_Berries
 }
 
+-- Slots per pocket (Items, Key Items, Poke Balls, TMs/HMs, Berries). The
+-- pockets are contiguous from BAG_ITEMS_OFFSET, 4 bytes per slot.
+Events.BAG_POCKET_SLOTS = {30, 30, 16, 64, 46}
+
+-- string.unpack formats for block-read structures (little-endian)
+local FMT_U16 = "<I2"
+local FMT_U32 = "<I4"
+local FMT_PID_OTID = "<I4I4"
+local BAG_SLOTS = 0
+for _, slots in ipairs(Events.BAG_POCKET_SLOTS) do BAG_SLOTS = BAG_SLOTS + slots end
+local FMT_BAG = "<" .. string.rep("I2", BAG_SLOTS * 2)
+local GROWTH_OFFSET = {}  -- Filled in once SUBSTRUCT_ORDERS is defined
+
 -- Battle outcome values
 Events.BATTLE_OUTCOMES = {
     [0] = "none",
@@ -130,11 +151,21 @@ Events.tracked = {
     initialized = false,    -- Suppress events until first init complete
     mapTransitionCooldown = 0,  -- Frames since last map transition
     itemCount = 0,          -- Total items in bag (for pickup detection)
+    
+    -- Text capture
+    recentTexts = nil,      -- Text.newRecentSet: dedup of recently captured messages
+    battleTexts = nil,      -- Text.newRing: messages captured during the current battle
+    lastCaptured = nil,     -- Most recently captured message
 }
 
 -- Debounce config
 Events.BATTLE_END_DEBOUNCE_FRAMES = 30  -- Wait ~0.5 seconds before confirming battle end
 
+-- Text capture limits
+Events.RECENT_TEXT_LIMIT = 50   -- Messages remembered for deduplication (LRU)
+Events.BATTLE_TEXT_LIMIT = 100  -- Messages kept per battle (oldest dropped)
+Events.tracked.recentTexts = Text.newRecentSet(Events.RECENT_TEXT_LIMIT)
+
 -- ============================================================================
 -- ROM DETECTION
 -- ============================================================================
@@ -158,16 +189,144 @@ function Events.detectROM()
     return gameCode
 end
 
+-- ============================================================================
+-- FRAME-SCOPED READ CACHE
+-- ============================================================================
+-- One frame's detectors read the same words many times (save block pointers,
+-- CALLBACK2, party count, battle mons). Between Events.beginFrame() and
+-- Events.endFrame() each address is fetched from the emulator once per frame.
+-- Entries are stamped with the frame id, so nothing is cleared or reallocated
+-- per frame. Outside that window (socket commands, GM tool writes, dialogue
+-- injection) reads go straight to emu, so a write is never masked.
+
+local cacheActive = false
+local frameId = 0
+local values8, values16, values32 = {}, {}, {}
+local stamps8, stamps16, stamps32 = {}, {}, {}
+local frameRequested, frameEmuReads = 0, 0
+
+-- Reads asked for vs reads that reached the emulator, per cached frame
+Events.readStats = {frames = 0, requested = 0, emuReads = 0, lastRequested = 0, lastEmuReads = 0}
+
+function Events.beginFrame()
+    frameId = frameId + 1
+    cacheActive = true
+    frameRequested, frameEmuReads = 0, 0
+end
+
+function Events.endFrame()
+    cacheActive = false
+    local rs = Events.readStats
+    rs.frames = rs.frames + 1
+    rs.requested = rs.requested + frameRequested
+    rs.emuReads = rs.emuReads + frameEmuReads
+    rs.lastRequested, rs.lastEmuReads = frameRequested, frameEmuReads
+end
+
+function Events.read8(addr)
+    if not cacheActive then return emu:read8(addr) end
+    frameRequested = frameRequested + 1
+    if stamps8[addr] == frameId then return values8[addr] end
+    local v = emu:read8(addr)
+    values8[addr], stamps8[addr] = v, frameId
+    frameEmuReads = frameEmuReads + 1
+    return v
+end
+
+function Events.read16(addr)
+    if not cacheActive then return emu:read16(addr) end
+    frameRequested = frameRequested + 1
+    if stamps16[addr] == frameId then return values16[addr] end
+    local v = emu:read16(addr)
+    values16[addr], stamps16[addr] = v, frameId
+    frameEmuReads = frameEmuReads + 1
+    return v
+end
+
+function Events.read32(addr)
+    if not cacheActive then return emu:read32(addr) end
+    frameRequested = frameRequested + 1
+    if stamps32[addr] == frameId then return values32[addr] end
+    local v = emu:read32(addr)
+    values32[addr], stamps32[addr] = v, frameId
+    frameEmuReads = frameEmuReads + 1
+    return v
+end
+
+-- Whole-struct reads: one emu:readRange call where the core has it (mGBA
+-- 0.10+), otherwise one loop into a byte string. Decode with string.unpack.
+local hasReadRange = nil
+
+local function rawReadBlock(addr, len)
+    if hasReadRange == nil then
+        hasReadRange = pcall(function() return emu.readRange ~= nil end) and emu.readRange ~= nil
+    end
+    if hasReadRange then return emu:readRange(addr, len) end
+    local parts, bytes = {}, {}
+    for chunk = 0, len - 1, 1024 do
+        local n = math.min(1024, len - chunk)
+        for i = 1, n do bytes[i] = emu:read8(addr + chunk + i - 1) end
+        parts[#parts + 1] = string.char(table.unpack(bytes, 1, n))
+    end
+    return table.concat(parts)
+end
+
+local blockValues, blockLens, blockStamps = {}, {}, {}
+
+function Events.readBlock(addr, len)
+    if not cacheActive then return rawReadBlock(addr, len) end
+    frameRequested = frameRequested + 1
+    if blockStamps[addr] == frameId and blockLens[addr] >= len then
+        local v = blockValues[addr]
+        return blockLens[addr] == len and v or v:sub(1, len)  -- Prefix of a longer read
+    end
+    local v = rawReadBlock(addr, len)
+    blockValues[addr], blockLens[addr], blockStamps[addr] = v, len, frameId
+    frameEmuReads = frameEmuReads + 1
+    return v
+end
+
+local read8, read16, read32, readBlock = Events.read8, Events.read16, Events.read32, Events.readBlock
+
+-- RAM image for tools/bench_lua_reads.lua: EWRAM (256KB at 0x02000000)
+-- followed by IWRAM (32KB at 0x03000000). From the scripting console:
+--   GMEvents.recordRamImage("/tmp/emerald_ram.bin")
+function Events.recordRamImage(path)
+    local f, err = io.open(path, "wb")
+    if not f then
+        console:log("⚠️ RAM image: " .. tostring(err))
+        return false
+    end
+    f:write(rawReadBlock(0x02000000, 0x40000))
+    f:write(rawReadBlock(0x03000000, 0x8000))
+    f:close()
+    console:log("💾 RAM image written: " .. path)
+    return true
+end
+local unpack = string.unpack
+
+-- Memoize a struct-level getter for the current cached frame (callers must not
+-- mutate the returned table)
+local function frameMemo(getter)
+    local value, stamp = nil, nil
+    return function()
+        if cacheActive and stamp == frameId then return value end
+        value = getter()
+        stamp = cacheActive and frameId or nil
+        return value
+    end
+end
+
 -- ============================================================================
 -- UTILITY FUNCTIONS
 -- ============================================================================
 
 function Events.getSaveBlock1()
-    return emu:read32(Events.ADDRS.SAVE_BLOCK1_PTR)
+    return read32(Events.ADDRS.SAVE_BLOCK1_PTR)
 end
 
 function Events.getSaveBlock2()
-    return emu:read32(Events.ADDRS.SAVE_BLOCK2_PTR)
+    return read32(Events.ADDRS.SAVE_BLOCK2_PTR)
 end
 
 -- ============================================================================
@@ -177,8 +336,8 @@ end
 function Events.getMapKey()
     local sb1 = Events.getSaveBlock1()
     if sb1 == 0 then return "0,0" end
-    local group = emu:read8(sb1 + Events.ADDRS.MAP_GROUP_OFFSET)
-    local num = emu:read8(sb1 + Events.ADDRS.MAP_NUM_OFFSET)
+    local group = read8(sb1 + Events.ADDRS.MAP_GROUP_OFFSET)
+    local num = read8(sb1 + Events.ADDRS.MAP_NUM_OFFSET)
     return group .. "," .. num
 end
 
@@ -186,10 +345,10 @@ function Events.getMapInfo()
     local sb1 = Events.getSaveBlock1()
     if sb1 == 0 then return {group = 0, num = 0, x = 0, y = 0} end
     return {
-        group = emu:read8(sb1 + Events.ADDRS.MAP_GROUP_OFFSET),
-        num = emu:read8(sb1 + Events.ADDRS.MAP_NUM_OFFSET),
-        x = emu:read16(sb1 + Events.ADDRS.PLAYER_X_OFFSET),
-        y = emu:read16(sb1 + Events.ADDRS.PLAYER_Y_OFFSET),
+        group = read8(sb1 + Events.ADDRS.MAP_GROUP_OFFSET),
+        num = read8(sb1 + Events.ADDRS.MAP_NUM_OFFSET),
+        x = read16(sb1 + Events.ADDRS.PLAYER_X_OFFSET),
+        y = read16(sb1 + Events.ADDRS.PLAYER_Y_OFFSET),
     }
 end
 
@@ -198,7 +357,7 @@ Events.detectedBattleCallback = nil
 Events.callbackCheckCounter = 0
 
 function Events.isBattleActive()
-    local callback2 = emu:read32(Events.ADDRS.CALLBACK2)
+    local callback2 = read32(Events.ADDRS.CALLBACK2)
     
     -- If we've detected the callback, use it
     if Events.detectedBattleCallback then
@@ -229,12 +388,12 @@ function Events.isBattleActive()
 end
 
 function Events.isInOverworld()
-    local callback2 = emu:read32(Events.ADDRS.CALLBACK2)
+    local callback2 = read32(Events.ADDRS.CALLBACK2)
     return callback2 == Events.ADDRS.OVERWORLD_CALLBACK
 end
 
 function Events.getBattleInfo()
-    local flags = emu:read32(Events.ADDRS.BATTLE_STRUCT)
+    local flags = read32(Events.ADDRS.BATTLE_STRUCT)
     return {
         is_wild = (flags & 0x04) ~= 0,
         is_trainer = (flags & 0x08) ~= 0,
@@ -245,13 +404,13 @@ function Events.getBattleInfo()
 end
 
 function Events.getBattleOutcome()
-    local outcome = emu:read8(Events.ADDRS.BATTLE_OUTCOME)
+    local outcome = read8(Events.ADDRS.BATTLE_OUTCOME)
     return outcome, Events.BATTLE_OUTCOMES[outcome] or "unknown"
 end
 
 -- Read battle outcome from memory
 function Events.inferBattleOutcome()
-    local outcome = emu:read8(Events.ADDRS.BATTLE_OUTCOME)
+    local outcome = read8(Events.ADDRS.BATTLE_OUTCOME)
     local outcomeName = Events.BATTLE_OUTCOMES[outcome] or "unknown"
     
     -- If outcome is still 0, try to infer from tracked state
@@ -274,7 +433,7 @@ function Events.getBadges()
     if sb1 == 0 then return 0, 0 end
     -- Read u16 and shift right by 7 to align badge 1 to bit 0
     -- Badge flags are 0x867-0x86E, which means badge 1 is bit 7 of the byte
-    local rawFlags = emu:read16(sb1 + Events.ADDRS.BADGE_OFFSET)
+    local rawFlags = read16(sb1 + Events.ADDRS.BADGE_OFFSET)
     local badges = (rawFlags >> 7) & 0xFF  -- Extract 8 badge bits
     local count = 0
     for i = 0, 7 do
@@ -284,36 +443,28 @@ function Events.getBadges()
 end
 
 function Events.getPartyCount()
-    return emu:read8(Events.ADDRS.PARTY_COUNT)
+    return read8(Events.ADDRS.PARTY_COUNT)
 end
 
 -- Quick hash of party for change detection (species + HP)
+-- The party is read as one block; positions passed to string.unpack are 1-based
 function Events.hashParty()
     local hash = 0
     local count = Events.getPartyCount()
     if count > 6 then count = 6 end
+    if count == 0 then return hash end
     
+    local size = Events.ADDRS.POKEMON_SIZE
+    local block = readBlock(Events.ADDRS.PLAYER_PARTY, count * size)
     for slot = 0, count - 1 do
-        local addr = Events.ADDRS.PLAYER_PARTY + (slot * Events.ADDRS.POKEMON_SIZE)
-        local personality = emu:read32(addr)
+        local base = slot * size + 1
+        local personality, otId = unpack(FMT_PID_OTID, block, base)
         if personality ~= 0 then
             -- Include species (from growth substruct) and HP
-            local otId = emu:read32(addr + 4)
             local key = personality ~ otId  -- 32-bit XOR (CORRECT!)
-            local secureAddr = addr + 32
-            
-            -- Get substruct order
-            local order = personality % 24
-            local positions = Events.getSubstructPositions(order)
-            
-            -- Read species from growth substruct
-            local growthAddr = secureAddr + (positions[0] * 12)
-            local word0 = emu:read32(growthAddr) ~ key
+            local word0 = unpack(FMT_U32, block, base + GROWTH_OFFSET[personality % 24]) ~ key
             local species = (word0 & 0xFFFF) - Events.SPECIES_OFFSET
-            
-            -- Read HP
-            local hp = emu:read16(addr + 86)
-            local maxHp = emu:read16(addr + 88)
+            local hp = unpack(FMT_U16, block, base + 86)
             
             -- Add to hash
             hash = hash + (species * (slot + 1) * 1000) + (hp * (slot + 1))
@@ -328,19 +479,16 @@ function Events.getPartySpeciesList()
     local species = {}
     local count = Events.getPartyCount()
     if count > 6 then count = 6 end
+    if count == 0 then return species end
     
+    local size = Events.ADDRS.POKEMON_SIZE
+    local block = readBlock(Events.ADDRS.PLAYER_PARTY, count * size)
     for slot = 0, count - 1 do
-        local addr = Events.ADDRS.PLAYER_PARTY + (slot * Events.ADDRS.POKEMON_SIZE)
-        local personality = emu:read32(addr)
+        local base = slot * size + 1
+        local personality, otId = unpack(FMT_PID_OTID, block, base)
         if personality ~= 0 then
-            local otId = emu:read32(addr + 4)
             local key = personality ~ otId  -- 32-bit XOR
-            local secureAddr = addr + 32
-            
-            local order = personality % 24
-            local positions = Events.getSubstructPositions(order)
-            local growthAddr = secureAddr + (positions[0] * 12)
-            local word0 = emu:read32(growthAddr) ~ key
+            local word0 = unpack(FMT_U32, block, base + GROWTH_OFFSET[personality % 24]) ~ key
             local speciesId = (word0 & 0xFFFF) - Events.SPECIES_OFFSET
             
             if speciesId > 0 and speciesId <= 440 then
@@ -370,16 +518,25 @@ Events.SUBSTRUCT_ORDERS = {
     [22] = {[0]=3,[1]=2,[2]=0,[3]=1}, [23] = {[0]=3,[1]=2,[2]=1,[3]=0},
 }
 
-function Events.getSubstructPositions(order)
-    -- Returns table mapping substruct TYPE to POSITION
-    -- e.g., positions[0] = position of growth substruct
-    local orderTable = Events.SUBSTRUCT_ORDERS[order]
+-- Inverse permutation, precomputed for all 24 orders: type → position
+Events.SUBSTRUCT_POSITIONS = {}
+for order = 0, 23 do
     local positions = {}
     for pos = 0, 3 do
-        local subType = orderTable[pos]
-        positions[subType] = pos
+        positions[Events.SUBSTRUCT_ORDERS[order][pos]] = pos
     end
-    return positions
+    Events.SUBSTRUCT_POSITIONS[order] = positions
+end
+
+-- 1-based offset of the growth substruct within a 100-byte Pokemon, per order
+for order = 0, 23 do
+    GROWTH_OFFSET[order] = 32 + Events.SUBSTRUCT_POSITIONS[order][0] * 12
+end
+
+function Events.getSubstructPositions(order)
+    -- Returns table mapping substruct TYPE to POSITION (shared; don't mutate)
+    -- e.g., positions[0] = position of growth substruct
+    return Events.SUBSTRUCT_POSITIONS[order]
 end
 
 -- Count total items in bag (for pickup detection)
@@ -389,24 +546,14 @@ function Events.countBagItems()
         return Events.tracked.itemCount  -- Return last known good value
     end
     
+    -- All five pockets in one block: {itemId, quantity, itemId, quantity, ...}
+    local words = {unpack(FMT_BAG, readBlock(sb1 + Events.ADDRS.BAG_ITEMS_OFFSET, BAG_SLOTS * 4))}
     local total = 0
-    local pockets = {
-        {offset = Events.ADDRS.BAG_ITEMS_OFFSET, slots = 30},      -- Items
-        {offset = Events.ADDRS.BAG_KEYITEMS_OFFSET, slots = 30},  -- Key Items
-        {offset = Events.ADDRS.BAG_POKEBALLS_OFFSET, slots = 16}, -- Poke Balls
-        {offset = Events.ADDRS.BAG_TMHM_OFFSET, slots = 64},      -- TMs/HMs
-        {offset = Events.ADDRS.BAG_BERRIES_OFFSET, slots = 46},   -- Berries
-    }
-    
-    for _, pocket in ipairs(pockets) do
-        for i = 0, pocket.slots - 1 do
-            local itemAddr = sb1 + pocket.offset + (i * 4)
-            local itemId = emu:read16(itemAddr)
-            local quantity = emu:read16(itemAddr + 2)
-            -- Validate: itemId should be reasonable (< 1000), quantity < 100
-            if itemId > 0 and itemId < 1000 and quantity > 0 and quantity < 100 then
-                total = total + quantity
-            end
+    for i = 1, BAG_SLOTS * 2, 2 do
+        local itemId, quantity = words[i], words[i + 1]
+        -- Validate: itemId should be reasonable (< 1000), quantity < 100
+        if itemId > 0 and itemId < 1000 and quantity > 0 and quantity < 100 then
+            total = total + quantity
         end
     end
     
@@ -429,8 +576,8 @@ function Events.getMoney()
     if sb2 < 0x02000000 or sb2 > 0x02040000 then return nil end
     
     -- Money is encrypted: value XOR key
-    local money = emu:read32(sb1 + 0x0490)
-    local key = emu:read32(sb2 + 0xAC)
+    local money = read32(sb1 + 0x0490)
+    local key = read32(sb2 + 0xAC)
     local decrypted = money ~ key
     
     -- Sanity check: money should be 0-999999 (max in Pokemon)
@@ -522,14 +669,14 @@ function Events.getEnemyPokemon()
     if not Events.isBattleActive() then return nil end
     
     local addr = Events.ADDRS.GBATTLEMONS + Events.ADDRS.BATTLE_MON_SIZE  -- Slot 1 = enemy
-    local rawSpecies = emu:read16(addr)
+    local rawSpecies = read16(addr)
     local species = rawSpecies - Events.SPECIES_OFFSET
     
     if species <= 0 or species > 440 then return nil end
     
-    local hp = emu:read16(addr + 0x28)
-    local level = emu:read8(addr + 0x2A)
-    local maxHp = emu:read16(addr + 0x2C)
+    local hp = read16(addr + 0x28)
+    local level = read8(addr + 0x2A)
+    local maxHp = read16(addr + 0x2C)
     
     if maxHp == 0 or maxHp > 999 or level == 0 or level > 100 then return nil end
     
@@ -539,10 +686,10 @@ function Events.getEnemyPokemon()
         hp = hp,
         maxHp = maxHp,
         hpPercent = math.floor((hp / maxHp) * 100),
-        move1 = emu:read16(addr + 0x0C),
-        move2 = emu:read16(addr + 0x0E),
-        move3 = emu:read16(addr + 0x10),
-        move4 = emu:read16(addr + 0x12),
+        move1 = read16(addr + 0x0C),
+        move2 = read16(addr + 0x0E),
+        move3 = read16(addr + 0x10),
+        move4 = read16(addr + 0x12),
     }
 end
 
@@ -551,15 +698,15 @@ function Events.getPlayerBattleMon()
     if not Events.isBattleActive() then return nil end
     
     local addr = Events.ADDRS.GBATTLEMONS  -- Slot 0 = player
-    local rawSpecies = emu:read16(addr)
+    local rawSpecies = read16(addr)
     local species = rawSpecies - Events.SPECIES_OFFSET
     
     if species <= 0 or species > 440 then return nil end
     
-    local hp = emu:read16(addr + 0x28)
-    local level = emu:read8(addr + 0x2A)
-    local maxHp = emu:read16(addr + 0x2C)
-    local status = emu:read32(addr + 0x4C)  -- Status conditions
+    local hp = read16(addr + 0x28)
+    local level = read8(addr + 0x2A)
+    local maxHp = read16(addr + 0x2C)
+    local status = read32(addr + 0x4C)  -- Status conditions
     
     if maxHp == 0 or maxHp > 999 or level == 0 or level > 100 then return nil end
     
@@ -572,6 +719,10 @@ function Events.getPlayerBattleMon()
     }
 end
 
+-- Called by both the battle and move detectors every frame in battle
+Events.getEnemyPokemon = frameMemo(Events.getEnemyPokemon)
+Events.getPlayerBattleMon = frameMemo(Events.getPlayerBattleMon)
+
 -- Get enemy trainer's full party info (for trainer battles)
 function Events.getEnemyParty()
     if not Events.isBattleActive() then return nil end
@@ -580,19 +731,19 @@ function Events.getEnemyParty()
     if not battleInfo.is_trainer then return nil end
     
     local party = {}
-    local count = emu:read8(Events.ADDRS.ENEMY_PARTY_COUNT)
+    local count = read8(Events.ADDRS.ENEMY_PARTY_COUNT)
     if count == 0 or count > 6 then count = 6 end  -- Fallback
     
     for slot = 0, count - 1 do
         local addr = Events.ADDRS.ENEMY_PARTY + (slot * Events.ADDRS.POKEMON_SIZE)
-        local personality = emu:read32(addr)
+        local personality = read32(addr)
         if personality ~= 0 then
             -- Read basic info from battle mons if available
             local battleAddr = Events.ADDRS.GBATTLEMONS + (Events.ADDRS.BATTLE_MON_SIZE * (slot + 1))
-            local species = emu:read16(battleAddr) - Events.SPECIES_OFFSET
-            local level = emu:read8(battleAddr + 0x2A)
-            local hp = emu:read16(battleAddr + 0x28)
-            local maxHp = emu:read16(battleAddr + 0x2C)
+            local species = read16(battleAddr) - Events.SPECIES_OFFSET
+            local level = read8(battleAddr + 0x2A)
+            local hp = read16(battleAddr + 0x28)
+            local maxHp = read16(battleAddr + 0x2C)
             
             if species > 0 and species < 500 and level > 0 then
                 table.insert(party, {
@@ -614,54 +765,29 @@ end
 -- DIALOGUE
 -- ============================================================================
 
+-- Text buffers are decoded by text.lua. Each poll reads the first
+-- TEXT_PROBE_BYTES; if they're unchanged since the last poll the previous text
+-- and hash are reused, otherwise the string is decoded and hashed in one pass.
+Events.TEXT_PROBE_BYTES = 64
+
+Events.textStats = {}  -- {dialogue = {decodes, skips}, battle = {...}}
+local dialogueReader, battleTextReader
+dialogueReader, Events.textStats.dialogue =
+    Text.newReader(Events.ADDRS.GSTRINGVAR4, 256, Events.TEXT_PROBE_BYTES, readBlock)
+battleTextReader, Events.textStats.battle =
+    Text.newReader(Events.ADDRS.GDISPLAYEDSTRINGBATTLE, 300, Events.TEXT_PROBE_BYTES, readBlock)
+
 function Events.getDialogueHash()
-    local hash = 0
-    for i = 0, 63 do
-        local byte = emu:read8(Events.ADDRS.GSTRINGVAR4 + i)
-        if byte == 0xFF then break end
-        hash = hash + byte * (i + 1)
-    end
+    local _, hash = dialogueReader()
     return hash
 end
 
--- Character decoding table for Gen 3
-local CHAR_MAP = {
-    [0x00] = " ", [0x01] = " ", [0xAB] = "!", [0xAC] = "?", [0xAD] = ".", [0xAE] = "-",
-    [0xB0] = "...", [0xB1] = '"', [0xB2] = '"', [0xB3] = "'", [0xB4] = "'",
-    [0xB5] = "'", [0xB6] = "'", [0xB8] = ",", [0xB9] = "/", [0xBA] = "/",
-    [0xBB] = "A", [0xBC] = "B", [0xBD] = "C", [0xBE] = "D", [0xBF] = "E",
-    [0xC0] = "F", [0xC1] = "G", [0xC2] = "H", [0xC3] = "I", [0xC4] = "J",
-    [0xC5] = "K", [0xC6] = "L", [0xC7] = "M", [0xC8] = "N", [0xC9] = "O",
-    [0xCA] = "P", [0xCB] = "Q", [0xCC] = "R", [0xCD] = "S", [0xCE] = "T",
-    [0xCF] = "U", [0xD0] = "V", [0xD1] = "W", [0xD2] = "X", [0xD3] = "Y",
-    [0xD4] = "Z", [0xD5] = "a", [0xD6] = "b", [0xD7] = "c", [0xD8] = "d",
-    [0xD9] = "e", [0xDA] = "f", [0xDB] = "g", [0xDC] = "h", [0xDD] = "i",
-    [0xDE] = "j", [0xDF] = "k", [0xE0] = "l", [0xE1] = "m", [0xE2] = "n",
-    [0xE3] = "o", [0xE4] = "p", [0xE5] = "q", [0xE6] = "r", [0xE7] = "s",
-    [0xE8] = "t", [0xE9] = "u", [0xEA] = "v", [0xEB] = "w", [0xEC] = "x",
-    [0xED] = "y", [0xEE] = "z", [0xA1] = "0", [0xA2] = "1", [0xA3] = "2",
-    [0xA4] = "3", [0xA5] = "4", [0xA6] = "5", [0xA7] = "6", [0xA8] = "7",
-    [0xA9] = "8", [0xAA] = "9", [0xFE] = "\n", [0xFA] = " ", [0xFB] = " ",
-}
-
 function Events.getDialogueText()
-    local text = ""
-    for i = 0, 255 do
-        local byte = emu:read8(Events.ADDRS.GSTRINGVAR4 + i)
-        if byte == 0xFF then break end
-        text = text .. (CHAR_MAP[byte] or "")
-    end
-    return text
+    return (dialogueReader())
 end
 
 function Events.getBattleText()
-    local text = ""
-    for i = 0, 299 do
-        local byte = emu:read8(Events.ADDRS.GDISPLAYEDSTRINGBATTLE + i)
-        if byte == 0xFF then break end
-        text = text .. (CHAR_MAP[byte] or "")
-    end
-    return text
+    return (battleTextReader())
 end
 
 -- ============================================================================
@@ -695,11 +821,13 @@ function Events.emit(eventType, data)
 end
 
 -- ============================================================================
--- MAIN FRAME HANDLER (Push-based detection)
+-- DETECTORS
 -- ============================================================================
+-- Each detector is one step of change detection, run by the scheduler below.
+-- `frames` is how many frames have passed since that detector last ran.
 
-function Events.checkFrame()
-    -- 1. MAP TRANSITIONS
+-- Map transitions
+local function detectMap(frames)
     local currentMap = Events.getMapKey()
     if currentMap ~= Events.tracked.mapKey then
         local oldMap = Events.tracked.mapKey
@@ -724,13 +852,16 @@ function Events.checkFrame()
         Events.startExplorationBuffer()
     end
     
-    -- Decrement cooldown
+    -- Decrement cooldown by the frames since this detector last ran
     if Events.tracked.mapTransitionCooldown > 0 then
-        Events.tracked.mapTransitionCooldown = Events.tracked.mapTransitionCooldown - 1
+        Events.tracked.mapTransitionCooldown = math.max(0, Events.tracked.mapTransitionCooldown - frames)
     end
-    
-    -- 2. BATTLE STATE - use callback-based detection with hard locking
-    local callback2 = emu:read32(Events.ADDRS.CALLBACK2)
+end
+
+-- Battle start/end, enemy HP and catches
+local function detectBattle(_frames)
+    -- Callback-based detection with hard locking
+    local callback2 = read32(Events.ADDRS.CALLBACK2)
     -- Battle callbacks: wild, trainer, double - check if in battle range
     local isBattleCallback = (callback2 >= 134458305 and callback2 <= 134461233)
     local isOverworldCallback = (callback2 == Events.ADDRS.OVERWORLD_CALLBACK)
@@ -772,11 +903,9 @@ function Events.checkFrame()
         Events.tracked.battleEndEmitted = false  -- Prevent double emit
         
         -- Reset text capture for this battle
-        Events.tracked.battleTexts = {}
-        Events.tracked.textSeen = {}
-        Events.tracked.currentBattleMsg = ""
-        -- Start counting from current recentText length (only capture battle-specific texts)
-        Events.tracked.lastBattleTextCount = #(Events.tracked.recentText or {})
+        Events.tracked.battleTexts = Text.newRing(Events.BATTLE_TEXT_LIMIT)
+        Events.tracked.recentTexts:clear()
+        Events.tracked.lastCaptured = nil
         
         -- Initialize HP tracking
         local playerMon = Events.getPlayerBattleMon()
@@ -816,7 +945,7 @@ function Events.checkFrame()
             Events.tracked.battleEndEmitted = true  -- Prevent double emit
             
             -- Summary of captured battle texts
-            local battleTexts = Events.tracked.battleTexts or {}
+            local battleTexts = Events.tracked.battleTexts and Events.tracked.battleTexts:toArray() or {}
             console:log("📜 Battle ended: " .. #battleTexts .. " messages captured")
             Events.emit("battle_end", {
                 outcome = outcome,
@@ -848,8 +977,10 @@ function Events.checkFrame()
             -- Catch detected
         end
     end
-    
-    -- 3. BADGES
+end
+
+-- Badges
+local function detectBadges(frames)
     -- Root cause: save block pointer shifts during battles AND PC/box access, causing
     -- the badge offset to read garbage bits. Fix: track badge COUNT (not raw bitmask),
     -- require count to strictly increase, and hold for 60 frames (~1s) before firing.
@@ -870,7 +1001,7 @@ function Events.checkFrame()
         elseif badgeCount > (Events.tracked.badgeCount or 0) then
             -- Debounce: new count must hold for 60 consecutive frames (~1 second)
             if Events.tracked.badgePendingCount == badgeCount then
-                Events.tracked.badgePendingFrames = (Events.tracked.badgePendingFrames or 0) + 1
+                Events.tracked.badgePendingFrames = (Events.tracked.badgePendingFrames or 0) + frames
             else
                 Events.tracked.badgePendingCount = badgeCount
                 Events.tracked.badgePendingFrames = 1
@@ -903,8 +1034,11 @@ function Events.checkFrame()
         end
     end
     -- If sb1 == 0, skip badge processing entirely this frame
-    
-    -- 4. PARTY CHANGES (including catch detection)
+end
+
+-- Party changes
+local function detectParty(_frames)
+    -- Including catch detection
     local partyHash = Events.hashParty()
     local partyCount = Events.getPartyCount()
     
@@ -941,16 +1075,36 @@ function Events.checkFrame()
         Events.tracked.partyCount = newCount
         Events.tracked.partySpecies = currentSpecies
     end
-    
-    -- 5. TEXT CAPTURE (every frame) - aggressive capture with deduplication
+end
+
+-- Dialogue and battle text capture
+-- Record a newly seen message exactly once. Skipped if it's in the recent set
+-- or is a partial (proper prefix) of a recent message; if it extends the
+-- message captured just before it (the partial arrived first), it replaces it.
+-- In battle, captured messages also go to the battle's ring buffer.
+local function captureText(text)
+    local recent = Events.tracked.recentTexts
+    if recent:contains(text) or recent:isPartial(text) then return end
+    local battleTexts = Events.tracked.inBattle and Events.tracked.battleTexts
+    local last = Events.tracked.lastCaptured
+    if last and #text > #last and string.sub(text, 1, #last) == last then
+        recent:remove(last)
+        if battleTexts and battleTexts:last() == last then
+            battleTexts:replaceLast(text)
+            battleTexts = nil
+        end
+    end
+    recent:add(text)
+    if battleTexts then battleTexts:push(text) end
+    Events.tracked.lastCaptured = text
+end
+
+local function detectText(_frames)
+    -- Aggressive capture with deduplication
     if true then
-        if not Events.tracked.recentText then Events.tracked.recentText = {} end
-        if not Events.tracked.textSeen then Events.tracked.textSeen = {} end
-        if not Events.tracked.battleTextBuffer then Events.tracked.battleTextBuffer = "" end
-        
         -- Check gStringVar4 (general text) - this is our primary source
         local text1 = Events.getDialogueText()
-        if text1 and #text1 > 3 then
+        if text1 and #text1 > 3 and text1 ~= Events.tracked.lastText1 then
             -- Skip HP display text (e.g., "30/30", "42/47")
             local isHpText = text1:match("^%d+/%d+$")
             -- Skip menu items
@@ -958,19 +1112,8 @@ function Events.checkFrame()
                                text1 == "Choose a POKMON." or text1:match("^Do what with")
             
             if not isHpText and not isMenuItem then
-                -- Only log if truly new (not seen in last 20 messages)
-                local dominated = false
-                for _, seen in ipairs(Events.tracked.recentText) do
-                    if seen == text1 or string.find(seen, text1, 1, true) then
-                        dominated = true
-                        break
-                    end
-                end
-                if not dominated and text1 ~= Events.tracked.lastText1 then
-                    Events.tracked.lastText1 = text1
-                    table.insert(Events.tracked.recentText, text1)
-                    Events.tracked.textSeen[text1] = true
-                end
+                Events.tracked.lastText1 = text1
+                captureText(text1)
             end
         end
         
@@ -978,46 +1121,16 @@ function Events.checkFrame()
         if Events.tracked.inBattle then
             local text2 = Events.getBattleText()
             
-            if text2 and #text2 > 10 then
-                local prevText = Events.tracked.lastBattleBuffer or ""
-                
-                -- Only capture if NEW and not seen before
-                if text2 ~= prevText and not Events.tracked.textSeen[text2] then
-                    -- Minimal filtering: skip incomplete partials
-                    local isPartial = text2:match("'$") or text2:match("^What will$")
-                    
-                    if not isPartial then
-                        table.insert(Events.tracked.recentText, text2)
-                        if Events.tracked.battleTexts then
-                            table.insert(Events.tracked.battleTexts, text2)
-                        end
-                        Events.tracked.textSeen[text2] = true
-                    end
+            if text2 and #text2 > 10 and text2 ~= Events.tracked.lastBattleBuffer then
+                -- Minimal filtering: skip incomplete partials
+                local isPartial = text2:match("'$") or text2:match("^What will$")
+                if not isPartial then
+                    captureText(text2)
                 end
                 Events.tracked.lastBattleBuffer = text2
             end
         end
         
-        -- Keep buffer limited and clear old "seen" entries
-        while #Events.tracked.recentText > 50 do
-            local removed = table.remove(Events.tracked.recentText, 1)
-            Events.tracked.textSeen[removed] = nil
-        end
-        
-        -- During battle, also track battle-specific texts
-        if Events.tracked.inBattle then
-            if not Events.tracked.battleTexts then Events.tracked.battleTexts = {} end
-            -- Copy only texts added AFTER battle started
-            local recentCount = #Events.tracked.recentText
-            local lastCount = Events.tracked.lastBattleTextCount or recentCount
-            if recentCount > lastCount then
-                for i = lastCount + 1, recentCount do
-                    table.insert(Events.tracked.battleTexts, Events.tracked.recentText[i])
-                end
-                Events.tracked.lastBattleTextCount = recentCount
-            end
-        end
-        
         -- Outside battle: check overworld dialogue
         local dialogueHash = Events.getDialogueHash()
         if dialogueHash ~= Events.tracked.dialogueHash and dialogueHash > 0 then
@@ -1047,29 +1160,155 @@ function Events.checkFrame()
             })
         end
     end
-    
-    -- 6. MOVE USAGE (every frame during battle)
+end
+
+-- Move usage (during battle)
+local function detectMoves(_frames)
     if Events.tracked.inBattle then
         Events.trackMoveUsage()
     else
         Events.tracked.lastMoveSlot = -1  -- Reset on battle end
     end
-    
-    -- 7. ITEM PICKUP (check every 30 frames to reduce overhead)
-    if Events._frameCount and Events._frameCount % 30 == 0 then
-        local currentItems = Events.countBagItems()
-        if currentItems > Events.tracked.itemCount and Events.tracked.initialized then
-            local gained = currentItems - Events.tracked.itemCount
-            -- Buffer item gains instead of emitting
-            if Events.tracked.explorationBuffer.startMap then
-                Events.tracked.explorationBuffer.itemsGained = 
-                    Events.tracked.explorationBuffer.itemsGained + gained
+end
+
+-- Item pickup
+local function detectItems(_frames)
+    local currentItems = Events.countBagItems()
+    if currentItems > Events.tracked.itemCount and Events.tracked.initialized then
+        local gained = currentItems - Events.tracked.itemCount
+        -- Buffer item gains instead of emitting
+        if Events.tracked.explorationBuffer.startMap then
+            Events.tracked.explorationBuffer.itemsGained = 
+                Events.tracked.explorationBuffer.itemsGained + gained
+        end
+    end
+    Events.tracked.itemCount = currentItems
+end
+
+-- ============================================================================
+-- DETECTOR SCHEDULER (frame-budgeted, staggered)
+-- ============================================================================
+-- Running every detector every frame cost a party decrypt and ~256 byte reads
+-- per frame at 60fps. Each detector now declares a period (frames between
+-- runs), a phase (offset, so detectors sharing a period land on different
+-- frames) and a priority (1 = highest). Due detectors run in priority order;
+-- once FRAME_BUDGET_MS of detector work has been spent in a frame, the rest
+-- are deferred to the next frame, at most MAX_DEFER_FRAMES in a row.
+-- Priority 1 detectors are never deferred.
+--
+-- Detection latency at 60fps (worst case adds MAX_DEFER_FRAMES of deferral):
+--   battle   every frame      callback must also be stable 30 frames (~0.5s)
+--   moves    every frame      HP drops are diffed, so nothing is lost
+--   text     every 2 frames   ~33ms; messages stay in the buffers far longer
+--   map      every 4 frames   ~67ms
+--   party    every 10 frames  ~167ms
+--   badges   every 30 frames  ~0.5s, plus the 60-frame hold (~1.5s total)
+--   items    every 30 frames  ~0.5s (unchanged)
+
+Events.FRAME_BUDGET_MS = 1.5
+Events.MAX_DEFER_FRAMES = 10
+Events.SCHEDULER_REPORT_FRAMES = 18000  -- Log a cost summary every 5 minutes (0 = never)
+
+Events.detectors = {
+    {name = "battle", fn = detectBattle, period = 1,  phase = 0,  priority = 1},
+    {name = "moves",  fn = detectMoves,  period = 1,  phase = 0,  priority = 1},
+    {name = "text",   fn = detectText,   period = 2,  phase = 1,  priority = 2},
+    {name = "map",    fn = detectMap,    period = 4,  phase = 0,  priority = 2},
+    {name = "party",  fn = detectParty,  period = 10, phase = 3,  priority = 3},
+    {name = "badges", fn = detectBadges, period = 30, phase = 7,  priority = 4},
+    {name = "items",  fn = detectItems,  period = 30, phase = 22, priority = 5},
+}
+
+Events.schedulerStats = {frames = 0, overBudget = 0, maxFrameMs = 0}
+
+function Events.resetScheduler()
+    local frame = Events._frameCount or 0
+    -- Stable sort by priority: declaration order breaks ties
+    for i, d in ipairs(Events.detectors) do d.order = i end
+    table.sort(Events.detectors, function(a, b)
+        if a.priority ~= b.priority then return a.priority < b.priority end
+        return a.order < b.order
+    end)
+    for _, d in ipairs(Events.detectors) do
+        d.nextFrame = frame + ((d.phase - frame) % d.period)  -- First on-phase frame
+        d.lastRun = frame - 1
+        d.deferredFor = 0
+        d.stats = {runs = 0, deferred = 0, totalMs = 0, maxMs = 0}
+    end
+    Events.schedulerStats = {frames = 0, overBudget = 0, maxFrameMs = 0}
+end
+
+function Events.checkFrame()
+    local frame = Events._frameCount or 0
+    if not Events.detectors[1].nextFrame then Events.resetScheduler() end
+    
+    local budget = Events.FRAME_BUDGET_MS / 1000
+    local frameStart = os.clock()
+    local spent = 0
+    for _, d in ipairs(Events.detectors) do
+        if frame >= d.nextFrame then
+            if spent >= budget and d.priority > 1 and d.deferredFor < Events.MAX_DEFER_FRAMES then
+                d.deferredFor = d.deferredFor + 1
+                d.stats.deferred = d.stats.deferred + 1
+            else
+                local t0 = os.clock()
+                d.fn(frame - d.lastRun)
+                local t1 = os.clock()
+                local ms = (t1 - t0) * 1000
+                local st = d.stats
+                st.runs = st.runs + 1
+                st.totalMs = st.totalMs + ms
+                if ms > st.maxMs then st.maxMs = ms end
+                d.lastRun = frame
+                d.deferredFor = 0
+                -- Keep the phase: the next run is the next on-schedule frame
+                d.nextFrame = frame + d.period - ((frame - d.phase) % d.period)
+                spent = t1 - frameStart
             end
         end
-        Events.tracked.itemCount = currentItems
     end
     
-    Events._frameCount = (Events._frameCount or 0) + 1
+    local sched = Events.schedulerStats
+    sched.frames = sched.frames + 1
+    if spent >= budget then sched.overBudget = sched.overBudget + 1 end
+    if spent * 1000 > sched.maxFrameMs then sched.maxFrameMs = spent * 1000 end
+    if Events.SCHEDULER_REPORT_FRAMES > 0 and sched.frames % Events.SCHEDULER_REPORT_FRAMES == 0 then
+        Events.logSchedulerStats()
+    end
+    
+    Events._frameCount = frame + 1
+end
+
+-- Per-detector cost: {name = {runs, deferred, avgMs, maxMs, period}}, plus frame totals
+function Events.getSchedulerStats()
+    local out = {}
+    for _, d in ipairs(Events.detectors) do
+        local st = d.stats or {runs = 0, deferred = 0, totalMs = 0, maxMs = 0}
+        out[d.name] = {
+            runs = st.runs,
+            deferred = st.deferred,
+            avgMs = st.runs > 0 and st.totalMs / st.runs or 0,
+            maxMs = st.maxMs,
+            period = d.period,
+        }
+    end
+    return out, Events.schedulerStats
+end
+
+function Events.logSchedulerStats()
+    local perDetector, sched = Events.getSchedulerStats()
+    console:log(string.format("⏱ Detectors: %d frames, %d over %.1fms budget, max %.2fms",
+        sched.frames, sched.overBudget, Events.FRAME_BUDGET_MS, sched.maxFrameMs))
+    local rs = Events.readStats
+    if rs.frames > 0 then
+        console:log(string.format("   reads/frame: %.1f requested, %.1f from emu",
+            rs.requested / rs.frames, rs.emuReads / rs.frames))
+    end
+    for _, d in ipairs(Events.detectors) do
+        local st = perDetector[d.name]
+        console:log(string.format("   %-6s /%-2d %.3fms avg, %.2fms max, %d runs, %d deferred",
+            d.name, d.period, st.avgMs, st.maxMs, st.runs, st.deferred))
+    end
 end
 
 -- ============================================================================
@@ -1093,6 +1332,7 @@ function Events.init()
     Events.tracked.itemCount = Events.countBagItems()
     
     Events.tracked.initialized = true
+    Events.resetScheduler()
     
     -- Initialize exploration buffer
     Events.startExplorationBuffer()
@@ -1119,17 +1359,17 @@ Events.tracked.lastEnemyHP = 0
 
 function Events.getPlayerMoveSlot()
     -- Returns 0-3 for which move slot the player selected
-    return emu:read8(Events.ADDRS.CHOSEN_MOVE_POSITIONS)
+    return read8(Events.ADDRS.CHOSEN_MOVE_POSITIONS)
 end
 
 function Events.getPlayerMoves()
     -- Read player's current Pokemon moves from gBattleMons slot 0
     local addr = Events.ADDRS.GBATTLEMONS  -- Player's Pokemon
     return {
-        emu:read16(addr + 0x0C),  -- Move 1
-        emu:read16(addr + 0x0E),  -- Move 2
-        emu:read16(addr + 0x10),  -- Move 3
-        emu:read16(addr + 0x12),  -- Move 4
+        read16(addr + 0x0C),  -- Move 1
+        read16(addr + 0x0E),  -- Move 2
+        read16(addr + 0x10),  -- Move 3
+        read16(addr + 0x12),  -- Move 4
     }
 end
 
@@ -13,7 +13,7 @@ local scriptPath = debug.getinfo(1, "S").source:sub(2):match("(.*/)")
 package.path = package.path .. ";" .. scriptPath .. "?.lua"
 
 -- Load modules
-local Events, State, Tools
+local Events, State, Tools, Json
 
 local function loadModule(name, path)
     local ok, mod = pcall(function()
@@ -31,63 +31,18 @@ end
 Events = loadModule("Events", "events.lua")
 State = loadModule("State", "state.lua")
 Tools = loadModule("Tools", "gm_tools.lua")
+Json = loadModule("Json", "gm_json.lua")
 
 if Events and State then
     State.setEvents(Events)
+    Events.setState(State)  -- Exploration buffer snapshots party levels via State.getParty
 end
 
 -- ============================================================================
--- JSON SERIALIZATION (mGBA has no json library)
+-- JSON SERIALIZATION (gm_json.lua; mGBA has no json library)
 -- ============================================================================
 
-local function escapeJson(s)
-    if type(s) ~= "string" then return tostring(s) end
-    s = s:gsub('\\', '\\\\')
-    s = s:gsub('"', '\\"')
-    s = s:gsub('\n', '\\n')
-    s = s:gsub('\r', '\\r')
-    s = s:gsub('\t', '\\t')
-    return s
-end
-
-local function toJson(val)
-    if val == nil then return "null" end
-    local t = type(val)
-    if t == "boolean" then return val and "true" or "false" end
-    if t == "number" then return tostring(val) end
-    if t == "string" then return '"' .. escapeJson(val) .. '"' end
-    if t == "table" then
-        -- Check if array or object
-        local isArray = true
-        local maxn = 0
-        local count = 0
-        for k, _ in pairs(val) do
-            count = count + 1
-            if type(k) == "number" then
-                maxn = math.max(maxn, k)
-            else
-                isArray = false
-            end
-        end
-        if count == 0 then return "{}" end
-        if isArray and maxn == count then
-            -- Array
-            local parts = {}
-            for i = 1, count do
-                table.insert(parts, toJson(val[i]))
-            end
-            return "[" .. table.concat(parts, ",") .. "]"
-        else
-            -- Object
-            local parts = {}
-            for k, v in pairs(val) do
-                table.insert(parts, '"' .. escapeJson(tostring(k)) .. '":' .. toJson(v))
-            end
-            return "{" .. table.concat(parts, ",") .. "}"
-        end
-    end
-    return '"' .. tostring(val) .. '"'
-end
+local toJson = Json.encode
 
 -- ============================================================================
 -- SOCKET SERVER
@@ -114,7 +69,7 @@ local function broadcast(eventType, eventData)
         end
     end
     
-    local json = toJson(message) .. "\n"
+    local json = toJson(message, "object") .. "\n"
     
     for id, client in pairs(clients) do
         local ok, err = pcall(function()
@@ -301,9 +256,11 @@ end
 -- ============================================================================
 
 callbacks:add("frame", function()
-    -- Check for events (push-based)
+    -- Check for events (push-based), reading memory through the per-frame cache
     if Events then
+        Events.beginFrame()
         Events.checkFrame()
+        Events.endFrame()  -- Injection below writes memory, so read uncached from here on
     end
     
     -- Continuous dialogue injection while queue has items
@@ -328,6 +285,10 @@ if Tools then
     console:log("✅ GM Tools available globally")
 end
 
+-- Diagnostics from the scripting console (benchmarks, RAM image, detector stats)
+_G["GMEvents"] = Events
+_G["GMState"] = State
+
 -- ============================================================================
 -- INITIALIZATION
 -- ============================================================================
@@ -0,0 +1,144 @@
+-- ============================================================================
+-- Pokemon Emerald GM - JSON Encoder (mGBA has no json library)
+-- ============================================================================
+-- Encodes into one shared output buffer: pieces are appended and joined with
+-- a single table.concat, so nested values build no intermediate tables or
+-- strings. Strings with nothing to escape (one string.find) are copied as-is;
+-- the rest are escaped in a single gsub pass.
+--
+-- Json.HINTS names the shape of known keys, so those tables skip array
+-- detection (a pairs() walk) entirely:
+--   "array"   - sequence          "objects" - sequence of objects
+--   "object"  - key/value table
+-- Empty hinted arrays encode as []; unhinted empty tables stay {}.
+
+local Json = {}
+
+Json.HINTS = {
+    -- State.getFullState
+    party = "objects",
+    bag_items = "objects",
+    moves = "array",
+    pp = "array",
+    evs = "object",
+    ivs = "object",
+    play_time = "object",
+    battle_info = "object",
+    enemy_pokemon = "object",
+    -- Event payloads (events.lua)
+    battleInfo = "object",
+    enemy = "object",
+    enemyParty = "objects",
+    mapInfo = "object",
+    battleLog = "objects",
+    battleDialogue = "array",
+    dialogueTexts = "array",
+    levelUps = "objects",
+    species = "array",  -- party_changed (in party entries species is a number)
+}
+
+-- Every character that must be escaped: quote, backslash and all controls
+local ESCAPES = {['"'] = '\\"', ['\\'] = '\\\\', ['\n'] = '\\n', ['\r'] = '\\r', ['\t'] = '\\t'}
+for byte = 0, 31 do
+    local c = string.char(byte)
+    ESCAPES[c] = ESCAPES[c] or string.format("\\u%04x", byte)
+end
+ESCAPES["\127"] = "\\u007f"
+local NEEDS_ESCAPE = '[%c"\\]'
+
+function Json.escape(s)
+    if type(s) ~= "string" then return tostring(s) end
+    if not string.find(s, NEEDS_ESCAPE) then return s end
+    return (string.gsub(s, NEEDS_ESCAPE, ESCAPES))
+end
+local escape = Json.escape
+
+local buffer, length = {}, 0
+local HINTS = Json.HINTS
+
+local function put(s)
+    length = length + 1
+    buffer[length] = s
+end
+
+local encodeValue
+
+local function encodeArray(val, n, elementHint)
+    if n == 0 then
+        put("[]")
+        return
+    end
+    put("[")
+    for i = 1, n do
+        if i > 1 then put(",") end
+        encodeValue(val[i], elementHint)
+    end
+    put("]")
+end
+
+local function encodeObject(val)
+    local first = true
+    put("{")
+    for k, v in pairs(val) do
+        if first then first = false else put(",") end
+        put('"')
+        put(escape(type(k) == "string" and k or tostring(k)))
+        put('":')
+        encodeValue(v, HINTS[k])
+    end
+    put("}")
+end
+
+encodeValue = function(val, hint)
+    local t = type(val)
+    if t == "string" then
+        put('"')
+        put(escape(val))
+        put('"')
+    elseif t == "number" then
+        put(tostring(val))
+    elseif t == "boolean" then
+        put(val and "true" or "false")
+    elseif t == "table" then
+        if hint == "object" then
+            encodeObject(val)
+        elseif hint == "array" then
+            encodeArray(val, #val)
+        elseif hint == "objects" then
+            encodeArray(val, #val, "object")
+        else
+            -- Unhinted: an array if the keys are exactly 1..n
+            local count, maxn, isArray = 0, 0, true
+            for k in pairs(val) do
+                count = count + 1
+                if type(k) == "number" then
+                    if k > maxn then maxn = k end
+                else
+                    isArray = false
+                end
+            end
+            if count == 0 then
+                put("{}")
+            elseif isArray and maxn == count then
+                encodeArray(val, count)
+            else
+                encodeObject(val)
+            end
+        end
+    elseif val == nil then
+        put("null")
+    else
+        put('"')
+        put(tostring(val))
+        put('"')
+    end
+end
+
+-- Encode val (hint: shape of the top-level value, if known)
+function Json.encode(val, hint)
+    length = 0
+    encodeValue(val, hint)
+    return table.concat(buffer, "", 1, length)
+end
+
+return Json
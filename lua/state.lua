@@ -4,6 +4,7 @@
 -- ============================================================================
 
 local State = {}
+local Text = require("text")  -- Gen 3 string decoding (shared with events.lua)
 
 -- ============================================================================
 -- ADDRESSES (Pokemon Emerald US / Decomp)
@@ -24,31 +25,9 @@ local DIALOGUE_BUFFER = 0x02021FC4
 local SPECIES_OFFSET = 0  -- Don't subtract, send raw internal ID
 local POKEMON_SIZE = 100
 local BATTLE_MON_SIZE = 88
-
--- ============================================================================
--- CHARACTER ENCODING
--- ============================================================================
-
-local CHAR_DECODE = {
-    [0x00] = " ",
-    [0xBB] = "A", [0xBC] = "B", [0xBD] = "C", [0xBE] = "D", [0xBF] = "E",
-    [0xC0] = "F", [0xC1] = "G", [0xC2] = "H", [0xC3] = "I", [0xC4] = "J",
-    [0xC5] = "K", [0xC6] = "L", [0xC7] = "M", [0xC8] = "N", [0xC9] = "O",
-    [0xCA] = "P", [0xCB] = "Q", [0xCC] = "R", [0xCD] = "S", [0xCE] = "T",
-    [0xCF] = "U", [0xD0] = "V", [0xD1] = "W", [0xD2] = "X", [0xD3] = "Y",
-    [0xD4] = "Z",
-    [0xD5] = "a", [0xD6] = "b", [0xD7] = "c", [0xD8] = "d", [0xD9] = "e",
-    [0xDA] = "f", [0xDB] = "g", [0xDC] = "h", [0xDD] = "i", [0xDE] = "j",
-    [0xDF] = "k", [0xE0] = "l", [0xE1] = "m", [0xE2] = "n", [0xE3] = "o",
-    [0xE4] = "p", [0xE5] = "q", [0xE6] = "r", [0xE7] = "s", [0xE8] = "t",
-    [0xE9] = "u", [0xEA] = "v", [0xEB] = "w", [0xEC] = "x", [0xED] = "y",
-    [0xEE] = "z",
-    [0xA1] = "0", [0xA2] = "1", [0xA3] = "2", [0xA4] = "3", [0xA5] = "4",
-    [0xA6] = "5", [0xA7] = "6", [0xA8] = "7", [0xA9] = "8", [0xAA] = "9",
-    [0xAB] = "!", [0xAC] = "?", [0xAD] = ".", [0xAE] = "-", [0xB8] = ",",
-    [0xF0] = ":", [0x5C] = "(", [0x5D] = ")", [0xBA] = "/", [0xB3] = "'",
-    [0xFE] = "\n", [0xFA] = " ", [0xFB] = " ",
-}
+local BAG_ITEMS_OFFSET = 0x0560  -- From saveBlock1
+local BAG_ITEM_SLOTS = 30
+local FMT_BAG_ITEMS = "<" .. string.rep("I2", BAG_ITEM_SLOTS * 2)  -- {itemId, quantity} per slot
 
 -- Substruct order lookup (0-indexed keys, 1-indexed values)
 -- Correct substruct order table from pokeemerald
@@ -63,27 +42,54 @@ local SUBSTRUCT_ORDER = {
     [20] = {4,2,1,3}, [21] = {4,2,3,1}, [22] = {4,3,1,2}, [23] = {4,3,2,1}
 }
 
+-- Inverse permutation for all 24 orders: SUBSTRUCT_OFFSET[order][type] is the
+-- byte offset of that substruct within the 48-byte encrypted block
+local SUBSTRUCT_OFFSET = {}
+for order = 0, 23 do
+    local offsets = {}
+    for pos = 1, 4 do
+        offsets[SUBSTRUCT_ORDER[order][pos]] = (pos - 1) * 12
+    end
+    SUBSTRUCT_OFFSET[order] = offsets
+end
+
 -- ============================================================================
 -- BASIC READERS
 -- ============================================================================
 
+-- Memory reads go through the Events per-frame read cache once State.setEvents
+-- has wired it (calls from frame detectors share it; socket calls read direct)
+local read8 = function(addr) return emu:read8(addr) end
+local read16 = function(addr) return emu:read16(addr) end
+local read32 = function(addr) return emu:read32(addr) end
+
+-- Whole-struct reads: emu:readRange where the core has it, else one loop into
+-- a byte string. Decoded with string.unpack (positions are 1-based).
+local readBlock = function(addr, len)
+    local ok, hasRange = pcall(function() return emu.readRange ~= nil end)
+    if ok and hasRange then return emu:readRange(addr, len) end
+    local bytes = {}
+    for i = 1, len do bytes[i] = string.char(emu:read8(addr + i - 1)) end
+    return table.concat(bytes)
+end
+local unpack = string.unpack
+
+-- Precomputed string.unpack formats (little-endian)
+local FMT_PID_OTID = "<I4I4"
+local FMT_U16 = "<I2"
+local FMT_SUBSTRUCT = "<I4I4I4"                -- One 12-byte substruct
+local FMT_BATTLE_STATS = "<I4BBI2I2I2I2I2I2I2"  -- status, level, pokerus, hp, max_hp, 5 stats (+80)
+
 local function getSaveBlock1()
-    return emu:read32(SAVE_BLOCK1_PTR)
+    return read32(SAVE_BLOCK1_PTR)
 end
 
 local function getSaveBlock2()
-    return emu:read32(SAVE_BLOCK2_PTR)
+    return read32(SAVE_BLOCK2_PTR)
 end
 
 local function readString(addr, maxLen)
-    local chars = {}
-    for i = 0, maxLen - 1 do
-        local byte = emu:read8(addr + i)
-        if byte == 0xFF then break end
-        local char = CHAR_DECODE[byte] or ""
-        table.insert(chars, char)
-    end
-    return table.concat(chars)
+    return (Text.decode(readBlock(addr, maxLen)))
 end
 
 -- ============================================================================
@@ -100,16 +106,16 @@ function State.getPlayTime()
     local sb2 = getSaveBlock2()
     if sb2 == 0 then return {hours=0, minutes=0, seconds=0} end
     return {
-        hours = emu:read16(sb2 + 0x0E),
-        minutes = emu:read8(sb2 + 0x10),
-        seconds = emu:read8(sb2 + 0x11),
+        hours = read16(sb2 + 0x0E),
+        minutes = read8(sb2 + 0x10),
+        seconds = read8(sb2 + 0x11),
     }
 end
 
 function State.getMoney()
     local sb1 = getSaveBlock1()
     if sb1 == 0 then return 0 end
-    return emu:read32(sb1 + 0x0490)
+    return read32(sb1 + 0x0490)
 end
 
 -- ============================================================================
@@ -120,17 +126,17 @@ function State.getMapInfo()
     local sb1 = getSaveBlock1()
     if sb1 == 0 then return {group = 0, num = 0, x = 0, y = 0} end
     return {
-        group = emu:read8(sb1 + 0x04),
-        num = emu:read8(sb1 + 0x05),
-        x = emu:read16(sb1 + 0x00),
-        y = emu:read16(sb1 + 0x02),
+        group = read8(sb1 + 0x04),
+        num = read8(sb1 + 0x05),
+        x = read16(sb1 + 0x00),
+        y = read16(sb1 + 0x02),
     }
 end
 
 function State.getBadges()
     local sb1 = getSaveBlock1()
     if sb1 == 0 then return 0, 0 end
-    local flags = emu:read16(sb1 + 0x0EFC)
+    local flags = read16(sb1 + 0x0EFC)
     local count = 0
     local temp = flags
     while temp > 0 do
@@ -145,14 +151,14 @@ end
 -- ============================================================================
 
 function State.isBattleActive()
-    return emu:read32(CALLBACK2_ADDR) == BATTLE_CALLBACK
+    return read32(CALLBACK2_ADDR) == BATTLE_CALLBACK
 end
 
 function State.getBattleInfo()
     if not State.isBattleActive() then
         return {in_battle = false}
     end
-    local flags = emu:read32(BATTLE_TYPE_FLAGS)
+    local flags = read32(BATTLE_TYPE_FLAGS)
     return {
         in_battle = true,
         is_wild = (flags & 0x04) ~= 0,
@@ -166,118 +172,149 @@ end
 -- PARTY POKEMON
 -- ============================================================================
 
+-- Decrypted party cache, one entry per slot. The party is read as one block,
+-- but decrypting and decoding a Pokemon still costs a dozen table builds; the
+-- encrypted block only changes together with its checksum (+28), so an entry
+-- is reused while (personality, otId, checksum, level, HP) all match and only
+-- the unencrypted battle fields are decoded again. Entries are
+-- re-decrypted anyway every PARTY_CACHE_MAX_HITS reuses, as a guard against
+-- 16-bit checksum collisions. The nickname is outside the checksum (and
+-- GM.setNickname rewrites it alone), so it is decoded from the block every call.
+local PARTY_CACHE_MAX_HITS = 600
+local partyCache = {}
+State.partyCacheEnabled = true
+State.partyCacheStats = {hits = 0, misses = 0}
+
+-- Callers get their own copy of the cached moves/pp/evs/ivs tables
+local function copyTable(t)
+    local out = {}
+    for k, v in pairs(t) do out[k] = v end
+    return out
+end
+
+-- base: 1-based position of the Pokemon within block
+local function decryptPokemon(block, base, personality, otId)
+    local key = personality ~ otId
+    local secure = base + 32
+    local offsets = SUBSTRUCT_OFFSET[personality % 24]
+    
+    local decrypted = {
+        nature = personality % 25,
+    }
+    
+    -- Growth substruct (species, item, exp)
+    local word0, word1 = unpack(FMT_SUBSTRUCT, block, secure + offsets[1])
+    word0, word1 = word0 ~ key, word1 ~ key
+    
+    local rawSpecies = word0 & 0xFFFF
+    decrypted.species = rawSpecies - SPECIES_OFFSET
+    decrypted.held_item = (word0 >> 16) & 0xFFFF
+    decrypted.experience = word1
+    
+    -- Attacks substruct (moves, pp)
+    local atkWord0, atkWord1, atkWord2 = unpack(FMT_SUBSTRUCT, block, secure + offsets[2])
+    atkWord0, atkWord1, atkWord2 = atkWord0 ~ key, atkWord1 ~ key, atkWord2 ~ key
+    
+    decrypted.moves = {
+        atkWord0 & 0xFFFF,
+        (atkWord0 >> 16) & 0xFFFF,
+        atkWord1 & 0xFFFF,
+        (atkWord1 >> 16) & 0xFFFF,
+    }
+    decrypted.pp = {
+        atkWord2 & 0xFF,
+        (atkWord2 >> 8) & 0xFF,
+        (atkWord2 >> 16) & 0xFF,
+        (atkWord2 >> 24) & 0xFF,
+    }
+    
+    -- EVs substruct
+    local evWord0, evWord1 = unpack(FMT_SUBSTRUCT, block, secure + offsets[3])
+    evWord0, evWord1 = evWord0 ~ key, evWord1 ~ key
+    
+    decrypted.evs = {
+        hp = evWord0 & 0xFF,
+        attack = (evWord0 >> 8) & 0xFF,
+        defense = (evWord0 >> 16) & 0xFF,
+        speed = (evWord0 >> 24) & 0xFF,
+        sp_attack = evWord1 & 0xFF,
+        sp_defense = (evWord1 >> 8) & 0xFF,
+    }
+    
+    -- Misc substruct (IVs)
+    local _, ivWord = unpack(FMT_SUBSTRUCT, block, secure + offsets[4])
+    ivWord = ivWord ~ key
+    decrypted.ivs = {
+        hp = ivWord & 0x1F,
+        attack = (ivWord >> 5) & 0x1F,
+        defense = (ivWord >> 10) & 0x1F,
+        speed = (ivWord >> 15) & 0x1F,
+        sp_attack = (ivWord >> 20) & 0x1F,
+        sp_defense = (ivWord >> 25) & 0x1F,
+    }
+    
+    return decrypted
+end
+
 function State.getParty()
     local party = {}
-    local count = emu:read8(PARTY_COUNT_ADDR)
+    local count = read8(PARTY_COUNT_ADDR)
     if count > 6 then count = 6 end
+    if count == 0 then return party end
+    
+    -- Whole party in one read
+    local block = readBlock(PLAYER_PARTY_ADDR, count * POKEMON_SIZE)
     
     for slot = 0, count - 1 do
-        local addr = PLAYER_PARTY_ADDR + (slot * POKEMON_SIZE)
-        local personality = emu:read32(addr)
+        local base = slot * POKEMON_SIZE + 1
+        local personality, otId = unpack(FMT_PID_OTID, block, base)
         
         if personality ~= 0 then
-            local otId = emu:read32(addr + 4)
-            local key = personality ~ otId
-            local secureAddr = addr + 32
+            local checksum = unpack(FMT_U16, block, base + 28)
+            local status, level, _, hp, maxHp, attack, defense, speed, spAttack, spDefense =
+                unpack(FMT_BATTLE_STATS, block, base + 80)
+            
+            local entry = partyCache[slot]
+            if State.partyCacheEnabled and entry and entry.hits < PARTY_CACHE_MAX_HITS
+                and entry.personality == personality and entry.otId == otId
+                and entry.checksum == checksum and entry.level == level and entry.hp == hp then
+                entry.hits = entry.hits + 1
+                State.partyCacheStats.hits = State.partyCacheStats.hits + 1
+            else
+                entry = {
+                    personality = personality, otId = otId, checksum = checksum,
+                    level = level, hp = hp, hits = 0,
+                    data = decryptPokemon(block, base, personality, otId),
+                }
+                partyCache[slot] = entry
+                State.partyCacheStats.misses = State.partyCacheStats.misses + 1
+            end
+            local d = entry.data
             
             local pokemon = {
                 slot = slot,
                 personality = personality,
-                nickname = readString(addr + 8, 10),
-                species = 0,
-                held_item = 0,
-                experience = 0,
-                moves = {},
-                pp = {},
-                evs = {},
-                nature = personality % 25,
-            }
-            
-            -- Get substruct positions
-            local order = personality % 24
-            local positions = SUBSTRUCT_ORDER[order]
-            
-            -- Safety check
-            if not positions then
-                positions = {1,2,3,4}  -- Default order if lookup fails
-            end
-            
-            -- Find which position has each substruct type
-            local growthPos, attacksPos, evsPos, miscPos = 0, 1, 2, 3  -- Defaults
-            for i = 1, 4 do
-                local v = positions[i]
-                if v == 1 then growthPos = i - 1
-                elseif v == 2 then attacksPos = i - 1
-                elseif v == 3 then evsPos = i - 1
-                elseif v == 4 then miscPos = i - 1
-                end
-            end
-            
-            -- Growth substruct (species, item, exp)
-            local growthAddr = secureAddr + (growthPos * 12)
-            local word0 = emu:read32(growthAddr) ~ key
-            local word1 = emu:read32(growthAddr + 4) ~ key
-            
-            local rawSpecies = word0 & 0xFFFF
-            pokemon.species = rawSpecies - SPECIES_OFFSET
-            pokemon.held_item = (word0 >> 16) & 0xFFFF
-            pokemon.experience = word1
-            
-            -- Attacks substruct (moves, pp)
-            local attacksAddr = secureAddr + (attacksPos * 12)
-            local atkWord0 = emu:read32(attacksAddr) ~ key
-            local atkWord1 = emu:read32(attacksAddr + 4) ~ key
-            local atkWord2 = emu:read32(attacksAddr + 8) ~ key
-            
-            pokemon.moves = {
-                atkWord0 & 0xFFFF,
-                (atkWord0 >> 16) & 0xFFFF,
-                atkWord1 & 0xFFFF,
-                (atkWord1 >> 16) & 0xFFFF,
-            }
-            pokemon.pp = {
-                atkWord2 & 0xFF,
-                (atkWord2 >> 8) & 0xFF,
-                (atkWord2 >> 16) & 0xFF,
-                (atkWord2 >> 24) & 0xFF,
-            }
-            
-            -- EVs substruct
-            local evAddr = secureAddr + (evsPos * 12)
-            local evWord0 = emu:read32(evAddr) ~ key
-            local evWord1 = emu:read32(evAddr + 4) ~ key
-            
-            pokemon.evs = {
-                hp = evWord0 & 0xFF,
-                attack = (evWord0 >> 8) & 0xFF,
-                defense = (evWord0 >> 16) & 0xFF,
-                speed = (evWord0 >> 24) & 0xFF,
-                sp_attack = evWord1 & 0xFF,
-                sp_defense = (evWord1 >> 8) & 0xFF,
-            }
-            
-            -- Misc substruct (IVs)
-            local miscAddr = secureAddr + (miscPos * 12)
-            local ivWord = emu:read32(miscAddr + 4) ~ key
-            pokemon.ivs = {
-                hp = ivWord & 0x1F,
-                attack = (ivWord >> 5) & 0x1F,
-                defense = (ivWord >> 10) & 0x1F,
-                speed = (ivWord >> 15) & 0x1F,
-                sp_attack = (ivWord >> 20) & 0x1F,
-                sp_defense = (ivWord >> 25) & 0x1F,
+                nickname = (Text.decode(block, base + 8, 10)),
+                species = d.species,
+                held_item = d.held_item,
+                experience = d.experience,
+                moves = copyTable(d.moves),
+                pp = copyTable(d.pp),
+                evs = copyTable(d.evs),
+                ivs = copyTable(d.ivs),
+                nature = d.nature,
             }
             
             -- Unencrypted battle stats
-            pokemon.status = emu:read32(addr + 80)
-            pokemon.level = emu:read8(addr + 84)
-            pokemon.current_hp = emu:read16(addr + 86)
-            pokemon.max_hp = emu:read16(addr + 88)
-            pokemon.attack = emu:read16(addr + 90)
-            pokemon.defense = emu:read16(addr + 92)
-            pokemon.speed = emu:read16(addr + 94)
-            pokemon.sp_attack = emu:read16(addr + 96)
-            pokemon.sp_defense = emu:read16(addr + 98)
+            pokemon.status = status
+            pokemon.level = level
+            pokemon.current_hp = hp
+            pokemon.max_hp = maxHp
+            pokemon.attack = attack
+            pokemon.defense = defense
+            pokemon.speed = speed
+            pokemon.sp_attack = spAttack
+            pokemon.sp_defense = spDefense
             
             if pokemon.species > 0 and pokemon.species <= 500 then
                 table.insert(party, pokemon)
@@ -288,6 +325,29 @@ function State.getParty()
     return party
 end
 
+-- Frame-time comparison of getParty with and without the cache, from the
+-- scripting console: GMState.benchmarkParty(600)
+function State.benchmarkParty(iterations)
+    iterations = iterations or 600
+    local function run(enabled)
+        State.partyCacheEnabled = enabled
+        partyCache = {}
+        State.getParty()  -- Warm the cache
+        local start = os.clock()
+        for _ = 1, iterations do
+            State.getParty()
+        end
+        return (os.clock() - start) * 1000 / iterations
+    end
+    local uncached = run(false)
+    local cached = run(true)
+    local frameMs = 1000 / 60
+    console:log(string.format(
+        "⏱ getParty: %.3fms uncached (%.1f%% of a frame), %.3fms cached (%.1f%%)",
+        uncached, uncached / frameMs * 100, cached, cached / frameMs * 100))
+    return uncached, cached
+end
+
 -- ============================================================================
 -- ENEMY POKEMON (IN BATTLE)
 -- ============================================================================
@@ -296,30 +356,30 @@ function State.getEnemyPokemon()
     if not State.isBattleActive() then return nil end
     
     local addr = GBATTLEMONS_ADDR + BATTLE_MON_SIZE  -- Slot 1 = enemy
-    local rawSpecies = emu:read16(addr)
+    local rawSpecies = read16(addr)
     local species = rawSpecies - SPECIES_OFFSET
     
     if species <= 0 or species > 440 then return nil end
     
-    local maxHp = emu:read16(addr + 0x2C)
-    local level = emu:read8(addr + 0x2A)
+    local maxHp = read16(addr + 0x2C)
+    local level = read8(addr + 0x2A)
     if maxHp == 0 or maxHp > 999 or level == 0 or level > 100 then return nil end
     
     return {
         species = species,
         level = level,
-        hp = emu:read16(addr + 0x28),
+        hp = read16(addr + 0x28),
         maxHp = maxHp,
-        attack = emu:read16(addr + 0x02),
-        defense = emu:read16(addr + 0x04),
-        speed = emu:read16(addr + 0x06),
-        spAttack = emu:read16(addr + 0x08),
-        spDefense = emu:read16(addr + 0x0A),
+        attack = read16(addr + 0x02),
+        defense = read16(addr + 0x04),
+        speed = read16(addr + 0x06),
+        spAttack = read16(addr + 0x08),
+        spDefense = read16(addr + 0x0A),
         moves = {
-            emu:read16(addr + 0x0C),
-            emu:read16(addr + 0x0E),
-            emu:read16(addr + 0x10),
-            emu:read16(addr + 0x12)
+            read16(addr + 0x0C),
+            read16(addr + 0x0E),
+            read16(addr + 0x10),
+            read16(addr + 0x12)
         },
     }
 end
@@ -333,12 +393,10 @@ function State.getBagItems()
     if sb1 == 0 then return {} end
     
     local items = {}
-    local BAG_ITEMS_OFFSET = 0x0560
+    local words = {unpack(FMT_BAG_ITEMS, readBlock(sb1 + BAG_ITEMS_OFFSET, BAG_ITEM_SLOTS * 4))}
     
-    for i = 0, 29 do
-        local addr = sb1 + BAG_ITEMS_OFFSET + (i * 4)
-        local itemId = emu:read16(addr)
-        local quantity = emu:read16(addr + 2)
+    for i = 1, BAG_ITEM_SLOTS * 2, 2 do
+        local itemId, quantity = words[i], words[i + 1]
         if itemId > 0 and itemId < 1000 and quantity > 0 and quantity < 1000 then
             table.insert(items, {id = itemId, qty = quantity})
         end
@@ -351,24 +409,17 @@ end
 -- DIALOGUE
 -- ============================================================================
 
+-- Decoded and hashed in one pass; reused while the first 64 bytes are unchanged
+local dialogueReader = Text.newReader(DIALOGUE_BUFFER, 200, 64, function(addr, len)
+    return readBlock(addr, len)  -- Late-bound: setEvents swaps in the cached reader
+end)
+
 function State.readDialogue()
-    local chars = {}
-    for i = 0, 199 do
-        local byte = emu:read8(DIALOGUE_BUFFER + i)
-        if byte == 0xFF then break end
-        local c = CHAR_DECODE[byte] or ""
-        table.insert(chars, c)
-    end
-    return table.concat(chars)
+    return (dialogueReader())
 end
 
 function State.getDialogueHash()
-    local hash = 0
-    for i = 0, 63 do
-        local byte = emu:read8(DIALOGUE_BUFFER + i)
-        if byte == 0xFF then break end
-        hash = hash + byte * (i + 1)
-    end
+    local _, hash = dialogueReader()
     return hash
 end
 
@@ -421,7 +472,7 @@ function State.getFullState()
         in_battle = State.isBattleActive(),
         battle_info = battleInfo,
         enemy_pokemon = State.getEnemyPokemon(),
-        battle_outcome = emu:read8(0x0202427C),
+        battle_outcome = read8(0x0202427C),
         party = partyData,
         party_count = #partyData,
         bag_items = State.getBagItems(),
@@ -430,9 +481,12 @@ function State.getFullState()
     }
 end
 
--- For compatibility with v2 server
+-- Called by the v2 server once both modules are loaded
 function State.setEvents(eventsModule)
-    -- No longer needed, but keep for compatibility
+    if eventsModule and eventsModule.read8 then
+        read8, read16, read32 = eventsModule.read8, eventsModule.read16, eventsModule.read32
+        readBlock = eventsModule.readBlock
+    end
 end
 
 return State
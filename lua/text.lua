@@ -0,0 +1,229 @@
+-- ============================================================================
+-- Pokemon Emerald GM - Text Decoding Module
+-- Gen 3 strings → Lua strings, shared by events.lua and state.lua
+-- ============================================================================
+
+local Text = {}
+
+Text.TERMINATOR = 0xFF
+
+-- Gen 3 character table (union of the tables events.lua and state.lua used)
+Text.CHAR_MAP = {
+    [0x00] = " ", [0x01] = " ", [0xAB] = "!", [0xAC] = "?", [0xAD] = ".", [0xAE] = "-",
+    [0xB0] = "...", [0xB1] = '"', [0xB2] = '"', [0xB3] = "'", [0xB4] = "'",
+    [0xB5] = "'", [0xB6] = "'", [0xB8] = ",", [0xB9] = "/", [0xBA] = "/",
+    [0xBB] = "A", [0xBC] = "B", [0xBD] = "C", [0xBE] = "D", [0xBF] = "E",
+    [0xC0] = "F", [0xC1] = "G", [0xC2] = "H", [0xC3] = "I", [0xC4] = "J",
+    [0xC5] = "K", [0xC6] = "L", [0xC7] = "M", [0xC8] = "N", [0xC9] = "O",
+    [0xCA] = "P", [0xCB] = "Q", [0xCC] = "R", [0xCD] = "S", [0xCE] = "T",
+    [0xCF] = "U", [0xD0] = "V", [0xD1] = "W", [0xD2] = "X", [0xD3] = "Y",
+    [0xD4] = "Z", [0xD5] = "a", [0xD6] = "b", [0xD7] = "c", [0xD8] = "d",
+    [0xD9] = "e", [0xDA] = "f", [0xDB] = "g", [0xDC] = "h", [0xDD] = "i",
+    [0xDE] = "j", [0xDF] = "k", [0xE0] = "l", [0xE1] = "m", [0xE2] = "n",
+    [0xE3] = "o", [0xE4] = "p", [0xE5] = "q", [0xE6] = "r", [0xE7] = "s",
+    [0xE8] = "t", [0xE9] = "u", [0xEA] = "v", [0xEB] = "w", [0xEC] = "x",
+    [0xED] = "y", [0xEE] = "z", [0xA1] = "0", [0xA2] = "1", [0xA3] = "2",
+    [0xA4] = "3", [0xA5] = "4", [0xA6] = "5", [0xA7] = "6", [0xA8] = "7",
+    [0xA9] = "8", [0xAA] = "9", [0xF0] = ":", [0x5C] = "(", [0x5D] = ")",
+    [0xFE] = "\n", [0xFA] = " ", [0xFB] = " ",
+}
+
+-- Reused output buffer: entries past the current length are ignored by concat
+local buffer = {}
+
+-- Decode a 0xFF-terminated string from a byte string (e.g. Events.readBlock),
+-- starting at 1-based position `first`, at most maxLen bytes. A rolling hash of
+-- the raw bytes is computed in the same pass (0 only for an empty string).
+-- Returns text, hash.
+function Text.decode(bytes, first, maxLen)
+    first = first or 1
+    local last = #bytes
+    if maxLen and first + maxLen - 1 < last then last = first + maxLen - 1 end
+    local map = Text.CHAR_MAP
+    local n, hash = 0, 0
+    for i = first, last do
+        local byte = string.byte(bytes, i)
+        if byte == 0xFF then break end
+        hash = (hash * 31 + byte + 1) & 0xFFFFFFFF
+        local c = map[byte]
+        if c then
+            n = n + 1
+            buffer[n] = c
+        end
+    end
+    return table.concat(buffer, "", 1, n), hash
+end
+
+-- A text buffer in RAM that is polled every frame. reader() returns text, hash.
+-- The first probeLen bytes are read first; when they are byte-identical to the
+-- last poll, the previous result is returned without reading the rest or
+-- decoding. A change past probeLen alone is picked up with the next change in
+-- the probe, so probeLen should cover where messages differ (battle and
+-- dialogue messages do within their first 64 bytes).
+--   readBlock(addr, len) -> byte string (Events.readBlock, or State's fallback)
+function Text.newReader(addr, maxLen, probeLen, readBlock)
+    local lastProbe, lastText, lastHash = nil, "", 0
+    local stats = {decodes = 0, skips = 0}
+    local function reader()
+        local probe = readBlock(addr, probeLen)
+        if probe == lastProbe then
+            stats.skips = stats.skips + 1
+            return lastText, lastHash
+        end
+        lastProbe = probe
+        stats.decodes = stats.decodes + 1
+        local bytes = probe
+        -- Only read past the probe if the string doesn't end inside it
+        if maxLen > probeLen and not string.find(probe, "\255", 1, true) then
+            bytes = readBlock(addr, maxLen)
+        end
+        lastText, lastHash = Text.decode(bytes, 1, maxLen)
+        return lastText, lastHash
+    end
+    return reader, stats
+end
+
+-- ============================================================================
+-- CAPTURE DEDUPLICATION
+-- ============================================================================
+
+-- Same rolling hash as Text.decode, over a decoded string
+function Text.hash(text)
+    local hash = 0
+    for i = 1, #text do
+        hash = (hash * 31 + string.byte(text, i) + 1) & 0xFFFFFFFF
+    end
+    return hash
+end
+
+-- Calls visit(hash, len) for each proper prefix of text at least minLen long
+local function hashPrefixes(text, minLen, visit)
+    local hash = 0
+    for i = 1, #text - 1 do
+        hash = (hash * 31 + string.byte(text, i) + 1) & 0xFFFFFFFF
+        if i >= minLen then visit(hash) end
+    end
+end
+
+-- Set of recently captured messages with LRU eviction at `capacity`.
+-- Membership, recency updates and eviction are O(1) (hash lookups plus a
+-- doubly linked list). Every proper prefix (>= MIN_PREFIX chars) of each
+-- member is indexed by rolling hash, so isPartial() is one lookup plus one
+-- string compare to rule out hash collisions.
+local RecentSet = {}
+RecentSet.__index = RecentSet
+RecentSet.MIN_PREFIX = 4
+
+function Text.newRecentSet(capacity)
+    local set = setmetatable({capacity = capacity}, RecentSet)
+    set:clear()
+    return set
+end
+
+function RecentSet:clear()
+    self.size = 0
+    self.members = {}
+    self.newer, self.older = {}, {}     -- Linked list by text
+    self.newest, self.oldest = nil, nil
+    self.prefixCount = {}               -- prefix hash → members with that prefix
+    self.prefixOwner = {}               -- prefix hash → a member with that prefix
+end
+
+function RecentSet:_unlink(text)
+    local newer, older = self.newer[text], self.older[text]
+    if newer then self.older[newer] = older else self.newest = older end
+    if older then self.newer[older] = newer else self.oldest = newer end
+    self.newer[text], self.older[text] = nil, nil
+end
+
+function RecentSet:_linkNewest(text)
+    self.older[text] = self.newest
+    if self.newest then self.newer[self.newest] = text else self.oldest = text end
+    self.newest = text
+end
+
+function RecentSet:contains(text)
+    if not self.members[text] then return false end
+    if self.newest ~= text then  -- Refresh recency
+        self:_unlink(text)
+        self:_linkNewest(text)
+    end
+    return true
+end
+
+-- True if text is a proper prefix of a member (a partial of a longer message)
+function RecentSet:isPartial(text)
+    if #text < RecentSet.MIN_PREFIX then return false end
+    local owner = self.prefixOwner[Text.hash(text)]
+    return owner ~= nil and #owner > #text and string.sub(owner, 1, #text) == text
+end
+
+function RecentSet:add(text)
+    if self:contains(text) then return end
+    self.members[text] = true
+    self:_linkNewest(text)
+    self.size = self.size + 1
+    local counts, owners = self.prefixCount, self.prefixOwner
+    hashPrefixes(text, RecentSet.MIN_PREFIX, function(hash)
+        counts[hash] = (counts[hash] or 0) + 1
+        owners[hash] = text
+    end)
+    if self.size > self.capacity then
+        self:remove(self.oldest)
+    end
+end
+
+function RecentSet:remove(text)
+    if not self.members[text] then return end
+    self.members[text] = nil
+    self:_unlink(text)
+    self.size = self.size - 1
+    local counts, owners = self.prefixCount, self.prefixOwner
+    hashPrefixes(text, RecentSet.MIN_PREFIX, function(hash)
+        local n = (counts[hash] or 1) - 1
+        if n == 0 then
+            counts[hash], owners[hash] = nil, nil
+        else
+            counts[hash] = n  -- Owner may be this text; it still shares the prefix
+        end
+    end)
+end
+
+-- Bounded ring buffer; once full, each push overwrites the oldest entry
+local Ring = {}
+Ring.__index = Ring
+
+function Text.newRing(capacity)
+    return setmetatable({capacity = capacity, items = {}, first = 1, count = 0}, Ring)
+end
+
+function Ring:push(value)
+    if self.count < self.capacity then
+        self.count = self.count + 1
+    else
+        self.first = self.first % self.capacity + 1
+    end
+    self.items[(self.first + self.count - 2) % self.capacity + 1] = value
+end
+
+function Ring:last()
+    if self.count == 0 then return nil end
+    return self.items[(self.first + self.count - 2) % self.capacity + 1]
+end
+
+function Ring:replaceLast(value)
+    if self.count > 0 then
+        self.items[(self.first + self.count - 2) % self.capacity + 1] = value
+    end
+end
+
+-- Entries oldest first, as a plain array
+function Ring:toArray()
+    local out = {}
+    for i = 0, self.count - 1 do
+        out[i + 1] = self.items[(self.first + i - 1) % self.capacity + 1]
+    end
+    return out
+end
+
+return Text
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark: EntityTagExtractor vs the old per-class keyword loops.
+
+Runs both over decision snippets from agent/state/decisions.db (or a
+synthetic corpus when there is no state yet) and reports throughput plus
+how often the two disagree on tags.
+
+Run: python3 tools/bench_extraction.py [--repeat 5] [--synthetic 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'daemon'))
+from agentic_emerald import (EntityTagExtractor, MOVE_NAMES, NARRATIVE_TAGS,
+                             load_species_names)
+from decision_store import DecisionStore
+
+
+# --- Old implementations, kept here as the baseline ---------------------------
+
+def legacy_context_signals(snippet: str) -> dict:
+    signals = {'pokemon': [], 'action_context': [], 'emotional': []}
+    snippet_lower = snippet.lower()
+    pokemon_names = ['blaziken', 'combusken', 'torchic', 'swellow', 'ninjask',
+                     'slaking', 'kirlia', 'ralts', 'lombre', 'pelipper']
+    for poke in pokemon_names:
+        if poke in snippet_lower:
+            signals['pokemon'].append(poke.capitalize())
+    if any(w in snippet_lower for w in ['sweep', 'swept', 'clean', 'one turn', 'no damage']):
+        signals['action_context'].append('sweep')
+    if any(w in snippet_lower for w in ['clutch', 'close', 'close call', 'close-call']):
+        signals['action_context'].append('clutch')
+    if any(w in snippet_lower for w in ['rematch', 're-match', 'revenge']):
+        signals['action_context'].append('rematch')
+    if any(w in snippet_lower for w in ['crit', 'critical']):
+        signals['action_context'].append('crit')
+    if any(w in snippet_lower for w in ['level', 'leveled', 'evolved', 'evolution']):
+        signals['action_context'].append('milestone')
+    if any(w in snippet_lower for w in ['tanked', 'pushed through', 'despite']):
+        signals['emotional'].append('resilience')
+    if any(w in snippet_lower for w in ['dominated', 'swept', 'clean']):
+        signals['emotional'].append('dominance')
+    if any(w in snippet_lower for w in ['underdog', 'type disadvantage', 'against odds']):
+        signals['emotional'].append('underdog')
+    return signals
+
+
+def legacy_narrative_tags(snippet: str) -> list:
+    tags = []
+    snippet_lower = snippet.lower()
+    if any(w in snippet_lower for w in ['sweep', 'swept', 'clean']):
+        tags.append('sweep')
+    if any(w in snippet_lower for w in ['clutch', 'close', 'close_call']):
+        tags.append('clutch')
+    if any(w in snippet_lower for w in ['grind', 'routine']):
+        tags.append('grind')
+    if any(w in snippet_lower for w in ['story', 'maxie', 'aqua', 'magma', 'badge', 'gym']):
+        tags.append('story')
+    if any(w in snippet_lower for w in ['crit', 'critical']):
+        tags.append('crit')
+    if any(w in snippet_lower for w in ['level', 'evolved']):
+        tags.append('milestone')
+    return tags
+
+
+def legacy_pokemon_mentions(snippet: str) -> list:
+    snippet_lower = snippet.lower()
+    common_pokemon = ['blaziken', 'combusken', 'torchic', 'swellow', 'ninjask',
+                      'slaking', 'kirlia', 'ralts', 'gardevoir', 'lombre', 'ludicolo']
+    return [p.capitalize() for p in common_pokemon if p in snippet_lower]
+
+
+def legacy_all(snippet: str):
+    return (legacy_context_signals(snippet), legacy_narrative_tags(snippet),
+            legacy_pokemon_mentions(snippet))
+
+
+# --- Corpus --------------------------------------------------------------------
+
+def load_corpus(synthetic: int, species: dict) -> tuple:
+    db = ROOT / 'agent' / 'state' / 'decisions.db'
+    if db.exists():
+        snippets = [e.get('snippet', '') for e in DecisionStore(db).iter_entries()]
+        snippets = [s for s in snippets if s]
+        if snippets:
+            return snippets, f"{db.relative_to(ROOT)}"
+
+    rng = random.Random(42)
+    names = list(species.values()) or ['Ralts', 'Combusken', 'Lombre']
+    moves = list(MOVE_NAMES.values())
+    templates = [
+        "{p} swept the gym with {m} — a clean finish. Maren notes the ace forming.",
+        "Close call: {p} tanked a critical hit at 3 HP and pushed through despite the odds.",
+        "Routine grind on Route 110. {p} leveled up; nothing story-worthy yet.",
+        "Rematch with May. {p} took revenge with {m}; {q} sat this one out.",
+        "Team Aqua grunt dominated early, but {p} turned it around. Underdog energy.",
+        "{p} evolved into {q}! Shiny sparkle on the next encounter would land hard.",
+        "Quiet exploration; enclosed cave, no battles. ACTION: none",
+    ]
+    snippets = []
+    for _ in range(synthetic):
+        t = rng.choice(templates)
+        snippets.append(t.format(p=rng.choice(names), q=rng.choice(names), m=rng.choice(moves)))
+    return snippets, f"synthetic ({synthetic} snippets)"
+
+
+def time_it(fn, snippets, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for s in snippets:
+            fn(s)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark entity/tag extraction')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs (best is reported)')
+    parser.add_argument('--synthetic', type=int, default=2000,
+                        help='Synthetic corpus size when no decision store exists')
+    args = parser.parse_args()
+
+    species = load_species_names(ROOT / 'data' / 'emerald_species.json')
+    start = time.perf_counter()
+    engine = EntityTagExtractor(species, MOVE_NAMES)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    snippets, source = load_corpus(args.synthetic, species)
+    print(f"Corpus: {source}")
+    print(f"Engine: {len(engine._entities)} entities, {len(engine._tags)} tag terms, "
+          f"built in {build_ms:.1f}ms")
+
+    legacy_s = time_it(legacy_all, snippets, args.repeat)
+    engine_s = time_it(engine.extract, snippets, args.repeat)
+    n = len(snippets)
+    print(f"\n{'':12}{'total':>10}{'per snippet':>14}")
+    print(f"{'legacy':12}{legacy_s * 1000:>8.1f}ms{legacy_s / n * 1e6:>11.1f}µs")
+    print(f"{'engine':12}{engine_s * 1000:>8.1f}ms{engine_s / n * 1e6:>11.1f}µs")
+    print(f"speedup: {legacy_s / engine_s:.2f}x  "
+          f"(legacy: 3 passes over ~11 names; engine: 1 pass over {len(species)} species + moves)")
+
+    # Coverage: the old lists only knew ~11 species
+    legacy_pokemon = engine_pokemon = tag_diffs = 0
+    for s in snippets:
+        legacy_pokemon += len(legacy_pokemon_mentions(s))
+        found = engine.extract(s)
+        engine_pokemon += len(found['pokemon'])
+        if set(legacy_narrative_tags(s)) != {t for t in NARRATIVE_TAGS if t in found['tags']}:
+            tag_diffs += 1
+    print(f"\nPokemon mentions found: legacy {legacy_pokemon}, engine {engine_pokemon}")
+    print(f"Narrative tag disagreements: {tag_diffs}/{n} "
+          f"(word-boundary matching: 'enclosed' no longer tags clutch, 'Magmar' no longer tags story)")
+
+
+if __name__ == '__main__':
+    main()
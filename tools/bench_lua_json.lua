@@ -0,0 +1,124 @@
+-- ============================================================================
+-- Benchmark: lua/gm_json.lua vs the old toJson from game_master_v2.lua
+--
+-- Encodes a typical broadcast message (a getFullState-shaped table with a six-
+-- member party and a battle_start payload merged in) with both encoders, checks
+-- that they agree, and reports microseconds and KB allocated per encode.
+--
+-- Run: lua5.4 tools/bench_lua_json.lua [iterations]
+-- ============================================================================
+
+local iterations = tonumber(arg and arg[1]) or 5000
+local root = ((arg and arg[0] or ""):match("(.*/)") or "./") .. "../lua/"
+local Json = dofile(root .. "gm_json.lua")
+
+-- --- Old implementation, kept here as the baseline ---------------------------
+
+local function legacyEscapeJson(s)
+    if type(s) ~= "string" then return tostring(s) end
+    s = s:gsub('\\', '\\\\')
+    s = s:gsub('"', '\\"')
+    s = s:gsub('\n', '\\n')
+    s = s:gsub('\r', '\\r')
+    s = s:gsub('\t', '\\t')
+    return s
+end
+
+local function legacyToJson(val)
+    if val == nil then return "null" end
+    local t = type(val)
+    if t == "boolean" then return val and "true" or "false" end
+    if t == "number" then return tostring(val) end
+    if t == "string" then return '"' .. legacyEscapeJson(val) .. '"' end
+    if t == "table" then
+        local isArray = true
+        local maxn = 0
+        local count = 0
+        for k, _ in pairs(val) do
+            count = count + 1
+            if type(k) == "number" then
+                maxn = math.max(maxn, k)
+            else
+                isArray = false
+            end
+        end
+        if count == 0 then return "{}" end
+        if isArray and maxn == count then
+            local parts = {}
+            for i = 1, count do
+                table.insert(parts, legacyToJson(val[i]))
+            end
+            return "[" .. table.concat(parts, ",") .. "]"
+        else
+            local parts = {}
+            for k, v in pairs(val) do
+                table.insert(parts, '"' .. legacyEscapeJson(tostring(k)) .. '":' .. legacyToJson(v))
+            end
+            return "{" .. table.concat(parts, ",") .. "}"
+        end
+    end
+    return '"' .. tostring(val) .. '"'
+end
+
+-- --- Typical message -------------------------------------------------------------
+
+local NAMES = {"BLAZIKEN", "GARDEVOIR", "SWELLOW", "LUDICOLO", "AGGRON", "FLYGON"}
+
+local function pokemon(slot)
+    return {
+        slot = slot, species = 280 + slot, nickname = NAMES[slot + 1], level = 30 + slot,
+        current_hp = 80 + slot, max_hp = 95 + slot, moves = {33, 45, 52, 98}, pp = {35, 40, 25, 30},
+        status = 0, nature = slot * 3, attack = 70, defense = 55, speed = 66, sp_attack = 80,
+        sp_defense = 60, held_item = 13, experience = 21000 + slot * 1000,
+        evs = {hp = 12, attack = 40, defense = 3, speed = 25, sp_attack = 0, sp_defense = 8},
+        ivs = {hp = 31, attack = 20, defense = 14, speed = 27, sp_attack = 9, sp_defense = 30},
+    }
+end
+
+local message = {
+    player_name = "MAY", play_time = {hours = 12, minutes = 34, seconds = 5}, money = 48210,
+    map_group = 0, map_num = 9, player_x = 7, player_y = 11, badges = 63, badge_count = 6,
+    in_battle = true,
+    battle_info = {in_battle = true, is_wild = false, is_trainer = true, is_double = false, flags = 8},
+    enemy_pokemon = {species = 288, level = 31, hp = 70, maxHp = 70, attack = 50, defense = 40,
+                     speed = 60, spAttack = 30, spDefense = 35, moves = {33, 39, 28, 0}},
+    battle_outcome = 0, party = {}, party_count = 6, bag_items = {},
+    dialogue_text = 'COOLTRAINER JESSICA would like to battle!\nShe sent out "ZIGZAGOON"!',
+    dialogue_active = true,
+    event_type = "battle_start", event_id = 1234, timestamp = 1760000000,
+    battleInfo = {in_battle = true, is_wild = false, is_trainer = true, is_double = false, flags = 8},
+    enemy = {species = 288, level = 31, hp = 70, maxHp = 70},
+    enemyParty = {{slot = 0, species = 288, level = 31, hp = 70, maxHp = 70},
+                  {slot = 1, species = 263, level = 29, hp = 64, maxHp = 64}},
+}
+for slot = 0, 5 do message.party[slot + 1] = pokemon(slot) end
+for i = 1, 20 do message.bag_items[i] = {id = i * 7, qty = i % 9 + 1} end
+
+-- --- Compare, then time --------------------------------------------------------------
+
+local old, new = legacyToJson(message), Json.encode(message, "object")
+if old ~= new then
+    print("MISMATCH between old and new encoder output")
+    print("old: " .. old)
+    print("new: " .. new)
+    os.exit(1)
+end
+
+local function bench(encode)
+    encode()
+    collectgarbage("collect")
+    collectgarbage("stop")
+    local kb = collectgarbage("count")
+    local start = os.clock()
+    for _ = 1, iterations do encode() end
+    local us = (os.clock() - start) * 1e6 / iterations
+    local allocated = (collectgarbage("count") - kb) / iterations
+    collectgarbage("restart")
+    return us, allocated
+end
+
+local oldUs, oldKb = bench(function() return legacyToJson(message) end)
+local newUs, newKb = bench(function() return Json.encode(message, "object") end)
+print(string.format("%d-byte message, %d iterations", #new, iterations))
+print(string.format("old toJson:  %7.1f µs/encode  %6.1f KB allocated", oldUs, oldKb))
+print(string.format("gm_json:     %7.1f µs/encode  %6.1f KB allocated", newUs, newKb))
@@ -0,0 +1,210 @@
+-- ============================================================================
+-- Benchmark: block reads + string.unpack vs per-field emu reads
+--
+-- Runs the party/bag readers from lua/events.lua and lua/state.lua against a
+-- recorded RAM image, next to the old per-field implementations (kept here as
+-- the baseline), and reports time and emulator calls per call. Outputs of old
+-- and new are compared first.
+--
+-- Record an image in mGBA (scripting console, with game_master_v2.lua loaded):
+--   GMEvents.recordRamImage("/tmp/emerald_ram.bin")
+--
+-- Run: lua5.4 tools/bench_lua_reads.lua /tmp/emerald_ram.bin [iterations]
+--
+-- Emulator calls are what matter in mGBA (each one crosses into the core);
+-- times here are for a pure-Lua stand-in of emu, so treat them as relative.
+-- ============================================================================
+
+local imagePath = arg and arg[1]
+local iterations = tonumber(arg and arg[2]) or 2000
+if not imagePath then
+    print("Usage: lua5.4 tools/bench_lua_reads.lua <ram_image> [iterations]")
+    os.exit(1)
+end
+
+local f = assert(io.open(imagePath, "rb"))
+local image = f:read("a")
+f:close()
+assert(#image == 0x48000, "expected EWRAM + IWRAM (288KB), got " .. #image .. " bytes")
+local EWRAM, IWRAM = image:sub(1, 0x40000), image:sub(0x40001)
+
+-- --- Stand-in for mGBA's emu, backed by the image ----------------------------
+
+local function locate(addr)
+    if addr >= 0x02000000 and addr + 4 <= 0x02040000 then return EWRAM, addr - 0x02000000 + 1 end
+    if addr >= 0x03000000 and addr + 4 <= 0x03008000 then return IWRAM, addr - 0x03000000 + 1 end
+end
+
+emu = {calls = 0}
+function emu:read8(addr)
+    self.calls = self.calls + 1
+    local mem, i = locate(addr)
+    return mem and mem:byte(i) or 0
+end
+function emu:read16(addr)
+    self.calls = self.calls + 1
+    local mem, i = locate(addr)
+    return mem and string.unpack("<I2", mem, i) or 0
+end
+function emu:read32(addr)
+    self.calls = self.calls + 1
+    local mem, i = locate(addr)
+    return mem and string.unpack("<I4", mem, i) or 0
+end
+function emu:readRange(addr, len)
+    self.calls = self.calls + 1
+    local mem, i = locate(addr)
+    return mem and mem:sub(i, i + len - 1) or string.rep("\0", len)
+end
+console = {log = function() end}
+
+local root = (arg[0]:match("(.*/)") or "./") .. "../lua/"
+package.path = root .. "?.lua;" .. package.path
+local Events = dofile(root .. "events.lua")
+local State = dofile(root .. "state.lua")
+State.setEvents(Events)
+Events.setState(State)
+Events.detectROM()
+State.partyCacheEnabled = false  -- Measure decoding, not the decrypt cache
+
+-- --- Old implementations, kept here as the baseline ---------------------------
+
+local PARTY, PARTY_COUNT, SB1_PTR = 0x020244EC, 0x020244E9, 0x03005D8C
+local ORDERS = Events.SUBSTRUCT_ORDERS
+
+local function legacyPositions(order)
+    local positions = {}
+    for pos = 0, 3 do positions[ORDERS[order][pos]] = pos end
+    return positions
+end
+
+local function legacyHashParty()
+    local hash = 0
+    local count = math.min(emu:read8(PARTY_COUNT), 6)
+    for slot = 0, count - 1 do
+        local addr = PARTY + slot * 100
+        local personality = emu:read32(addr)
+        if personality ~= 0 then
+            local key = personality ~ emu:read32(addr + 4)
+            local positions = legacyPositions(personality % 24)
+            local word0 = emu:read32(addr + 32 + positions[0] * 12) ~ key
+            local hp = emu:read16(addr + 86)
+            emu:read16(addr + 88)
+            hash = hash + ((word0 & 0xFFFF) * (slot + 1) * 1000) + (hp * (slot + 1))
+        end
+    end
+    return hash
+end
+
+local function legacyCountBagItems()
+    local sb1 = emu:read32(SB1_PTR)
+    local total = 0
+    for _, pocket in ipairs({{0x0560, 30}, {0x05D8, 30}, {0x0650, 16}, {0x0690, 64}, {0x0790, 46}}) do
+        for i = 0, pocket[2] - 1 do
+            local itemId = emu:read16(sb1 + pocket[1] + i * 4)
+            local quantity = emu:read16(sb1 + pocket[1] + i * 4 + 2)
+            if itemId > 0 and itemId < 1000 and quantity > 0 and quantity < 100 then
+                total = total + quantity
+            end
+        end
+    end
+    return total
+end
+
+local function legacyGetBagItems()
+    local sb1 = emu:read32(SB1_PTR)
+    local items = {}
+    for i = 0, 29 do
+        local itemId = emu:read16(sb1 + 0x0560 + i * 4)
+        local quantity = emu:read16(sb1 + 0x0560 + i * 4 + 2)
+        if itemId > 0 and itemId < 1000 and quantity > 0 and quantity < 1000 then
+            table.insert(items, {id = itemId, qty = quantity})
+        end
+    end
+    return items
+end
+
+-- Per-field decrypt of the fields compared below (species, item, exp, moves, pp)
+local function legacyGetParty()
+    local party = {}
+    local count = math.min(emu:read8(PARTY_COUNT), 6)
+    for slot = 0, count - 1 do
+        local addr = PARTY + slot * 100
+        local personality = emu:read32(addr)
+        if personality ~= 0 then
+            local key = personality ~ emu:read32(addr + 4)
+            local positions = legacyPositions(personality % 24)
+            local growth = addr + 32 + positions[0] * 12
+            local attacks = addr + 32 + positions[1] * 12
+            local word0 = emu:read32(growth) ~ key
+            local a0, a1, a2 = emu:read32(attacks) ~ key, emu:read32(attacks + 4) ~ key, emu:read32(attacks + 8) ~ key
+            local evAddr = addr + 32 + positions[2] * 12
+            emu:read32(evAddr); emu:read32(evAddr + 4)
+            emu:read32(addr + 32 + positions[3] * 12 + 4)
+            for i = 0, 9 do emu:read8(addr + 8 + i) end
+            local mon = {
+                species = word0 & 0xFFFF, held_item = word0 >> 16,
+                experience = emu:read32(growth + 4) ~ key,
+                moves = {a0 & 0xFFFF, a0 >> 16, a1 & 0xFFFF, a1 >> 16},
+                pp = {a2 & 0xFF, (a2 >> 8) & 0xFF, (a2 >> 16) & 0xFF, a2 >> 24},
+                level = emu:read8(addr + 84), current_hp = emu:read16(addr + 86),
+            }
+            emu:read32(addr + 80)
+            for off = 88, 98, 2 do emu:read16(addr + off) end
+            if mon.species > 0 and mon.species <= 500 then table.insert(party, mon) end
+        end
+    end
+    return party
+end
+
+-- --- Compare, then time --------------------------------------------------------
+
+local function partyKey(party)
+    local out = {}
+    for _, p in ipairs(party) do
+        out[#out + 1] = table.concat({p.species, p.held_item, p.experience, p.level, p.current_hp,
+            table.concat(p.moves, ","), table.concat(p.pp, ",")}, "/")
+    end
+    return table.concat(out, " ")
+end
+
+local function bagKey(items)
+    local out = {}
+    for _, item in ipairs(items) do out[#out + 1] = item.id .. "x" .. item.qty end
+    return table.concat(out, " ")
+end
+
+Events.tracked.itemCount = 0
+local checks = {
+    {"hashParty", legacyHashParty() == Events.hashParty()},
+    {"countBagItems", legacyCountBagItems() == Events.countBagItems()},
+    {"getBagItems", bagKey(legacyGetBagItems()) == bagKey(State.getBagItems())},
+    {"getParty", partyKey(legacyGetParty()) == partyKey(State.getParty())},
+}
+for _, check in ipairs(checks) do
+    if not check[2] then
+        print("MISMATCH: " .. check[1])
+        os.exit(1)
+    end
+end
+
+local function bench(fn)
+    fn()
+    emu.calls = 0
+    local start = os.clock()
+    for _ = 1, iterations do fn() end
+    return (os.clock() - start) * 1e6 / iterations, emu.calls / iterations
+end
+
+print(string.format("%d party, %d iterations; µs and emu calls per call", emu:read8(PARTY_COUNT), iterations))
+print(string.format("%-14s %12s %12s %10s %10s", "", "old µs", "new µs", "old calls", "new calls"))
+for _, row in ipairs({
+    {"hashParty", legacyHashParty, Events.hashParty},
+    {"countBagItems", legacyCountBagItems, Events.countBagItems},
+    {"getBagItems", legacyGetBagItems, State.getBagItems},
+    {"getParty", legacyGetParty, State.getParty},
+}) do
+    local oldUs, oldCalls = bench(row[2])
+    local newUs, newCalls = bench(row[3])
+    print(string.format("%-14s %12.1f %12.1f %10.0f %10.0f", row[1], oldUs, newUs, oldCalls, newCalls))
+end
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DecisionSimilarityIndex (MinHash/LSH) vs brute-force Jaccard.
+
+Generates decisions from several synthetic playthroughs (different parties,
+arcs and enemies), then for each query compares the LSH top-k against an
+exhaustive Jaccard scan: recall@k, candidates examined, and query time.
+
+Run: python3 tools/bench_similarity.py [--decisions 5000] [--queries 200] [--k 3]
+                                        [--bands 20 --rows 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'daemon'))
+from agentic_emerald import DecisionLogger, DecisionSimilarityIndex
+
+EVENT_TYPES = ['BATTLE_SUMMARY', 'EXPLORATION_SUMMARY', 'POKEMON_CAUGHT',
+               'MOVE_MASTERY', 'BADGE_OBTAINED', 'GRIND_SUMMARY']
+
+
+def make_playthroughs(rng, count: int) -> list:
+    runs = []
+    for run in range(count):
+        runs.append({
+            'party': rng.sample(range(1, 387), 6),
+            'arcs': [f"arc:run{run}-arc{a}" for a in range(rng.randint(2, 5))],
+        })
+    return runs
+
+
+def make_signals(rng, run: dict) -> frozenset:
+    signals = {
+        f"event:{rng.choice(EVENT_TYPES)}",
+        f"drought:{DecisionSimilarityIndex.drought_bucket(rng.randint(0, 15))}",
+    }
+    party = run['party'][:rng.randint(2, 6)]
+    signals.update(f"poke:{s}" for s in party)
+    if rng.random() < 0.6:
+        signals.add(f"enemy:{rng.randint(1, 386)}")
+        signals.update(f"tag:{t}" for t in ('trainer', 'clutch', 'rematch') if rng.random() < 0.3)
+    signals.update(rng.sample(run['arcs'], rng.randint(0, min(2, len(run['arcs'])))))
+    return frozenset(signals)
+
+
+def brute_force(corpus: list, query: frozenset, k: int, floor: float) -> list:
+    scored = []
+    for i, signals in enumerate(corpus):
+        j = len(query & signals) / len(query | signals)
+        if j >= floor:
+            scored.append((j, i))
+    scored.sort(key=lambda x: (-x[0], -x[1]))
+    return scored[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MinHash/LSH recall benchmark')
+    parser.add_argument('--decisions', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--playthroughs', type=int, default=12)
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--bands', type=int, default=DecisionSimilarityIndex.BANDS)
+    parser.add_argument('--rows', type=int, default=DecisionSimilarityIndex.ROWS)
+    parser.add_argument('--floor', type=float, default=DecisionLogger.MIN_SIMILARITY,
+                        help='Jaccard floor (as used for retrieval)')
+    args = parser.parse_args()
+
+    index_cls = type('BenchIndex', (DecisionSimilarityIndex,), {
+        'BANDS': args.bands, 'ROWS': args.rows, 'NUM_PERM': args.bands * args.rows,
+    })
+    rng = random.Random(7)
+    runs = make_playthroughs(rng, args.playthroughs)
+    corpus = [make_signals(rng, rng.choice(runs)) for _ in range(args.decisions)]
+    queries = [make_signals(rng, rng.choice(runs)) for _ in range(args.queries)]
+
+    index = index_cls()
+    start = time.perf_counter()
+    for i, signals in enumerate(corpus):
+        index.add(signals, i)
+    build_s = time.perf_counter() - start
+
+    brute_s = lsh_s = 0.0
+    hits = wanted = candidates = 0
+    for q in queries:
+        start = time.perf_counter()
+        exact = brute_force(corpus, q, args.k, args.floor)
+        brute_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx = index.query(q, n=args.k, min_jaccard=args.floor)
+        lsh_s += time.perf_counter() - start
+        candidates += len(index.candidates(q))
+
+        if not exact:
+            continue
+        # Tie-aware: any item scoring at least the k-th exact score is a hit
+        kth = exact[-1][0]
+        wanted += len(exact)
+        hits += sum(1 for j, _ in approx if j >= kth - 1e-12)
+
+    nq = len(queries)
+    print(f"Corpus: {args.decisions} decisions from {args.playthroughs} playthroughs, "
+          f"{nq} queries, k={args.k}, Jaccard floor {args.floor}")
+    print(f"LSH: {args.bands} bands × {args.rows} rows ({args.bands * args.rows} hashes), "
+          f"built in {build_s * 1000:.0f}ms")
+    print(f"\n{'':14}{'per query':>12}")
+    print(f"{'brute force':14}{brute_s / nq * 1000:>10.2f}ms")
+    print(f"{'LSH':14}{lsh_s / nq * 1000:>10.2f}ms   "
+          f"({candidates / nq:.0f} candidates, {candidates / nq / args.decisions:.1%} of corpus)")
+    print(f"speedup: {brute_s / lsh_s:.1f}x")
+    print(f"recall@{args.k}: {hits / wanted:.3f}" if wanted else "recall: n/a (no matches above floor)")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,9 +8,14 @@ Run: python3 tools/health_check.py
 
 import json
 import re
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'daemon'))
+from decision_store import DecisionStore
+from session_journal import SessionJournal
+
 # Colors for terminal output
 class C:
     GREEN = '\033[92m'
@@ -32,24 +37,39 @@ def print_warn(msg):
 def print_error(msg):
     print(f"  {C.RED}✗{C.RESET} {msg}")
 
-def analyze_decisions(decisions_path):
+def open_decision_store(agent_state):
+    """Open the daemon's decision store, or None if nothing has been recorded yet."""
+    if not (agent_state / DecisionStore.DB_NAME).exists() and \
+            not (agent_state / DecisionStore.JSONL_NAME).exists():
+        return None
+    store = DecisionStore.for_state_dir(agent_state)
+    report = store.import_report
+    if report:
+        print_ok(f"Migrated {report['imported']} decisions from decisions.jsonl")
+        if report['malformed']:
+            print_warn(f"{report['malformed']} malformed lines skipped (lines {report['malformed_lines']})")
+    report = store.compressed_import_report
+    if report:
+        print_ok(f"Migrated {report['imported']} compressed batches from decisions_compressed.jsonl")
+        if report['malformed']:
+            print_warn(f"{report['malformed']} malformed lines skipped (lines {report['malformed_lines']})")
+    return store
+
+def analyze_decisions(store):
     print_header("DECISION ANALYSIS")
     
-    if not decisions_path.exists():
-        print_warn("No decisions.jsonl found — no gameplay recorded yet")
+    if store is None:
+        print_warn("No decisions recorded yet — no gameplay recorded yet")
         return
     
-    with open(decisions_path) as f:
-        decisions = [json.loads(line) for line in f]
-    
-    if not decisions:
-        print_warn("decisions.jsonl is empty")
+    total = store.count()
+    if not total:
+        print_warn("Decision store is empty")
         return
     
-    total = len(decisions)
-    none_count = sum(1 for d in decisions if d['action'] == 'none')
-    visible_count = sum(1 for d in decisions if d.get('reward_type') == 'visible')
-    forced_count = sum(1 for d in decisions if d['action'].startswith('FORCED'))
+    none_count = store.count(action='none')
+    visible_count = store.count(reward_type='visible')
+    forced_count = store.count_action_prefix('FORCED')
     
     # Calculate rates
     none_rate = none_count / total * 100
@@ -68,19 +88,15 @@ def analyze_decisions(decisions_path):
         print_ok(f"Passivity within range: {none_rate:.1f}% none rate")
     
     # Analyze by event type
-    from collections import Counter
-    types = Counter(d['event_type'] for d in decisions)
     print(f"\n  By event type:")
-    for t, c in types.most_common():
-        t_none = sum(1 for d in decisions if d['event_type'] == t and d['action'] == 'none')
+    for t, c, t_none in store.action_breakdown():
         t_rate = t_none / c * 100
         status = "⚠" if t_rate > 95 else "✓" if t_rate < 80 else "•"
         print(f"    {status} {t}: {c} events ({t_rate:.0f}% none)")
     
     # Drought analysis
-    max_drought = max(d['drought'] for d in decisions)
-    recent_30 = decisions[-30:] if len(decisions) >= 30 else decisions
-    recent_none_rate = sum(1 for d in recent_30 if d['action'] == 'none') / len(recent_30) * 100
+    max_drought = store.max_drought()
+    recent_none_rate = store.recent_action_none_rate(30) * 100
     
     print(f"\n  Max drought observed: {max_drought}")
     if max_drought > 20:
@@ -91,7 +107,7 @@ def analyze_decisions(decisions_path):
     print(f"  Recent 30 decisions none rate: {recent_none_rate:.1f}%")
     
     # Arc closures
-    arc_closures = [d for d in decisions if d.get('arc_closed')]
+    arc_closures = store.arc_closures()
     print(f"\n  Arc closures: {len(arc_closures)}")
     for d in arc_closures:
         print(f"    • {d['arc_closed']}")
@@ -172,76 +188,73 @@ def analyze_profile(profile_path):
         print(f"    Type specialization: {attrs.get('type_specialization', 'None')}")
         print(f"    Comeback ratio: {attrs.get('comeback_ratio', 0):.2f}")
 
-def analyze_session(session_path):
+def analyze_session(agent_state):
     print_header("SESSION STATE")
     
-    if not session_path.exists():
-        print_warn("No session.json found")
+    journal = SessionJournal(agent_state)
+    if not journal.snapshot_path.exists() and not journal.journal_path.exists():
+        print_warn("No session.json or session journal found")
         return
     
-    with open(session_path) as f:
-        session = json.load(f)
+    stats = journal.stats()
+    try:
+        session = journal.load()
+    except (OSError, ValueError) as e:
+        print_error(f"Session snapshot unreadable: {e}")
+        return
     
-    history = session.get('history', [])
+    history = session['history']
     print(f"  History entries: {len(history)}")
+    print(f"  Compressed summaries: {len(session['compressed_summaries'])}")
+    print(f"  Snapshot: {stats['snapshot_bytes'] / 1024:.1f} KB | "
+          f"journal tail: {stats['journal_records']} records")
     
-    # Check for compression
-    compressed = [h for h in history if h.get('type') == 'history_summary']
-    print(f"  Compressed summaries: {len(compressed)}")
-    
-    if len(history) > 50 and not compressed:
+    if len(history) > 50 and not session['compressed_summaries']:
         print_warn(f"Large history ({len(history)} entries) but no compression — may need restart")
+    if stats['journal_records'] > SessionJournal.SNAPSHOT_EVERY * 2:
+        print_warn("Journal tail is long — snapshots may be failing")
 
-def check_compression_status(decisions_path, compressed_path):
+def check_compression_status(store):
     print_header("MEMORY COMPRESSION")
     
-    if not decisions_path.exists():
-        print_warn("No decisions.jsonl to compress")
+    if store is None:
+        print_warn("No decisions to compress")
         return
     
-    with open(decisions_path) as f:
-        decisions = [json.loads(line) for line in f]
-    
-    if len(decisions) < 50:
-        print_ok(f"Only {len(decisions)} decisions — no compression needed yet")
+    total = store.count()
+    if total < 50:
+        print_ok(f"Only {total} decisions — no compression needed yet")
         return
     
     # Check age of oldest decision
-    cutoff = datetime.now() - timedelta(days=7)
-    cutoff_str = cutoff.isoformat()
+    cutoff_str = (datetime.now() - timedelta(days=7)).isoformat()
+    old = store.count(before=cutoff_str)
     
-    old = [d for d in decisions if d.get('ts', '') < cutoff_str]
-    recent = [d for d in decisions if d.get('ts', '') >= cutoff_str]
-    
-    print(f"  Total decisions: {len(decisions)}")
-    print(f"  Older than 7 days: {len(old)}")
-    print(f"  Recent (last 7 days): {len(recent)}")
+    print(f"  Total decisions: {total}")
+    print(f"  Older than 7 days: {old}")
+    print(f"  Recent (last 7 days): {total - old}")
     
-    if compressed_path.exists():
-        with open(compressed_path) as f:
-            summaries = [json.loads(line) for line in f]
-        print_ok(f"Compressed file exists with {len(summaries)} summaries")
+    summaries = store.compressed_count()
+    if summaries:
+        print_ok(f"Compressed store has {summaries} summaries")
     else:
-        if len(old) >= 50:
-            print_warn(f"{len(old)} old decisions ready for compression — will run on next daemon start")
+        if old >= 50:
+            print_warn(f"{old} old decisions ready for compression — will run on next daemon start")
         else:
             print_ok("No compression needed yet")
 
-def generate_recommendations(base):
+def generate_recommendations(base, store):
     """Generate actionable recommendations based on detected issues."""
     recommendations = []
     agent_state = base / 'agent' / 'state'
     agent_memory = base / 'agent' / 'memory'
     
     # Check decisions
-    decisions_path = agent_state / 'decisions.jsonl'
-    if decisions_path.exists():
-        with open(decisions_path) as f:
-            decisions = [json.loads(line) for line in f]
-        
-        if decisions:
-            none_rate = sum(1 for d in decisions if d['action'] == 'none') / len(decisions) * 100
-            max_drought = max(d['drought'] for d in decisions)
+    if store is not None:
+        total = store.count()
+        if total:
+            none_rate = store.count(action='none') / total * 100
+            max_drought = store.max_drought()
             
             # High passivity
             if none_rate > 85:
@@ -290,12 +303,9 @@ def generate_recommendations(base):
                     })
     
     # Check compression status
-    if decisions_path.exists():
-        with open(decisions_path) as f:
-            decisions = [json.loads(line) for line in f]
-        
+    if store is not None:
         cutoff = (datetime.now() - timedelta(days=7)).isoformat()
-        old_count = sum(1 for d in decisions if d.get('ts', '') < cutoff)
+        old_count = store.count(before=cutoff)
         
         if old_count >= 50:
             recommendations.append({
@@ -377,17 +387,16 @@ def main():
     agent_state = base / 'agent' / 'state'
     agent_memory = base / 'agent' / 'memory'
     
-    analyze_decisions(agent_state / 'decisions.jsonl')
+    store = open_decision_store(agent_state)
+    
+    analyze_decisions(store)
     analyze_arcs(agent_memory / 'PLAYTHROUGH.md')
     analyze_profile(agent_state / 'player_profile.json')
-    analyze_session(agent_state / 'session.json')
-    check_compression_status(
-        agent_state / 'decisions.jsonl',
-        agent_state / 'decisions_compressed.jsonl'
-    )
+    analyze_session(agent_state)
+    check_compression_status(store)
     
     # Generate and print recommendations
-    recommendations = generate_recommendations(base)
+    recommendations = generate_recommendations(base, store)
     print_recommendations(recommendations)
     
     print(f"\n{C.BOLD}Health check complete.{C.RESET}\n")
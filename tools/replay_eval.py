@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Offline replay evaluator for the decision pipeline.
+
+Drives recorded events (the daemon's event journal, agent/state/events/, or
+a plain events.jsonl) through PokemonGM.process_event with a deterministic
+mock agent, in a throwaway copy of the workspace, and reports:
+
+  - agent invocations (and skips) per event type
+  - estimated prompt tokens per event type
+  - p50/p95 pipeline latency per mGBA event
+  - reward-type distribution of the replayed decisions
+
+Pass two --config files to compare them side by side (thresholds, prompt
+settings, ...). --decisions seeds the decision store first (decisions.db or
+a decisions.jsonl export), so retrieval and learning blocks look like they
+would mid-playthrough.
+
+Run:
+  python3 tools/replay_eval.py agent/state/events
+  python3 tools/replay_eval.py agent/state/events --since 2026-03-01T18:00 --until 2026-03-01T20:00
+  python3 tools/replay_eval.py events.jsonl -c config.yaml -c config.tuned.yaml \\
+      --decisions agent/state/decisions.db --agent cycle
+"""
+
+import argparse
+import contextlib
+import importlib
+import importlib.util
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'daemon'))
+import agentic_emerald as ae
+from event_journal import EventJournalReader
+
+CHARS_PER_TOKEN = ae.ConversationHistoryManager.CHARS_PER_TOKEN
+
+# Deterministic mock responses, one per reward type
+RESPONSES = {
+    'none': "OBSERVATION: replay\nACTION: none",
+    'ev': "OBSERVATION: replay\nACTION: GM.addEVs(0, 'atk', 4)",
+    'visible': "OBSERVATION: replay\nACTION: GM.addExperience(0, 100)",
+}
+
+
+def agent_none(prompt: str, event_type: str, n: int) -> str:
+    """Never rewards — isolates pipeline cost from reward side effects."""
+    return RESPONSES['none']
+
+
+def agent_cycle(prompt: str, event_type: str, n: int) -> str:
+    """Per-event-type deterministic mix of none / ev / visible."""
+    choice = zlib.crc32(f"{event_type}:{n}".encode()) % 3
+    return RESPONSES[('none', 'ev', 'visible')[choice]]
+
+
+MOCK_AGENTS = {'none': agent_none, 'cycle': agent_cycle}
+
+
+def load_agent(spec: str):
+    """Built-in name, or module:function / path.py:function taking (prompt, event_type, n)."""
+    if spec in MOCK_AGENTS:
+        return MOCK_AGENTS[spec]
+    target, _, func = spec.partition(':')
+    if not func:
+        raise SystemExit(f"Unknown agent '{spec}' (use {', '.join(MOCK_AGENTS)} or module:function)")
+    if target.endswith('.py'):
+        spec_obj = importlib.util.spec_from_file_location('replay_agent', target)
+        module = importlib.util.module_from_spec(spec_obj)
+        spec_obj.loader.exec_module(module)
+    else:
+        module = importlib.import_module(target)
+    return getattr(module, func)
+
+
+def _as_replay_event(event: dict) -> dict:
+    """Strip journal bookkeeping so the event looks as the daemon received it."""
+    if 'event_type' not in event and 'type' in event:
+        event['event_type'] = event['type']
+    for key in ('time', 'type', 'event_id'):
+        event.pop(key, None)
+    return event
+
+
+def load_events(path: Path, from_id: int = None, since: float = None, until: float = None) -> list:
+    """Events as the daemon received them, from a journal directory or a .jsonl file."""
+    if path.is_dir():
+        reader = EventJournalReader(path)
+        return [_as_replay_event(e) for e in reader.read(from_id=from_id, since=since, until=until)]
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            events.append(_as_replay_event(event))
+    return events
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def make_workspace(config: dict, decisions: Path = None) -> tuple:
+    """Copy agent files and species data into a temp base; point config at it."""
+    base = Path(tempfile.mkdtemp(prefix='replay-'))
+    shutil.copytree(ROOT / 'agent', base / 'agent', ignore=shutil.ignore_patterns('state'))
+    (base / 'data').mkdir()
+    shutil.copy(ROOT / 'data' / 'emerald_species.json', base / 'data' / 'emerald_species.json')
+    state = base / 'agent' / 'state'
+    state.mkdir(parents=True, exist_ok=True)
+    if decisions:
+        if decisions.suffix == '.db':
+            shutil.copy(decisions, state / ae.DecisionStore.DB_NAME)
+        else:
+            shutil.copy(decisions, state / ae.DecisionStore.JSONL_NAME)  # Migrated on startup
+
+    config = json.loads(json.dumps(config or {}))
+    config.setdefault('agent', {})['workspace'] = './agent'
+    config.setdefault('paths', {}).update({
+        'species_file': './data/emerald_species.json',
+        'memory_dir': './memory',
+    })
+    session = config.setdefault('session', {})
+    session['session_file'] = './agent/state/session_id.txt'
+    return base, config
+
+
+def replay(name: str, config: dict, events: list, agent, decisions: Path = None) -> dict:
+    base, config = make_workspace(config, decisions)
+    stats = {
+        'name': name,
+        'events': len(events),
+        'considered': {},
+        'invoked': {},
+        'tokens': {},
+        'latency_ms': [],
+        'latency_invoked_ms': [],
+        'rewards': {},
+        'commands_sent': 0,
+    }
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            gm = ae.PokemonGM(config, base)
+            gm.decision_compressor.join()
+            last_id = max((row_id for row_id, _ in iter_rows(gm.decision_store)), default=0)
+
+            def send_gm_command(cmd):
+                stats['commands_sent'] += 1
+
+            # Agent turns run inline; GM commands are counted, not sent
+            gm._start_agent = lambda run_agent: run_agent()
+            gm._send_gm_command = send_gm_command
+
+            current = {'event_type': None}
+            real_prompt_async = gm.prompt_agent_async
+            real_build_prompt = gm.build_prompt
+
+            def prompt_agent_async(event_type, context, ectx=None):
+                stats['considered'][event_type] = stats['considered'].get(event_type, 0) + 1
+                return real_prompt_async(event_type, context, ectx)
+
+            def build_prompt(event_type, ctx, ectx=None):
+                prompt = real_build_prompt(event_type, ctx, ectx)
+                current['event_type'] = event_type
+                stats['invoked'][event_type] = stats['invoked'].get(event_type, 0) + 1
+                return prompt
+
+            def mock(prompt):
+                # Tokens of the prompt actually sent (direct mode may rebuild it)
+                etype = current['event_type']
+                stats['tokens'].setdefault(etype, []).append(len(prompt) // CHARS_PER_TOKEN)
+                return agent(prompt, etype, stats['invoked'].get(etype, 0))
+
+            gm.prompt_agent_async = prompt_agent_async
+            gm.build_prompt = build_prompt
+            for attr in ('_call_claude_cli', '_call_codex_cli', '_call_anthropic_direct', '_call_clawdbot'):
+                setattr(gm, attr, mock)
+
+            for event in events:
+                invoked_before = sum(stats['invoked'].values())
+                start = time.perf_counter()
+                try:
+                    gm.process_event(event)
+                except Exception as e:
+                    stats.setdefault('errors', []).append(f"{event.get('event_type')}: {e}")
+                elapsed = (time.perf_counter() - start) * 1000
+                stats['latency_ms'].append(elapsed)
+                if sum(stats['invoked'].values()) > invoked_before:
+                    stats['latency_invoked_ms'].append(elapsed)
+
+            for row_id, entry in iter_rows(gm.decision_store):
+                if row_id <= last_id:
+                    continue
+                rtype = entry.get('reward_type', 'none')
+                stats['rewards'][rtype] = stats['rewards'].get(rtype, 0) + 1
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+    return stats
+
+
+def iter_rows(store):
+    """(row_id, entry) for every decision in the store, in log order."""
+    last = 0
+    while True:
+        batch = store.entries_after(last)
+        if not batch:
+            return
+        for row_id, entry in batch:
+            yield row_id, entry
+        last = batch[-1][0]
+
+
+def report(results: list):
+    names = [r['name'] for r in results]
+    width = max(14, *(len(n) + 2 for n in names))
+
+    def row(label, values):
+        print(f"  {label:<28}" + ''.join(f"{v:>{width}}" for v in values))
+
+    print()
+    row('', names)
+    row('events replayed', [r['events'] for r in results])
+    row('agent invocations', [sum(r['invoked'].values()) for r in results])
+    row('skipped (low uncertainty)',
+        [sum(r['considered'].values()) - sum(r['invoked'].values()) for r in results])
+    row('prompt tokens (total)', [sum(sum(t) for t in r['tokens'].values()) for r in results])
+    row('pipeline p50 ms', [f"{percentile(r['latency_ms'], 50):.2f}" for r in results])
+    row('pipeline p95 ms', [f"{percentile(r['latency_ms'], 95):.2f}" for r in results])
+    row('invoked-event p50 ms', [f"{percentile(r['latency_invoked_ms'], 50):.2f}" for r in results])
+    row('invoked-event p95 ms', [f"{percentile(r['latency_invoked_ms'], 95):.2f}" for r in results])
+    row('GM commands', [r['commands_sent'] for r in results])
+
+    print("\n  Invocations / avg prompt tokens by event type")
+    etypes = sorted({e for r in results for e in r['considered']})
+    for etype in etypes:
+        cells = []
+        for r in results:
+            tokens = r['tokens'].get(etype, [])
+            avg = sum(tokens) // len(tokens) if tokens else 0
+            cells.append(f"{r['invoked'].get(etype, 0)}/{r['considered'].get(etype, 0)} ~{avg}t")
+        row(etype, cells)
+
+    print("\n  Reward-type distribution")
+    for rtype in ('visible', 'ev', 'none'):
+        cells = []
+        for r in results:
+            total = sum(r['rewards'].values())
+            n = r['rewards'].get(rtype, 0)
+            cells.append(f"{n} ({n / total:.0%})" if total else '0')
+        row(rtype, cells)
+
+    for r in results:
+        for err in r.get('errors', [])[:5]:
+            print(f"  ! {r['name']}: {err}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded events through the GM pipeline')
+    parser.add_argument('events', type=Path, help='Event journal directory or events.jsonl')
+    parser.add_argument('--from-id', type=int, help='Journal: start at this event id')
+    parser.add_argument('--since', help='Journal: start at this ISO time')
+    parser.add_argument('--until', help='Journal: stop before this ISO time')
+    parser.add_argument('-c', '--config', type=Path, action='append', default=[],
+                        help='Config to evaluate (repeat once to compare two)')
+    parser.add_argument('--decisions', type=Path, help='Seed decisions (decisions.db or .jsonl)')
+    parser.add_argument('--agent', default='cycle',
+                        help=f"Mock agent: {', '.join(MOCK_AGENTS)} or module:function")
+    parser.add_argument('--json', action='store_true', help='Print raw results as JSON')
+    args = parser.parse_args()
+
+    if len(args.config) > 2:
+        parser.error('at most two --config files')
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    until = datetime.fromisoformat(args.until).timestamp() if args.until else None
+    events = load_events(args.events, args.from_id, since, until)
+    if not events:
+        raise SystemExit(f"No events in {args.events}")
+    agent = load_agent(args.agent)
+
+    configs = []
+    for path in args.config or [None]:
+        if path is None:
+            configs.append(('default', {'agent': {'mode': 'claude'}}))
+        else:
+            with open(path) as f:
+                configs.append((path.stem, yaml.safe_load(f) or {}))
+
+    results = [replay(name, config, events, agent, args.decisions) for name, config in configs]
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+    else:
+        print(f"Replayed {len(events)} events from {args.events} (agent: {args.agent})")
+        report(results)
+
+
+if __name__ == '__main__':
+    main()